@@ -1,4 +1,4 @@
-from langchain_ollama import ChatOllama
+from agents.llm import get_llm, cached_chain
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
@@ -8,11 +8,12 @@ from typing import List
 class NarrativeBeats(BaseModel):
     beats: List[str] = Field(description="List of 3-5 key narrative beats or facts from the game.")
 
+@cached_chain
 def get_context_analyst():
     """
     Returns a chain that identifies the 'Gold Standard' narrative beats from game stats.
     """
-    llm = ChatOllama(model="llama3.2", temperature=0.1)
+    llm = get_llm("llama3.2", 0.1, cache=True)
     
     parser = JsonOutputParser(pydantic_object=NarrativeBeats)
     
@@ -24,13 +25,31 @@ def get_context_analyst():
     chain = prompt | llm | parser
     return chain
 
+class RecallResult(BaseModel):
+    hits: List[bool] = Field(description="List of booleans indicating if each fact was found.")
+
+@cached_chain
+def get_recall_checker():
+    """
+    Returns a chain that checks which narrative beats made it into a draft (Mistral).
+    """
+    llm = get_llm("mistral", 0, cache=True)
+    parser = JsonOutputParser(pydantic_object=RecallResult)
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are a Fact Checker. Check if the following FACTS are mentioned in the ARTICLE. Return strictly JSON with a key 'hits' containing a list of booleans (true/false) corresponding to each fact in order."),
+        ("user", "Facts: {beats}\n\nArticle: {draft}\n\nOutput (JSON):")
+    ])
+    
+    return prompt | llm | parser
+
 def check_recall(draft: str, beats: List[str]):
     """
     Simple check to see if beats are present in the draft.
     For a more robust check, we could use an LLM, but string matching is faster for now.
     actually, let's use a quick LLM check for semantic matching.
     """
-    llm = ChatOllama(model="mistral", temperature=0) # Mistral is good for checking
+    llm = get_llm("mistral", 0, cache=True) # Mistral is good for checking
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a Strict Editor. Check if the following FACTS are mentioned in the ARTICLE. Return 'YES' or 'NO' for each fact."),
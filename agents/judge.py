@@ -1,4 +1,4 @@
-from langchain_ollama import ChatOllama
+from agents.llm import get_llm, cached_chain
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
@@ -10,9 +10,10 @@ class JudgeOutput(BaseModel):
     errors: List[str] = Field(description="List of factual errors found (e.g. numeric mismatches)")
     score: int = Field(description="Quality score from 0 to 100")
 
+@cached_chain
 def get_judge_chain():
     # Using Mistral for better reasoning/logic
-    llm = ChatOllama(model="mistral", temperature=0.0)
+    llm = get_llm("mistral", 0.0, cache=True)
     
     parser = JsonOutputParser(pydantic_object=JudgeOutput)
     
@@ -1,4 +1,4 @@
-from langchain_ollama import ChatOllama
+from agents.llm import get_llm, cached_chain
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
@@ -31,8 +31,9 @@ class SafetyOutput(BaseModel):
     flags: List[str] = Field(description="List of unsafe content flags")
 
 # 1. Fact Checker (Mistral)
+@cached_chain
 def get_fact_checker():
-    llm = ChatOllama(model="mistral", temperature=0.1)
+    llm = get_llm("mistral", 0.1, cache=True)
     parser = JsonOutputParser(pydantic_object=FactOutput)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a strict Fact Checker. Compare the Draft against the Stats. Verify numbers. Return JSON."),
@@ -41,8 +42,9 @@ def get_fact_checker():
     return prompt | llm | parser
 
 # 2. Editor-in-Chief (Journalistic Standards)
+@cached_chain
 def get_editor_in_chief():
-    llm = ChatOllama(model="mistral", temperature=0.7)
+    llm = get_llm("mistral", 0.7, cache=True)
     parser = JsonOutputParser(pydantic_object=StyleOutput)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are the Editor-in-Chief. Grade the article (1-10). Check for Hallucinations ('Raptors' vs 'Warriors') and stakes. Return JSON."),
@@ -51,8 +53,9 @@ def get_editor_in_chief():
     return prompt | llm | parser
 
 # 3. Bias Watchdog
+@cached_chain
 def get_bias_watchdog():
-    llm = ChatOllama(model="mistral", temperature=0.1)
+    llm = get_llm("mistral", 0.1, cache=True)
     parser = JsonOutputParser(pydantic_object=BiasOutput)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "Check for unfair bias or offensive language. Return JSON."),
@@ -61,8 +64,9 @@ def get_bias_watchdog():
     return prompt | llm | parser
 
 # 4. SEO Strategist
+@cached_chain
 def get_seo_strategist():
-    llm = ChatOllama(model="mistral", temperature=0.3)
+    llm = get_llm("mistral", 0.3, cache=True)
     parser = JsonOutputParser(pydantic_object=SeoOutput)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "SEO Strategist. Check keywords and density. Return JSON."),
@@ -71,8 +75,9 @@ def get_seo_strategist():
     return prompt | llm | parser
 
 # 5. Engagement Editor
+@cached_chain
 def get_engagement_editor():
-    llm = ChatOllama(model="mistral", temperature=0.6)
+    llm = get_llm("mistral", 0.6, cache=True)
     parser = JsonOutputParser(pydantic_object=EngagementOutput)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "Engagement Editor. Check hook and readability. Return JSON."),
@@ -81,11 +86,34 @@ def get_engagement_editor():
     return prompt | llm | parser
 
 # 6. Brand Safety
+@cached_chain
 def get_brand_safety():
-    llm = ChatOllama(model="mistral", temperature=0.1)
+    llm = get_llm("mistral", 0.1, cache=True)
     parser = JsonOutputParser(pydantic_object=SafetyOutput)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "Brand Safety. Check for toxicity. Return JSON."),
         ("user", "Draft: {draft}\n{format_instructions}")
     ]).partial(format_instructions=parser.get_format_instructions())
     return prompt | llm | parser
+
+# 7. Jury Panel (all six jurors in one call)
+class PanelOutput(BaseModel):
+    fact: FactOutput = Field(description="Fact Checker: compare the Draft against the Stats, verify every number")
+    bias: BiasOutput = Field(description="Bias Watchdog: unfair bias or offensive language")
+    safety: SafetyOutput = Field(description="Brand Safety: toxicity")
+    editor: StyleOutput = Field(description="Editor-in-Chief: grade 1-10, check hallucinations ('Raptors' vs 'Warriors') and stakes")
+    seo: SeoOutput = Field(description="SEO Strategist: keywords and density")
+    engagement: EngagementOutput = Field(description="Engagement Editor: hook and readability")
+
+@cached_chain
+def get_jury_panel():
+    # The draft and stats are read once instead of six times. One temperature for all roles,
+    # so it stays low: the veto checks matter more than varied critique wording.
+    llm = get_llm("mistral", 0.2, cache=True)
+    parser = JsonOutputParser(pydantic_object=PanelOutput)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are a jury of six newsroom reviewers: Fact Checker, Bias Watchdog, Brand Safety, Editor-in-Chief, SEO Strategist and Engagement Editor. "
+                   "Each reviewer judges the Draft independently and strictly in their own role. Return one JSON object with every reviewer's verdict."),
+        ("user", "Stats: {stats}\n\nDraft: {draft}\n{format_instructions}")
+    ]).partial(format_instructions=parser.get_format_instructions())
+    return prompt | llm | parser
@@ -0,0 +1,82 @@
+import functools
+import os
+import threading
+import time
+from langchain_ollama import ChatOllama
+from ollama import Client, AsyncClient
+from utils.llm_cache import get_response_cache
+
+# One HTTP connection pool per process to the Ollama server (OLLAMA_HOST),
+# shared by every agent instead of one pool per ChatOllama instance.
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+def get_clients():
+    global _client, _async_client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _async_client = AsyncClient()
+                _client = Client()
+    return _client, _async_client
+
+# How long Ollama keeps a model in memory after its last request (default there is 5m)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+def get_llm(model, temperature, cache=False):
+    """
+    ChatOllama wired to the shared clients.
+    cache=True opts the agent into the response cache (utils/llm_cache.py)
+    when it is enabled; leave it off for creative agents like the writer.
+    """
+    response_cache = get_response_cache() if cache else None
+    llm = ChatOllama(model=model, temperature=temperature, cache=response_cache, keep_alive=OLLAMA_KEEP_ALIVE)
+    llm._client, llm._async_client = get_clients()
+    return llm
+
+async def preload_model(model):
+    """
+    Loads a model into Ollama's memory without generating anything
+    (an empty prompt), so the first real request doesn't pay for the load.
+    Returns Ollama's load time in seconds.
+    """
+    _, async_client = get_clients()
+    response = await async_client.generate(model=model, keep_alive=OLLAMA_KEEP_ALIVE)
+    return (response.load_duration or 0) / 1e9
+
+# Chain registry: every agent factory builds its chain once per process
+_chain_stats = {}
+_registry_lock = threading.Lock()
+
+def cached_chain(factory):
+    """
+    Decorator for get_*_chain style factories. The first call builds the
+    chain (prompt, parser, format instructions, LLM); later calls return
+    the same object. Chains are stateless, so they are safe to share.
+    """
+    name = factory.__name__
+    chain = None
+
+    @functools.wraps(factory)
+    def get():
+        nonlocal chain
+        if chain is None:
+            with _registry_lock:
+                if chain is None:
+                    start = time.perf_counter()
+                    chain = factory()
+                    _chain_stats[name] = {"build_ms": (time.perf_counter() - start) * 1000, "reuses": 0}
+                    return chain
+        with _registry_lock:
+            _chain_stats[name]["reuses"] += 1
+        return chain
+
+    return get
+
+def chain_stats():
+    """
+    {factory: {"build_ms", "reuses"}} for every chain built so far.
+    """
+    with _registry_lock:
+        return {name: dict(stats) for name, stats in _chain_stats.items()}
@@ -1,12 +1,46 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager, aclosing
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
-from utils.data_loader import get_game_stats
-from graph import app as graph_app
+from utils.data_loader import get_game_stats, get_game_stats_many
+from utils.fact_screen import screen_report
+from agents.llm import chain_stats
+from utils.jobs import submit_job, get_job, get_results, cancel_job, run_worker
+from utils.scheduler import run_waves, ModelLoadTracker, schedule_savings
+from utils.warmup import warm_up, keep_warm, readiness
+from utils.metrics import render_metrics, stage_percentiles
+from utils.single_flight import StreamFlights
+from utils.article_store import get_article, save_article, store_report
+from graph import app as graph_app, pipeline_fingerprint
+import asyncio
+import json
 import time
 import uvicorn
 
-app = FastAPI(title="SportsEdit-AI API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm-up (game index, chains, Ollama models) runs in the background;
+    # /health answers right away, /ready turns 200 once everything is warm
+    async def start():
+        await warm_up()
+        # Failed components (e.g. Ollama down at boot) keep being retried, so /ready can recover
+        rewarm = asyncio.create_task(keep_warm())
+        try:
+            # Evaluation job worker (resumes jobs left running by a previous process)
+            await run_worker(evaluate_run, evaluate_waves, load_job_stats)
+        finally:
+            rewarm.cancel()
+
+    worker = asyncio.create_task(start())
+    yield
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+
+app = FastAPI(title="SportsEdit-AI API", lifespan=lifespan)
 
 # Allow CORS for React Client (localhost:5173)
 app.add_middleware(
@@ -19,103 +53,317 @@ app.add_middleware(
 
 class GameRequest(BaseModel):
     game_id: str
+    force: bool = False # rewrite even if a published article is stored
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    # Liveness only: never waits on warm-up (see /ready)
+    warm = readiness()
+    return {
+        "status": "ok",
+        "ready": warm["ready"],
+        "game_index": warm["components"].get("game_index", {}).get("detail"),
+        "fact_screen": screen_report(),
+        "single_flight": draft_flights.report(),
+        "articles": store_report(),
+        "chains": chain_stats()
+    }
 
-@app.post("/draft")
-async def draft_article(request: GameRequest):
-    game_id = request.game_id
+@app.get("/ready")
+def ready_check():
+    # Per-component warm-up status and timings; 503 until all are ready
+    report = readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus text format: per-stage latency, token and tokens/sec histograms
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# Concurrent drafts of the same game share one pipeline run (see utils/single_flight.py)
+draft_flights = StreamFlights()
+
+def draft_key(game_id, force=False):
+    # Everything that changes the pipeline's output; per-request settings go here too.
+    # Jury mode and fact screen come from the environment, so they're the same for every request.
+    # A forced rewrite never attaches to a run that may be serving the stored article.
+    return ("draft", game_id, force)
+
+async def draft_pipeline(game_id, force=False):
+    """
+    One /draft run as (event, data) pairs:
+    stats -> (revision -> token... -> draft -> [screen] -> juror... -> verdict)* -> final,
+    or a single not_found. A published article for the current pipeline
+    fingerprint short-circuits to stats -> final (unless force).
+    """
     start_time = time.time()
-    
-    # 1. Fetch Stats
-    stats_data = get_game_stats(game_id)
-    if "Error" in stats_data:
-        raise HTTPException(status_code=404, detail=stats_data)
-        
-    # 2. Run Agents
+    # Chain builds, SQLite and the game index (which may still be loading during
+    # warm-up) all block, so they run in threads and /health, /ready stay responsive
+    fingerprint = await asyncio.to_thread(pipeline_fingerprint)
+    if not force:
+        article = await asyncio.to_thread(get_article, game_id, fingerprint)
+        if article is not None:
+            yield "stats", {"game_id": game_id, "stats_context": article["stats_context"]}
+            yield "final", {**article, "cached": True, "execution_time": time.time() - start_time}
+            return
+
+    stages = []
+    stats_data = await asyncio.to_thread(get_game_stats, game_id, stages)
+    # Unknown game or no dataset: nothing to write from, and nothing to publish
+    if stats_data.startswith(("Error", "No records")):
+        yield "not_found", {"detail": stats_data}
+        return
+    yield "stats", {"game_id": game_id, "stats_context": stats_data}
+
     inputs = {
         "input_stats": stats_data, 
         "draft": "", 
-        "critique_status": "", 
-        "critique_errors": [], 
-        "revision_count": 0
+        "jury_verdict": "", 
+        "jury_feedback": [], 
+        "revision_count": 0,
+        "stage_metrics": stages
     }
-    
+    revision = 0
+    final_state = {}
+    stream = graph_app.astream_events(inputs, version="v2")
     try:
-        final_state = graph_app.invoke(inputs)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-        
-    execution_time = time.time() - start_time
-    
-    # Return structured data for Frontend
-    # Use feedback from jury if any
-    return {
+        async for event in stream:
+            kind, name = event["event"], event["name"]
+            node = event.get("metadata", {}).get("langgraph_node")
+            data = event.get("data", {})
+
+            if kind == "on_chain_start" and name == "writer" and node == "writer":
+                revision += 1
+                yield "revision", {"revision": revision}
+            elif kind == "on_chat_model_stream" and node == "writer":
+                yield "token", {"revision": revision, "text": data["chunk"].content}
+            elif kind == "on_chain_end" and name == "writer" and node == "writer":
+                yield "draft", {"revision": revision, "draft": data["output"]["draft"]}
+            elif kind == "on_chain_end" and name == "screen" and node == "screen":
+                if data["output"].get("screen_errors"):
+                    yield "screen", {"revision": revision, "status": "FAIL", "errors": data["output"]["screen_errors"]}
+            elif kind == "on_custom_event" and name == "juror":
+                yield "juror", {"revision": revision, **data}
+            elif kind == "on_chain_end" and name == "jury" and node == "jury":
+                output = data["output"]
+                yield "verdict", {
+                    "revision": revision,
+                    "status": output["jury_verdict"],
+                    "errors": output["jury_feedback"],
+                }
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                final_state = data["output"]
+    finally:
+        # Stops the graph run (and its in-flight Ollama calls) when the run is cancelled
+        await stream.aclose()
+
+    final = {
         "game_id": game_id,
         "draft": final_state.get('draft'),
         "status": final_state.get('jury_verdict'),
         "errors": final_state.get('jury_feedback', []),
         "revisions": final_state.get('revision_count', 0),
-        "execution_time": execution_time,
-        "stats_context": stats_data
+        "execution_time": time.time() - start_time,
+        "stage_metrics": final_state.get('stage_metrics', [])
     }
+    # Publish approved drafts only; a failed one gets another try next time
+    if final["status"] == "PASS":
+        await asyncio.to_thread(save_article, game_id, fingerprint, {**final, "stats_context": stats_data, "fingerprint": fingerprint})
+    yield "final", {**final, "cached": False}
+
+@app.post("/draft")
+async def draft_article(request: GameRequest):
+    game_id = request.game_id
+    stats_data = None
+    
+    # Attach to the run for this game if one is in flight, else start it
+    flight = draft_flights.subscribe(draft_key(game_id, request.force), lambda: draft_pipeline(game_id, request.force))
+    async with aclosing(flight) as events:
+        async for event, data in events:
+            if event == "not_found":
+                raise HTTPException(status_code=404, detail=data["detail"])
+            if event == "error":
+                raise HTTPException(status_code=500, detail=data["detail"])
+            if event == "stats":
+                stats_data = data["stats_context"]
+            elif event == "final":
+                # Return structured data for Frontend
+                return {**data, "stats_context": stats_data}
+
+    raise HTTPException(status_code=500, detail="Draft run ended without a result")
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/article/{game_id}")
+def published_article(game_id: str):
+    # Stored approved article for the current pipeline fingerprint; 404 = not written (or stale)
+    article = get_article(game_id, pipeline_fingerprint())
+    if article is None:
+        raise HTTPException(status_code=404, detail=f"No published article for game {game_id}")
+    return {**article, "cached": True}
+
+@app.get("/draft/stream")
+async def draft_article_stream(game_id: str, request: Request, force: bool = False):
+    """
+    Same pipeline as /draft, streamed as server-sent events:
+    stats -> (revision -> token... -> draft -> [screen] -> juror... -> verdict)* -> final.
+    Concurrent streams for the same game share one run and get identical events.
+    Once every client has disconnected the graph is cancelled, with its Ollama requests.
+    """
+    events = draft_flights.subscribe(draft_key(game_id, force), lambda: draft_pipeline(game_id, force))
+    first, data = await anext(events)
+    if first == "not_found":
+        await events.aclose()
+        raise HTTPException(status_code=404, detail=data["detail"])
+
+    async def stream():
+        try:
+            yield sse(first, data)
+            async for event, payload in events:
+                if await request.is_disconnected():
+                    break
+                yield sse(event, payload)
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 class EvalRequest(BaseModel):
     batch_size: int = 5
     iterations: int = 1
     game_type: str = 'all'
+    schedule: str = 'sequential' # or 'waves': batch all writer steps, then all jury steps (fewer model swaps)
+    game_ids: list[str] = [] # Run these games instead of a random batch (batch_size/game_type ignored)
+
+def run_summary(gid, iteration, final_state, duration):
+    return {
+        "game_id": gid,
+        "iteration": iteration,
+        "status": final_state.get("jury_verdict", "FAIL"),
+        "revisions": final_state.get("revision_count", 0),
+        "duration": duration,
+        "cost_est": 0.05, # Placeholder $0.05
+        "stage_metrics": final_state.get("stage_metrics", [])
+    }
+
+def load_job_stats(game_ids):
+    """
+    A job's game stats in one batch: {game_id: [stats text, load stages]}.
+    The load stages go out with the game's first run only (see job_stats).
+    """
+    stages = {}
+    texts = get_game_stats_many(game_ids, stages)
+    return {gid: [text, stages.get(gid, [])] for gid, text in texts.items()}
+
+def job_stats(stats, gid):
+    # (stats text, load stages) from the job's batch, else loaded on the spot
+    if stats is None or gid not in stats:
+        stages = []
+        return get_game_stats(gid, stages), stages
+    entry = stats[gid]
+    stages, entry[1] = entry[1], []
+    return entry[0], stages
+
+async def evaluate_run(gid, iteration, stats=None):
+    """
+    One benchmark run, executed by the job worker. None = game skipped.
+    """
+    # Reuse draft logic but return internal stats
+    stats_data, stages = await asyncio.to_thread(job_stats, stats, gid)
+    if stats_data.startswith(("Error", "No records")):
+        return None
+        
+    start_t = time.time()
+    inputs = {
+        "input_stats": stats_data, 
+        "draft": "", 
+        "jury_verdict": "", 
+        "jury_feedback": [], 
+        "revision_count": 0,
+        "stage_metrics": stages
+    }
+    final_state = await graph_app.ainvoke(inputs)
+    duration = time.time() - start_t
+    
+    return run_summary(gid, iteration, final_state, duration)
+
+async def evaluate_waves(runs, record, stats=None):
+    """
+    A whole schedule="waves" job, executed by the job worker.
+    runs = [(seq, game_id, iteration)]; each finished run goes to record().
+    Returns the model loads and schedule savings, stored as the job's metrics.
+    """
+    planned = []
+    for seq, gid, iteration in runs:
+        stats_data, stages = await asyncio.to_thread(job_stats, stats, gid)
+        if stats_data.startswith(("Error", "No records")):
+            record(seq, "skipped")
+            continue
+        inputs = {
+            "input_stats": stats_data,
+            "draft": "",
+            "jury_verdict": "",
+            "jury_feedback": [],
+            "revision_count": 0,
+            "stage_metrics": stages
+        }
+        planned.append((seq, gid, iteration, inputs))
+
+    async def on_done(i, final_state, duration, error):
+        seq, gid, iteration, _ = planned[i]
+        if error is not None:
+            record(seq, "error", {"game_id": gid, "iteration": iteration, "error": str(error)})
+        else:
+            record(seq, "done", run_summary(gid, iteration, final_state, duration))
+
+    tracker = ModelLoadTracker()
+    _, schedule = await run_waves([p[3] for p in planned], {"callbacks": [tracker]}, on_done)
+    loads = tracker.report()
+    saved = schedule_savings(schedule, loads)
+    print(f"Waves: {schedule['waves']} waves, {schedule['model_switches']} model switches "
+          f"({saved['model_switches_avoided']} avoided), {loads['model_loads']} model loads")
+    # Same shape as the benchmark's metrics["model_loads"] / metrics["schedule"]
+    return {"model_loads": loads, "schedule": {**schedule, **saved}}
 
 @app.post("/evaluate")
 async def run_evaluation(request: EvalRequest):
+    """
+    Queues a benchmark and returns its job id immediately.
+    Poll GET /evaluate/{job_id} for progress and results.
+    """
     from utils.data_loader import get_random_game_ids
-    import asyncio
-    
-    game_ids = get_random_game_ids(request.batch_size, request.game_type)
-    results = []
-    
-    total_start = time.time()
     
-    # Run sequentially to not OOM the GPU
-    for gid in game_ids:
-        for i in range(request.iterations):
-            try:
-                # Reuse draft logic but return internal stats
-                stats_data = get_game_stats(gid)
-                if "Error" in stats_data:
-                    continue
-                    
-                start_t = time.time()
-                inputs = {
-                    "input_stats": stats_data, 
-                    "draft": "", 
-                    "jury_verdict": "", 
-                    "jury_feedback": [], 
-                    "revision_count": 0
-                }
-                final_state = await asyncio.to_thread(graph_app.invoke, inputs)
-                duration = time.time() - start_t
-                
-                results.append({
-                    "game_id": gid,
-                    "iteration": i+1,
-                    "status": final_state.get("jury_verdict", "FAIL"),
-                    "revisions": final_state.get("revision_count", 0),
-                    "duration": duration,
-                    "cost_est": 0.05 # Placeholder $0.05
-                })
-            except Exception as e:
-                print(f"Eval Error {gid}: {e}")
-                
-    total_duration = time.time() - total_start
-    
-    return {
-        "total_duration": total_duration,
-        "total_runs": len(results),
-        "results": results,
-        "games_processed": game_ids
-    }
+    # May build the game catalog on first use: off the event loop
+    game_ids = request.game_ids or await asyncio.to_thread(get_random_game_ids, request.batch_size, request.game_type)
+    job_id = await asyncio.to_thread(submit_job, {**request.model_dump(), "game_ids": game_ids})
+    return {"job_id": job_id, "status": "queued", "games_processed": game_ids}
+
+@app.get("/evaluate/{job_id}")
+def evaluation_status(job_id: str):
+    # Progress plus every finished run so far
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    results = get_results(job_id)
+    stages = stage_percentiles([s for r in results for s in r.get("stage_metrics", [])])
+    return {**job, "results": results, "stages": stages}
+
+@app.get("/evaluate/{job_id}/results")
+def evaluation_results(job_id: str, since: int = 0):
+    # Incremental: only runs after the first `since` planned runs
+    if get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return {"job_id": job_id, "results": get_results(job_id, since)}
+
+@app.delete("/evaluate/{job_id}")
+def cancel_evaluation(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    if not cancel_job(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} already {job['status']}")
+    return {"job_id": job_id, "status": "cancelled"}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
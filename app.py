@@ -1,6 +1,9 @@
 import streamlit as st
+import asyncio
+import threading
 import time
 from utils.data_loader import get_game_stats
+from utils.game_index import get_game_index
 from graph import app as graph_app
 import pandas as pd
 import os
@@ -21,8 +24,23 @@ def load_games_list():
         # Realistically we need team names. teams.csv has names.
     return pd.DataFrame()
 
+@st.cache_resource
+def load_game_index():
+    # Built once per Streamlit server process, shared across sessions/reruns
+    return get_game_index()
+
+@st.cache_resource
+def graph_event_loop():
+    # The graph is async and the agents share one Ollama client pool, which
+    # must stay on a single event loop; keep one running for the process
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
 st.set_page_config(layout="wide", page_title="SportsEdit-AI Newsroom")
 
+load_game_index()
+
 st.title("🏀 SportsEdit-AI: Agentic Newsroom")
 
 # ROI Calculator Header
@@ -67,7 +85,9 @@ if st.sidebar.button("Draft Article"):
             try:
                 # We iterate to capture steps if we want updates
                 # For now, just invoke
-                final_state = graph_app.invoke(inputs)
+                final_state = asyncio.run_coroutine_threadsafe(
+                    graph_app.ainvoke(inputs), graph_event_loop()
+                ).result()
                 
                 execution_time = time.time() - start_time
                 human_time = 15 * 60 # 15 mins for a human
@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { useRef, useState } from 'react'
 
 function App() {
   const [gameId, setGameId] = useState('22200477')
@@ -10,36 +10,97 @@ function App() {
   const [evalData, setEvalData] = useState(null)
   const [gameType, setGameType] = useState('all')
 
-  const handleDraft = async () => {
+  // Live progress from /draft/stream
+  const [liveDraft, setLiveDraft] = useState('')
+  const [revision, setRevision] = useState(0)
+  const [jurors, setJurors] = useState([])
+  const sourceRef = useRef(null)
+
+  const handleDraft = async (force = false) => {
     setLoading(true)
     setError(null)
     setData(null)
+    setLiveDraft('')
+    setRevision(0)
+    setJurors([])
 
-    try {
-      const response = await fetch('http://localhost:8000/draft', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ game_id: gameId }),
-      })
-
-      if (!response.ok) {
-        const errData = await response.json()
-        throw new Error(errData.detail || 'Failed to fetch')
+    // Already published under the current pipeline? Show it without running the agents
+    if (!force) {
+      try {
+        const res = await fetch(`http://localhost:8000/article/${encodeURIComponent(gameId)}`)
+        if (res.ok) {
+          setData(await res.json())
+          setLoading(false)
+          return
+        }
+      } catch (err) {
+        // Fall through to a fresh draft
       }
+    }
 
-      const result = await response.json()
-      setData(result)
-    } catch (err) {
-      setError(err.message)
-    } finally {
+    const query = `game_id=${encodeURIComponent(gameId)}${force ? '&force=true' : ''}`
+    const source = new EventSource(`http://localhost:8000/draft/stream?${query}`)
+    sourceRef.current = source
+
+    const finish = () => {
+      source.close()
+      sourceRef.current = null
       setLoading(false)
     }
+
+    source.addEventListener('revision', (e) => {
+      setRevision(JSON.parse(e.data).revision)
+      setLiveDraft('')
+      setJurors([])
+    })
+    source.addEventListener('token', (e) => {
+      const { text } = JSON.parse(e.data)
+      setLiveDraft((prev) => prev + text)
+    })
+    source.addEventListener('draft', (e) => setLiveDraft(JSON.parse(e.data).draft))
+    source.addEventListener('screen', (e) => {
+      const { errors } = JSON.parse(e.data)
+      setJurors([{ juror: 'screen', status: 'FAIL', detail: errors.join('; ') }])
+    })
+    source.addEventListener('juror', (e) => {
+      const { juror, result } = JSON.parse(e.data)
+      const status = result.status || (result.score !== undefined ? `Score ${result.score}` : 'DONE')
+      setJurors((prev) => [...prev, { juror, status }])
+    })
+    source.addEventListener('final', (e) => {
+      setData(JSON.parse(e.data))
+      finish()
+    })
+    source.addEventListener('error', (e) => {
+      // Server-sent error event carries a detail; a bare error means the connection dropped
+      setError(e.data ? JSON.parse(e.data).detail : 'Connection to the API was lost')
+      finish()
+    })
+  }
+
+  const handleAbort = () => {
+    // Closing the stream cancels the run on the server
+    if (sourceRef.current) {
+      sourceRef.current.close()
+      sourceRef.current = null
+    }
+    setLoading(false)
+    setError('Draft aborted')
+  }
+
+  // Evaluation runs as a background job on the API; poll it for progress
+  const [evalJob, setEvalJob] = useState(null)
+  const pollRef = useRef(null)
+
+  const stopPolling = () => {
+    clearInterval(pollRef.current)
+    pollRef.current = null
+    setLoading(false)
   }
 
   const handleEval = async () => {
     setLoading(true)
+    setError(null)
     setEvalData(null)
     try {
       const response = await fetch('http://localhost:8000/evaluate', {
@@ -47,15 +108,35 @@ function App() {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ batch_size: 3, iterations: 1, game_type: gameType })
       })
-      const res = await response.json()
-      setEvalData(res)
+      const { job_id } = await response.json()
+      setEvalJob({ job_id, status: 'queued', done: 0, total: 0 })
+
+      pollRef.current = setInterval(async () => {
+        try {
+          const res = await fetch(`http://localhost:8000/evaluate/${job_id}`)
+          const job = await res.json()
+          setEvalJob(job)
+          setEvalData(job)
+          if (['done', 'cancelled', 'failed'].includes(job.status)) {
+            if (job.error) setError(job.error)
+            stopPolling()
+          }
+        } catch (err) {
+          setError(err.message)
+          stopPolling()
+        }
+      }, 2000)
     } catch (err) {
       setError(err.message)
-    } finally {
       setLoading(false)
     }
   }
 
+  const handleCancelEval = async () => {
+    if (!evalJob) return
+    await fetch(`http://localhost:8000/evaluate/${evalJob.job_id}`, { method: 'DELETE' })
+  }
+
   // ROI Calculations
   // If in draft mode, use single run data. If eval, aggregate.
   const humanTimeSeconds = 15 * 60
@@ -119,9 +200,19 @@ function App() {
                   placeholder="Ex: 22200477"
                 />
               </div>
-              <button onClick={handleDraft} disabled={loading}>
-                {loading ? 'Agents Working...' : 'Draft Article'}
+              <button onClick={() => handleDraft()} disabled={loading}>
+                {loading ? `Agents Working... (Revision ${revision})` : 'Draft Article'}
               </button>
+              {data?.cached && !loading && (
+                <button onClick={() => handleDraft(true)} style={{ marginTop: '0.5rem', background: '#334155' }}>
+                  Regenerate
+                </button>
+              )}
+              {loading && (
+                <button onClick={handleAbort} style={{ marginTop: '0.5rem', background: '#334155' }}>
+                  Abort
+                </button>
+              )}
               {error && <div style={{ color: 'var(--error)', marginTop: '1rem' }}>{error}</div>}
             </div>
 
@@ -140,11 +231,16 @@ function App() {
           <div className="main">
             <div className="card" style={{ minHeight: '400px' }}>
               <h2 style={{ marginTop: 0 }}>Latest Draft</h2>
-              {loading && (
+              {loading && !liveDraft && (
                 <div className="loader" style={{ textAlign: 'center', padding: '4rem' }}>
                   Writing...
                 </div>
               )}
+              {loading && liveDraft && (
+                <div className="article-content">
+                  {liveDraft}
+                </div>
+              )}
               {data && (
                 <div className="article-content">
                   {data.draft}
@@ -182,6 +278,15 @@ function App() {
                     </div>
                   )}
                 </div>
+              ) : jurors.length > 0 ? (
+                <div>
+                  <div className="metric-label">Revision {revision}</div>
+                  {jurors.map((j, i) => (
+                    <div key={i} className={`log-entry ${j.status === 'FAIL' ? 'status-fail' : ''}`}>
+                      {j.juror}: {j.status}{j.detail ? ` (${j.detail})` : ''}
+                    </div>
+                  ))}
+                </div>
               ) : (
                 <div style={{ color: '#64748B' }}>Waiting for jury...</div>
               )}
@@ -210,8 +315,19 @@ function App() {
           <button onClick={handleEval} disabled={loading} style={{ width: '200px' }}>
             {loading ? 'Running Batch...' : 'Run Benchmark'}
           </button>
+          {loading && evalJob && (
+            <button onClick={handleCancelEval} style={{ width: '200px', marginLeft: '1rem', background: '#334155' }}>
+              Cancel
+            </button>
+          )}
+          {evalJob && (
+            <div className="metric-label" style={{ marginTop: '1rem' }}>
+              Job {evalJob.job_id}: {evalJob.status} ({evalJob.done}/{evalJob.total || '?'} runs)
+            </div>
+          )}
+          {error && <div style={{ color: 'var(--error)', marginTop: '1rem' }}>{error}</div>}
 
-          {evalData && (
+          {evalData && evalData.total_runs > 0 && (
             <div style={{ marginTop: '2rem' }}>
               <h3>Results</h3>
               <div style={{ display: 'grid', gridTemplateColumns: 'repeat(4,1fr)', gap: '1rem', marginBottom: '2rem' }}>
@@ -233,6 +349,34 @@ function App() {
                 </div>
               </div>
 
+              {evalData.stages && Object.keys(evalData.stages).length > 0 && (
+                <>
+                  <h3>Stage Latency</h3>
+                  <table style={{ width: '100%', borderCollapse: 'collapse', marginBottom: '2rem' }}>
+                    <thead>
+                      <tr style={{ textAlign: 'left', borderBottom: '1px solid #334155' }}>
+                        <th style={{ padding: '0.5rem' }}>Stage</th>
+                        <th>Count</th>
+                        <th>p50</th>
+                        <th>p95</th>
+                        <th>Tokens/sec</th>
+                      </tr>
+                    </thead>
+                    <tbody>
+                      {Object.entries(evalData.stages).map(([stage, s]) => (
+                        <tr key={stage} style={{ borderBottom: '1px solid #1E293B' }}>
+                          <td style={{ padding: '0.5rem' }}>{stage}</td>
+                          <td>{s.count}</td>
+                          <td>{s.p50.toFixed(2)}s</td>
+                          <td>{s.p95.toFixed(2)}s</td>
+                          <td>{s.avg_tokens_per_sec ? s.avg_tokens_per_sec.toFixed(1) : '-'}</td>
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                </>
+              )}
+
               <table style={{ width: '100%', borderCollapse: 'collapse' }}>
                 <thead>
                   <tr style={{ textAlign: 'left', borderBottom: '1px solid #334155' }}>
@@ -1,13 +1,29 @@
-from typing import TypedDict, List
+import asyncio
+import copy
+import hashlib
+import json
+import operator
+import os
+import time
+import weakref
+from typing import TypedDict, List, Annotated
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from agents.writer import get_writer_chain
-from agents.jury import get_fact_checker, get_editor_in_chief, get_bias_watchdog, get_seo_strategist, get_engagement_editor, get_brand_safety
+from agents.jury import get_fact_checker, get_editor_in_chief, get_bias_watchdog, get_seo_strategist, get_engagement_editor, get_brand_safety, get_jury_panel
+from utils.fact_screen import screen_draft, record_screen
+from utils.thresholds import EDITOR_MIN_SCORE, SEO_MIN_SCORE, ENGAGEMENT_MIN_SCORE, MAX_REVISIONS
+from utils.metrics import usage_config, record_stage, revision_record
 
 # Define the State
 class AgentState(TypedDict):
     input_stats: str
     draft: str
     force_draft: str # Optional: For Red Teaming to bypass writer
+    jury_mode: str # Optional: "full", "fail_fast" or "panel" (defaults to JURY_MODE)
+    fact_screen: bool # Optional: run the rule-based screen before the jury (defaults to FACT_SCREEN)
+    screen_errors: List[str]
     # Aggregate Jury Results
     jury_verdict: str # PASS or FAIL
     jury_feedback: List[str] 
@@ -16,8 +32,10 @@ class AgentState(TypedDict):
     jury_seo_score: int
     jury_engagement_score: int
     jury_detailed_results: dict
+    # Per-stage timing/token records (utils/metrics.py); nodes append, never replace
+    stage_metrics: Annotated[List[dict], operator.add]
 
-def writer_node(state: AgentState):
+async def writer_node(state: AgentState, config: RunnableConfig = None):
     # RED TEAM BYPASS
     if state.get("force_draft"):
         return {"draft": state['force_draft'], "revision_count": state.get("revision_count", 0) + 1}
@@ -30,51 +48,128 @@ def writer_node(state: AgentState):
         feedback_str = "; ".join(state['jury_feedback'])
         input_text += f"\n\nCRITICAL FEEDBACK FROM JURY: {feedback_str}. Fix these errors."
         
-    response = chain.invoke({"stats": input_text})
-    return {"draft": response.content, "revision_count": state.get("revision_count", 0) + 1}
+    revision = state.get("revision_count", 0) + 1
+    start = time.time()
+    call_config, usage = usage_config(config)
+    response = await chain.ainvoke({"stats": input_text}, call_config)
+    return {
+        "draft": response.content,
+        "revision_count": revision,
+        "stage_metrics": [record_stage("writer", time.time() - start, usage, revision)]
+    }
+
+# Jurors are independent, so they run side by side. Match this to the Ollama
+# server's parallel slots (OLLAMA_NUM_PARALLEL); extra requests just queue there.
+JURY_CONCURRENCY = int(os.getenv("JURY_CONCURRENCY", "6"))
+
+# One semaphore per event loop, shared by all graph runs on it, so concurrent
+# requests don't oversubscribe the server
+_jury_slots = weakref.WeakKeyDictionary()
+
+def jury_slots():
+    loop = asyncio.get_running_loop()
+    if loop not in _jury_slots:
+        _jury_slots[loop] = asyncio.Semaphore(JURY_CONCURRENCY)
+    return _jury_slots[loop]
+
+# (result key, chain factory, needs stats, fallback if the call or JSON parsing fails)
+JURORS = [
+    # --- STANDARDS DIVISION (Veto Power) ---
+    ("fact", get_fact_checker, True, {"status": "FAIL", "errors": ["Fact check parsing error"]}),
+    ("bias", get_bias_watchdog, False, {"status": "FAIL", "issues": ["Bias check parsing error"]}),
+    ("safety", get_brand_safety, False, {"status": "PASS", "flags": ["Safety check error"]}),
+    # --- EDITORIAL DIVISION ---
+    ("editor", get_editor_in_chief, False, {"status": "PASS", "score": 5, "feedback": "Editor check failed"}),
+    # --- GROWTH DIVISION ---
+    ("seo", get_seo_strategist, False, {"score": 50, "suggestions": ["SEO check failed"]}),
+    ("engagement", get_engagement_editor, False, {"score": 5, "critique": "Engagement check failed"}),
+]
+
+# "full": every juror scores every draft.
+# "fail_fast": the veto jurors run first; if any of them fails the draft it is
+# getting rewritten anyway, so the editorial/growth jurors are skipped.
+# "panel": one combined call returns all six verdicts (see run_panel).
+JURY_MODE = os.getenv("JURY_MODE", "full")
+VETO_JURORS = ("fact", "bias", "safety")
+
+async def run_juror(juror, draft, stats, config=None, stages=None):
+    key, factory, needs_stats, fallback = juror
+    inputs = {"stats": stats, "draft": draft} if needs_stats else {"draft": draft}
+    async with jury_slots():
+        start = time.time()
+        call_config, usage = usage_config(config, f"juror:{key}")
+        try:
+            result = await factory().ainvoke(inputs, call_config)
+        except Exception:
+            result = copy.deepcopy(fallback)
+        if stages is not None:
+            stages.append(record_stage(f"juror:{key}", time.time() - start, usage))
+    if config is not None:
+        # Picked up by /draft/stream as soon as this juror is done
+        await adispatch_custom_event("juror", {"juror": key, "result": result}, config=config)
+    return result
 
-def jury_node(state: AgentState):
+async def run_jurors(jurors, draft, stats, config=None, stages=None):
+    # All jurors in flight at once (up to JURY_CONCURRENCY)
+    results = await asyncio.gather(*(run_juror(juror, draft, stats, config, stages) for juror in jurors))
+    return {juror[0]: result for juror, result in zip(jurors, results)}
+
+async def run_panel(draft, stats, config=None, stages=None):
+    """
+    All six jurors from one call (agents/jury.py get_jury_panel). A juror the
+    panel left out or returned malformed gets its usual fallback.
+    """
+    async with jury_slots():
+        start = time.time()
+        call_config, usage = usage_config(config, "jury:panel")
+        try:
+            panel = await get_jury_panel().ainvoke({"stats": stats, "draft": draft}, call_config)
+        except Exception:
+            panel = {}
+        if stages is not None:
+            stages.append(record_stage("jury:panel", time.time() - start, usage))
+
+    results = {}
+    for key, _, _, fallback in JURORS:
+        result = panel.get(key) if isinstance(panel, dict) else None
+        results[key] = result if isinstance(result, dict) and result else copy.deepcopy(fallback)
+        if config is not None:
+            await adispatch_custom_event("juror", {"juror": key, "result": results[key]}, config=config)
+    return results
+
+async def jury_node(state: AgentState, config: RunnableConfig = None):
     draft = state['draft']
     stats = state['input_stats']
-    
-    # --- STANDARDS DIVISION (Veto Power) ---
-    # 1. Fact Check
-    try:
-        fact_res = get_fact_checker().invoke({"stats": stats, "draft": draft})
-    except:
-        fact_res = {"status": "FAIL", "errors": ["Fact check parsing error"]}
-
-    # 2. Bias Check
-    try:
-        bias_res = get_bias_watchdog().invoke({"draft": draft})
-    except:
-        bias_res = {"status": "FAIL", "issues": ["Bias check parsing error"]}
-        
-    # 3. Brand Safety (New)
-    try:
-        safety_res = get_brand_safety().invoke({"draft": draft})
-    except:
-        safety_res = {"status": "PASS", "flags": ["Safety check error"]} 
+    mode = state.get("jury_mode") or JURY_MODE
+    revision = state.get("revision_count", 0)
+    stages = []
+    start = time.time()
 
-    # --- EDITORIAL DIVISION ---
-    # 4. Editor-in-Chief
-    try:
-        editor_res = get_editor_in_chief().invoke({"draft": draft})
-    except:
-        editor_res = {"status": "PASS", "score": 5, "feedback": "Editor check failed"}
+    if mode == "fail_fast":
+        results = await run_jurors([j for j in JURORS if j[0] in VETO_JURORS], draft, stats, config, stages)
+        rest = [j for j in JURORS if j[0] not in VETO_JURORS]
+        if any(results[key].get("status") == "FAIL" for key in VETO_JURORS):
+            results.update({j[0]: {"status": "SKIPPED"} for j in rest})
+        else:
+            results.update(await run_jurors(rest, draft, stats, config, stages))
+    elif mode == "panel":
+        results = await run_panel(draft, stats, config, stages)
+    else:
+        results = await run_jurors(JURORS, draft, stats, config, stages)
 
-    # --- GROWTH DIVISION ---
-    # 5. SEO Strategist (New)
-    try:
-        seo_res = get_seo_strategist().invoke({"draft": draft})
-    except:
-        seo_res = {"score": 50, "suggestions": ["SEO check failed"]}
-
-    # 6. Engagement Editor (New)
-    try:
-        engage_res = get_engagement_editor().invoke({"draft": draft})
-    except:
-        engage_res = {"score": 5, "critique": "Engagement check failed"}
+    jury_seconds = time.time() - start
+    for record in stages:
+        record["revision"] = revision
+    stages.append(record_stage("jury", jury_seconds, revision=revision))
+    tokens = (sum(r["prompt_tokens"] for r in stages), sum(r["completion_tokens"] for r in stages))
+    stages.append(revision_record(state.get("stage_metrics") or [], revision, jury_seconds, tokens))
+
+    fact_res = results["fact"]
+    bias_res = results["bias"]
+    safety_res = results["safety"]
+    editor_res = results["editor"]
+    seo_res = results["seo"]
+    engage_res = results["engagement"]
 
     # --- AGGREGATION LOGIC ---
     verdict = "PASS"
@@ -93,23 +188,29 @@ def jury_node(state: AgentState):
         verdict = "FAIL"
         feedback.extend([f"SAFETY: {f}" for f in safety_res.get("flags", [])])
 
+    # Skipped jurors (fail_fast after a veto) have no score
+    editor_score = seo_score = engage_score = None
+
     # Editorial Quality (Score < 6 => FAIL)
-    editor_score = editor_res.get("score", 5)
-    if editor_res.get("status") == "FAIL" or editor_score < 6:
-        verdict = "FAIL" 
-        feedback.append(f"EDITOR (Score {editor_score}/10): {editor_res.get('feedback')}")
+    if editor_res.get("status") != "SKIPPED":
+        editor_score = editor_res.get("score", 5)
+        if editor_res.get("status") == "FAIL" or editor_score < EDITOR_MIN_SCORE:
+            verdict = "FAIL" 
+            feedback.append(f"EDITOR (Score {editor_score}/10): {editor_res.get('feedback')}")
         
     # SEO (Score < 70 => FAIL)
-    seo_score = seo_res.get("score", 0)
-    if seo_score < 70:
-        verdict = "FAIL"
-        feedback.extend([f"SEO (Score {seo_score}): {s}" for s in seo_res.get("suggestions", [])])
+    if seo_res.get("status") != "SKIPPED":
+        seo_score = seo_res.get("score", 0)
+        if seo_score < SEO_MIN_SCORE:
+            verdict = "FAIL"
+            feedback.extend([f"SEO (Score {seo_score}): {s}" for s in seo_res.get("suggestions", [])])
 
     # Engagement (Score < 7 => FAIL)
-    engage_score = engage_res.get("score", 0)
-    if engage_score < 7:
-        verdict = "FAIL"
-        feedback.append(f"ENGAGEMENT (Score {engage_score}): {engage_res.get('critique')}")
+    if engage_res.get("status") != "SKIPPED":
+        engage_score = engage_res.get("score", 0)
+        if engage_score < ENGAGEMENT_MIN_SCORE:
+            verdict = "FAIL"
+            feedback.append(f"ENGAGEMENT (Score {engage_score}): {engage_res.get('critique')}")
 
     return {
         "jury_verdict": verdict,
@@ -124,23 +225,103 @@ def jury_node(state: AgentState):
             "seo": seo_res,
             "engagement": engage_res
         },
-        "jury_feedback": feedback
+        "jury_feedback": feedback,
+        "stage_metrics": stages
+    }
+
+# Rule-based pre-jury screen (utils/fact_screen.py). Opt-in: set FACT_SCREEN=1 to enable.
+FACT_SCREEN = os.getenv("FACT_SCREEN", "0") != "0"
+
+def screen_node(state: AgentState):
+    if not state.get("fact_screen", FACT_SCREEN):
+        return {"screen_errors": []}
+
+    start = time.time()
+    errors = screen_draft(state['draft'], state['input_stats'])
+    screen_seconds = time.time() - start
+    mode = state.get("jury_mode") or JURY_MODE
+    calls = {"fail_fast": len(VETO_JURORS), "panel": 1}.get(mode, len(JURORS))
+    record_screen(bool(errors), calls_saved=calls)
+    if not errors:
+        return {"screen_errors": []}
+
+    # Rejected without calling the jury; same shape as a jury FAIL
+    return {
+        "screen_errors": errors,
+        "jury_verdict": "FAIL",
+        "jury_quality_score": None,
+        "jury_seo_score": None,
+        "jury_engagement_score": None,
+        "jury_detailed_results": {
+            "screen": {"status": "FAIL", "errors": errors},
+            **{juror[0]: {"status": "SKIPPED"} for juror in JURORS}
+        },
+        "jury_feedback": [f"FACT (screen): {e}" for e in errors],
+        # Revision ends here (no jury), so close out its timing
+        "stage_metrics": [revision_record(state.get("stage_metrics") or [], state.get("revision_count", 0), screen_seconds)]
     }
 
+def after_screen(state: AgentState):
+    if state.get("screen_errors"):
+        return should_revise(state)
+    return "jury"
+
 def should_revise(state: AgentState):
     if state['jury_verdict'] == "PASS":
         return "end"
-    if state['revision_count'] >= 3:
+    if state['revision_count'] >= MAX_REVISIONS:
         return "end"
     return "rewrite"
 
+def chain_signature(chain):
+    # Model, temperature and prompt text of a prompt | llm [| parser] chain
+    signature = []
+    for step in getattr(chain, "steps", [chain]):
+        if hasattr(step, "messages"):
+            signature.append([[type(m).__name__, m.prompt.template] for m in step.messages])
+            signature.append(sorted((k, str(v)) for k, v in step.partial_variables.items()))
+        elif hasattr(step, "model"):
+            signature.append([step.model, step.temperature])
+    return signature
+
+_fingerprint = None
+
+def pipeline_fingerprint():
+    """
+    Short hash of everything that decides what the pipeline publishes: agent
+    models, temperatures and prompts, jury mode, fact screen, pass marks and
+    revision budget. Stored articles from another fingerprint are stale.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        parts = {
+            "writer": chain_signature(get_writer_chain()),
+            "jurors": {key: chain_signature(factory()) for key, factory, _, _ in JURORS},
+            "panel": chain_signature(get_jury_panel()),
+            "jury_mode": JURY_MODE,
+            "fact_screen": FACT_SCREEN,
+            "thresholds": [EDITOR_MIN_SCORE, SEO_MIN_SCORE, ENGAGEMENT_MIN_SCORE, MAX_REVISIONS],
+        }
+        _fingerprint = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return _fingerprint
+
 # Graph Construction
 workflow = StateGraph(AgentState)
 workflow.add_node("writer", writer_node)
+workflow.add_node("screen", screen_node)
 workflow.add_node("jury", jury_node)
 
 workflow.set_entry_point("writer")
-workflow.add_edge("writer", "jury")
+workflow.add_edge("writer", "screen")
+workflow.add_conditional_edges(
+    "screen",
+    after_screen,
+    {
+        "jury": "jury",
+        "rewrite": "writer",
+        "end": END
+    }
+)
 workflow.add_conditional_edges(
     "jury",
     should_revise,
@@ -150,4 +331,5 @@ workflow.add_conditional_edges(
     }
 )
 
+# Async nodes: run with `await app.ainvoke(...)` / `app.astream(...)`
 app = workflow.compile()
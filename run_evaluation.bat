@@ -11,7 +11,12 @@ echo ---------------------------------------------------------------------------
 
 call venv\Scripts\activate
 
-if not exist "context_cache" (
+if not exist "game_store" (
+    echo [System] Game Store not found. Indexing games_details.csv... (This happens once)
+    python utils/game_store.py
+)
+
+if not exist "context_cache.db" (
     echo [System] Context Cache not found. Building deep context... (This happens once)
     python utils/build_context.py
 )
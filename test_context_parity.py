@@ -0,0 +1,107 @@
+import sys
+import os
+import random
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.build_context import (
+    GAMES_PATH, load_games, replay_loop, replay_vectorized,
+    new_state, dump_checkpoint, load_checkpoint, games_since
+)
+
+def make_games(seed=7, seasons=4):
+    """
+    Small synthetic games.csv replica: preseason, regular season, play-in,
+    best-of-7 playoff series, missing scores and a duplicated row.
+    """
+    rng = random.Random(seed)
+    teams = list(range(1610612737, 1610612749))
+    rows = []
+    date = pd.Timestamp("2015-10-01")
+
+    def add(gid, home, visitor, season, scored=True):
+        nonlocal date
+        pts_home, pts_away = rng.randint(85, 130), rng.randint(85, 130)
+        rows.append({
+            "GAME_DATE_EST": date.strftime("%Y-%m-%d"), "GAME_ID": int(gid),
+            "GAME_STATUS_TEXT": "Final", "HOME_TEAM_ID": home, "VISITOR_TEAM_ID": visitor,
+            "SEASON": season,
+            "PTS_home": pts_home if scored else None, "PTS_away": pts_away if scored else None,
+        })
+        return pts_home > pts_away
+
+    for season in range(2015, 2015 + seasons):
+        yy = season % 100
+        for k in range(3):
+            add(f"1{yy:02d}{k:05d}", *rng.sample(teams, 2), season)
+            date += pd.Timedelta(days=1)
+        for k in range(1, 80):
+            add(f"2{yy:02d}{k:05d}", *rng.sample(teams, 2), season, scored=k % 40 != 0)
+            if k % 3:
+                date += pd.Timedelta(days=1)
+        add(f"5{yy:02d}00001", *rng.sample(teams, 2), season)
+
+        alive = rng.sample(teams, 8)
+        for rnd in range(1, 5):
+            winners = []
+            for s in range(len(alive) // 2):
+                a, b = alive[2 * s], alive[2 * s + 1]
+                wins = {a: 0, b: 0}
+                g = 1
+                while max(wins.values()) < 4:
+                    home, visitor = (a, b) if g in (1, 2, 5, 7) else (b, a)
+                    home_won = add(f"4{yy:02d}00{rnd}{s}{g}", home, visitor, season)
+                    wins[home if home_won else visitor] += 1
+                    g += 1
+                    date += pd.Timedelta(days=1)
+                winners.append(max(wins, key=wins.get))
+            alive = winners
+        rows.append(dict(rows[-3])) # Kaggle's games.csv has duplicate rows
+
+    df = pd.DataFrame(rows)
+    df['GAME_DATE_EST'] = pd.to_datetime(df['GAME_DATE_EST'])
+    return df.sort_values('GAME_DATE_EST')
+
+def test_vectorized_matches_loop():
+    df = make_games()
+    assert replay_vectorized(df) == replay_loop(df)
+
+def test_vectorized_final_state_matches_loop():
+    df = make_games()
+    loop_state, vec_state = new_state(), new_state()
+    replay_loop(df, loop_state)
+    replay_vectorized(df, vec_state)
+    assert dump_checkpoint(vec_state, "", []) == dump_checkpoint(loop_state, "", [])
+
+def test_resume_from_checkpoint():
+    # Stop mid-playoffs (and mid-day), resume, and compare with one full replay
+    df = make_games()
+    full = replay_loop(df)
+    cut = len(df) - 20
+    head, last_day = df.iloc[:cut], df['GAME_DATE_EST'].iloc[cut - 1]
+    state = new_state()
+    rows = replay_vectorized(head, state)
+    seen = head.loc[head['GAME_DATE_EST'] == last_day, 'GAME_ID'].astype(str)
+    text = dump_checkpoint(state, str(last_day.date()), seen)
+
+    state, last_date, last_ids = load_checkpoint(text)
+    rows += replay_loop(games_since(df, last_date, last_ids), state)
+    assert rows == full
+
+def test_vectorized_matches_loop_on_dataset():
+    if not os.path.exists(GAMES_PATH):
+        return # Kaggle dataset not available
+    df = load_games()
+    assert replay_vectorized(df) == replay_loop(df)
+
+if __name__ == "__main__":
+    test_vectorized_matches_loop()
+    print("PASS: Synthetic seasons byte-identical")
+    test_vectorized_final_state_matches_loop()
+    test_resume_from_checkpoint()
+    print("PASS: Checkpoint resume matches full replay")
+    if os.path.exists(GAMES_PATH):
+        test_vectorized_matches_loop_on_dataset()
+        print("PASS: games.csv byte-identical")
@@ -0,0 +1,59 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.fact_screen import parse_stats, screen_draft
+
+STATS = """SEASON CONTEXT (2019):
+Home Record: 13-12 (Reg), 0-0 (Post) (Streak: 2)
+
+GAME STATS:
+FINAL SCORE: GSW (118) def. TOR (109)
+
+DETAILS: GSW (118 pts): Stephen Curry (37 pts, 5 reb, 9 ast), Klay Thompson (21 pts, 4 reb, 2 ast), Draymond Green (9 pts, 11 reb, 10 ast) | TOR (109 pts): Kawhi Leonard (30 pts, 8 reb, 4 ast), Pascal Siakam (20 pts, 9 reb, 3 ast), Kyle Lowry (17 pts, 3 reb, 7 ast)"""
+
+CLEAN = (
+    "The Golden State Warriors defeated the Toronto Raptors 118-109 on Sunday night. "
+    "Stephen Curry poured in 37 points with 9 assists, and Draymond Green added 11 rebounds. "
+    "Kawhi Leonard led Toronto with 30 points. Golden State trailed 58-55 at the half "
+    "and improved to 13-12."
+)
+
+# Stephen Curry and Klay Thompson are in the top 3, Gary Payton II is not
+STATS_LAL = """FINAL SCORE: GSW (120) def. LAL (110)
+
+DETAILS: GSW (120 pts): Stephen Curry (37 pts, 5 reb, 9 ast), Klay Thompson (21 pts, 4 reb, 2 ast), Andrew Wiggins (18 pts, 6 reb, 3 ast) | LAL (110 pts): LeBron James (31 pts, 7 reb, 8 ast), Anthony Davis (25 pts, 12 reb, 2 ast), Austin Reaves (14 pts, 3 reb, 5 ast)"""
+
+def test_parse_stats():
+    facts = parse_stats(STATS)
+    assert facts["winner"] == "GSW" and facts["loser"] == "TOR"
+    assert facts["scores"] == {"GSW": 118, "TOR": 109}
+    assert facts["players"]["Draymond Green"] == (9, 11, 10)
+
+def test_clean_draft_passes():
+    assert screen_draft(CLEAN, STATS) == []
+
+def test_wrong_facts_are_caught():
+    assert screen_draft(CLEAN.replace("118-109", "118-119"), STATS)
+    assert screen_draft(CLEAN.replace("defeated", "lost to"), STATS)
+    assert screen_draft(CLEAN.replace("37 points", "47 points"), STATS)
+    assert screen_draft(CLEAN.replace("Toronto Raptors", "Los Angeles Lakers"), STATS)
+
+def test_correct_sentences_are_not_flagged():
+    # Stats after a short name or another player's name belong to that player
+    assert screen_draft("Klay Thompson added 21 points while Curry had 37 points and 9 assists.", STATS_LAL) == []
+    assert screen_draft("Stephen Curry scored 37 points; Gary Payton II chipped in 8 rebounds.", STATS_LAL) == []
+    assert screen_draft("Stephen Curry scored 37 points, Payton had 8 rebounds.", STATS_LAL) == []
+    # A team that only comes up as the next opponent is not an outsider
+    assert screen_draft("The Warriors beat the Lakers 120-110 and next face the Celtics on Friday.", STATS_LAL) == []
+    # ...but one stated as winning or losing this game is
+    assert screen_draft("The Warriors beat the Celtics 120-110.", STATS_LAL)
+
+if __name__ == "__main__":
+    test_parse_stats()
+    test_clean_draft_passes()
+    test_wrong_facts_are_caught()
+    test_correct_sentences_are_not_flagged()
+    print("PASS: Fact screen")
@@ -0,0 +1,28 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.evaluate_batch import attack_caught
+
+VETOED = {
+    "fact": {"status": "FAIL"}, "safety": {"status": "PASS"}, "bias": {"status": "PASS"},
+    "editor": {"status": "SKIPPED"}, "seo": {"status": "SKIPPED"}, "engagement": {"status": "SKIPPED"},
+}
+
+def test_skipped_target_counts_as_caught():
+    # fail_fast: the fact veto blocked the draft before the scoring jurors ran
+    for attack in ("editor", "seo", "engagement"):
+        assert attack_caught(attack, VETOED) == (True, True)
+
+def test_scores_decide_otherwise():
+    assert attack_caught("seo", {"seo": {"score": 40}}) == (True, False)
+    assert attack_caught("seo", {"seo": {"score": 90}}) == (False, False)
+    assert attack_caught("editor", {"editor": {"status": "PASS", "score": 8}}) == (False, False)
+    assert attack_caught("bias", VETOED) == (False, False)
+
+if __name__ == "__main__":
+    test_skipped_target_counts_as_caught()
+    test_scores_decide_otherwise()
+    print("PASS: Red team catch check")
@@ -0,0 +1,342 @@
+import argparse
+import heapq
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add project root to path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.thresholds import EDITOR_MIN_SCORE, SEO_MIN_SCORE, ENGAGEMENT_MIN_SCORE
+from utils.result_log import iter_log
+
+# One-pass, bounded-memory metrics over benchmark run logs (utils/result_log.py).
+# Every piece is mergeable, so shards can be aggregated separately and combined.
+
+class LogHistogram:
+    """
+    Log-bucketed histogram: bucket i holds values up to min_value * growth**i,
+    so percentiles come back within `growth` relative error in O(buckets) memory.
+    """
+
+    def __init__(self, growth=1.05, min_value=1e-3):
+        self.growth = growth
+        self.min_value = min_value
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+
+    def add(self, value):
+        i = 0 if value <= self.min_value else math.ceil(math.log(value / self.min_value, self.growth))
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for i, n in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, pct):
+        if not self.count:
+            return None
+        rank = min(self.count, int(pct / 100 * self.count) + 1)
+        seen = 0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen >= rank:
+                return min(self.min_value * self.growth ** i, self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+class TopK:
+    """
+    Most frequent items in bounded memory: counts are kept for at most
+    2 x `capacity` items, and past that only the `capacity` largest survive.
+    A frequent item stays in; an item pruned early can come back with a
+    count that misses its occurrences from before.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, item, n=1):
+        self.counts[item] = self.counts.get(item, 0) + n
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def merge(self, other):
+        for item, n in other.counts.items():
+            self.counts[item] = self.counts.get(item, 0) + n
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        self.counts = dict(heapq.nlargest(self.capacity, self.counts.items(), key=lambda kv: kv[1]))
+
+    def most_common(self, k):
+        return heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+
+def juror_failed(juror, result):
+    # Same pass marks as the jury's aggregation in graph.py
+    if result.get("status") == "FAIL":
+        return True
+    if juror == "editor":
+        return result.get("score", 10) < EDITOR_MIN_SCORE
+    if juror == "seo":
+        return result.get("score", 100) < SEO_MIN_SCORE
+    if juror == "engagement":
+        return result.get("score", 10) < ENGAGEMENT_MIN_SCORE
+    return False
+
+def _timestamp(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timestamp()
+    except (TypeError, ValueError):
+        return None
+
+class ResultAggregator:
+    """
+    Benchmark metrics over a stream of run results: add() each run (or
+    add_record() each log line), merge() shards, metrics() at the end.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.passed = 0
+        self.failed = 0
+        self.first_try = 0 # revisions == 0
+        self.hallucinations = 0
+        self.quality_sum = 0
+        self.quality_count = 0
+        self.durations = LogHistogram()
+        self.errors = TopK()
+        self.jurors = {} # juror -> {"runs", "failed", "skipped"}
+        self.modes = {} # jury mode -> {"runs", "passed", "attacks", "caught", "durations"}
+        self.stages = {} # stage -> {"seconds", "tps_sum", "tps_count"}
+        self.sessions = [] # (start, end, runs) per evaluate_batch session
+        self.span = [None, None] # earliest run start / latest run end, when there are no sessions
+
+    def add_record(self, record):
+        # One run-log line: plan lines carry no run, session lines carry wall time
+        if "plan" in record:
+            return
+        if "session" in record:
+            session = record["session"]
+            self.sessions.append((session["start"], session["end"], session["runs"]))
+            return
+        self.add(record)
+
+    def add(self, r):
+        self.runs += 1
+        status = r.get("status", "FAIL")
+        if status == "PASS":
+            self.passed += 1
+        elif status == "FAIL":
+            self.failed += 1
+        if r.get("revisions", 1) == 0:
+            self.first_try += 1
+        errors = r.get("errors") or []
+        if any("FACT" in e or "Hallucination" in e for e in errors):
+            self.hallucinations += 1
+        quality = r.get("quality_score", 0)
+        if quality is not None:
+            self.quality_sum += quality
+            self.quality_count += 1
+        duration = r.get("duration", 0)
+        self.durations.add(duration)
+        if status == "FAIL":
+            for e in errors:
+                self.errors.add(e)
+
+        for juror, result in (r.get("detailed_results") or {}).items():
+            counts = self.jurors.setdefault(juror, {"runs": 0, "failed": 0, "skipped": 0})
+            counts["runs"] += 1
+            if result.get("status") == "SKIPPED":
+                counts["skipped"] += 1
+            elif juror_failed(juror, result):
+                counts["failed"] += 1
+
+        mode = self.modes.setdefault(str(r.get("jury_mode")), {"runs": 0, "passed": 0, "attacks": 0, "caught": 0, "durations": LogHistogram()})
+        mode["runs"] += 1
+        mode["passed"] += status == "PASS"
+        mode["durations"].add(duration)
+        if "red_team_attack" in r:
+            mode["attacks"] += 1
+            mode["caught"] += bool(r.get("red_team_caught"))
+
+        for s in r.get("stage_metrics") or []:
+            stage = self.stages.setdefault(s["stage"], {"seconds": LogHistogram(), "tps_sum": 0.0, "tps_count": 0})
+            stage["seconds"].add(s["seconds"])
+            if s.get("tokens_per_sec"):
+                stage["tps_sum"] += s["tokens_per_sec"]
+                stage["tps_count"] += 1
+
+        end = _timestamp(r.get("timestamp"))
+        if end is not None:
+            start = end - duration
+            self.span[0] = start if self.span[0] is None else min(self.span[0], start)
+            self.span[1] = end if self.span[1] is None else max(self.span[1], end)
+
+    def merge(self, other):
+        for key in ("runs", "passed", "failed", "first_try", "hallucinations", "quality_sum", "quality_count"):
+            setattr(self, key, getattr(self, key) + getattr(other, key))
+        self.durations.merge(other.durations)
+        self.errors.merge(other.errors)
+        for juror, counts in other.jurors.items():
+            mine = self.jurors.setdefault(juror, {"runs": 0, "failed": 0, "skipped": 0})
+            for key, n in counts.items():
+                mine[key] += n
+        for name, mode in other.modes.items():
+            mine = self.modes.setdefault(name, {"runs": 0, "passed": 0, "attacks": 0, "caught": 0, "durations": LogHistogram()})
+            for key in ("runs", "passed", "attacks", "caught"):
+                mine[key] += mode[key]
+            mine["durations"].merge(mode["durations"])
+        for name, stage in other.stages.items():
+            mine = self.stages.setdefault(name, {"seconds": LogHistogram(), "tps_sum": 0.0, "tps_count": 0})
+            mine["seconds"].merge(stage["seconds"])
+            mine["tps_sum"] += stage["tps_sum"]
+            mine["tps_count"] += stage["tps_count"]
+        self.sessions.extend(other.sessions)
+        for i, pick in ((0, min), (1, max)):
+            values = [v for v in (self.span[i], other.span[i]) if v is not None]
+            self.span[i] = pick(values) if values else None
+        return self
+
+    def wall_seconds(self):
+        """
+        (seconds, runs) for throughput: the union of the logged sessions
+        (shards running side by side overlap), else first start to last end.
+        """
+        if self.sessions:
+            wall, covered_to = 0.0, None
+            for start, end, _ in sorted(self.sessions):
+                if covered_to is None or start > covered_to:
+                    wall += end - start
+                    covered_to = end
+                elif end > covered_to:
+                    wall += end - covered_to
+                    covered_to = end
+            return wall, sum(s[2] for s in self.sessions)
+        if self.span[0] is None:
+            return 0.0, self.runs
+        return self.span[1] - self.span[0], self.runs
+
+    def metrics(self, top_k=5):
+        pct = lambda n: n / self.runs * 100 if self.runs else 0
+        wall, timed_runs = self.wall_seconds()
+        metrics = {
+            "total_runs": self.runs,
+            "total_duration_sec": wall,
+            "pass_rate_pct": pct(self.passed),
+            "safety_rate_pct": pct(self.first_try),
+            "hallucination_rate_pct": pct(self.hallucinations),
+            "avg_quality_score": self.quality_sum / self.quality_count if self.quality_count else 0,
+            "throughput_arts_per_min": timed_runs / (wall / 60) if wall > 0 else 0,
+            "failures": self.failed,
+            "duration": {
+                "avg": self.durations.mean(),
+                "p50": self.durations.percentile(50),
+                "p95": self.durations.percentile(95),
+                "p99": self.durations.percentile(99),
+                "max": self.durations.max,
+            },
+            "juror_failures": {juror: dict(counts) for juror, counts in sorted(self.jurors.items())},
+            "top_errors": self.errors.most_common(top_k),
+            "stages": {
+                name: {
+                    "count": stage["seconds"].count,
+                    "p50": stage["seconds"].percentile(50),
+                    "p95": stage["seconds"].percentile(95),
+                    "avg_tokens_per_sec": stage["tps_sum"] / stage["tps_count"] if stage["tps_count"] else None,
+                }
+                for name, stage in sorted(self.stages.items())
+            },
+            "jury_modes": None,
+        }
+        if len(self.modes) > 1:
+            # Same shape as evaluate_batch's --jury_mode compare table
+            metrics["jury_modes"] = {
+                name: {
+                    "runs": mode["runs"],
+                    "avg_duration_sec": mode["durations"].mean() or 0,
+                    "p95_duration_sec": mode["durations"].percentile(95) or 0,
+                    "pass_rate_pct": mode["passed"] / mode["runs"] * 100 if mode["runs"] else 0,
+                    "red_team_catch_rate_pct": mode["caught"] / mode["attacks"] * 100 if mode["attacks"] else None,
+                }
+                for name, mode in sorted(self.modes.items())
+            }
+        return metrics
+
+def aggregate_log(path):
+    """
+    (aggregator, plan) for one run log, in a single pass.
+    """
+    aggregator = ResultAggregator()
+    plan = None
+    for record in iter_log(path):
+        if "plan" in record:
+            plan = record["plan"]
+        aggregator.add_record(record)
+    return aggregator, plan
+
+def aggregate_logs(paths):
+    """
+    Aggregates each shard's log and merges them. Returns (aggregator, plans).
+    """
+    total = ResultAggregator()
+    plans = []
+    for path in paths:
+        print(f"Aggregating {path}...")
+        aggregator, plan = aggregate_log(path)
+        total.merge(aggregator)
+        if plan:
+            plans.append(plan)
+    return total, plans
+
+def iter_results(paths):
+    # Run records from every shard, one at a time (for the report's run table)
+    for path in paths:
+        for record in iter_log(path):
+            if "plan" not in record and "session" not in record:
+                yield record
+
+def merged_config(plans, paths):
+    # The shards' settings, with batch_size summed over the shards
+    config = dict(plans[0]["config"]) if plans else {"iterations": "-", "type": "-"}
+    config["batch_size"] = sum(len(p["game_ids"]) for p in plans) if plans else "-"
+    if len(paths) > 1:
+        config["shards"] = len(paths)
+    return config
+
+if __name__ == "__main__":
+    from utils.evaluate_batch import generate_report
+
+    parser = argparse.ArgumentParser(description="Aggregate benchmark run logs (one or more shards) into a summary and report")
+    parser.add_argument("logs", nargs="+", help="Run log(s) written by evaluate_batch (.jsonl)")
+    parser.add_argument("--output", type=str, default="benchmark_summary.json", help="Summary JSON path (report goes next to it)")
+    parser.add_argument("--top_k", type=int, default=5, help="Most frequent failure reasons to list")
+    args = parser.parse_args()
+
+    start = time.time()
+    aggregator, plans = aggregate_logs(args.logs)
+    summary = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": merged_config(plans, args.logs),
+        "metrics": aggregator.metrics(args.top_k),
+    }
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"{aggregator.runs} runs aggregated in {time.time() - start:.1f}s. Summary: {args.output}")
+    generate_report(summary, args.output, iter_results(args.logs))
@@ -0,0 +1,67 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Path Setup
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARTICLES_DB = os.path.join(BASE_DIR, 'articles.db')
+
+# Published articles: the approved (jury PASS) /draft result per game, tagged
+# with the pipeline fingerprint it was written under (graph.pipeline_fingerprint).
+# An article from another fingerprint is stale and gets rewritten on next request.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    game_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    article TEXT NOT NULL,         -- the /draft response
+    created REAL NOT NULL
+);
+"""
+
+_conn = None
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stale": 0, "saved": 0}
+
+def _db():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(ARTICLES_DB, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.executescript(SCHEMA)
+    return _conn
+
+def get_article(game_id, fingerprint):
+    """
+    The stored article for game_id if it was written under `fingerprint`, else None.
+    """
+    with _lock:
+        row = _db().execute("SELECT fingerprint, article, created FROM articles WHERE game_id = ?", (game_id,)).fetchone()
+        if row is None:
+            _stats["misses"] += 1
+            return None
+        if row[0] != fingerprint:
+            _stats["stale"] += 1
+            return None
+        _stats["hits"] += 1
+    return {**json.loads(row[1]), "published": row[2]}
+
+def save_article(game_id, fingerprint, article):
+    # Replaces whatever was stored for the game (older fingerprints included)
+    with _lock, _db():
+        _db().execute(
+            "INSERT OR REPLACE INTO articles (game_id, fingerprint, article, created) VALUES (?, ?, ?, ?)",
+            (game_id, fingerprint, json.dumps(article), time.time())
+        )
+        _stats["saved"] += 1
+
+def store_report(fingerprint=None):
+    # Hit/miss counters; with a fingerprint, also how many stored articles are current
+    with _lock:
+        report = dict(_stats)
+        if fingerprint is not None:
+            report["articles"], report["current"] = _db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(fingerprint = ?), 0) FROM articles", (fingerprint,)
+            ).fetchone()
+    return report
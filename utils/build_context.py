@@ -1,20 +1,23 @@
+import numpy as np
 import pandas as pd
 import os
 import json
+import sys
 import argparse
+from itertools import repeat
 from tqdm import tqdm
 
 # Path Setup
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, '..', 'data', 'archive')
 GAMES_PATH = os.path.join(DATA_DIR, 'games.csv')
-OUTPUT_DIR = os.path.join(BASE_DIR, 'context_cache')
 
-def build_context(limit=None):
-    if not os.path.exists(GAMES_PATH):
-        print(f"Error: {GAMES_PATH} not found.")
-        return
+# Add project root to path so utils.* resolves when run as a script
+sys.path.append(BASE_DIR)
+
+from utils.context_store import CONTEXT_DB, write_snapshots, read_checkpoint
 
+def load_games(limit=None):
     print(f"Loading {GAMES_PATH}...")
     df = pd.read_csv(GAMES_PATH)
     
@@ -22,26 +25,42 @@ def build_context(limit=None):
     print("Sorting games chronologically...")
     df['GAME_DATE_EST'] = pd.to_datetime(df['GAME_DATE_EST'])
     df = df.sort_values('GAME_DATE_EST')
-    
-    # Initialize State
-    # history_archive = { season: { team_id: { 'reg_w': 0, ... } } }
-    history_archive = {}
-    
-    # current_stats = { team_id: { 'reg_w': 0, 'reg_l': 0, 'post_w': 0, 'post_l': 0, 'streak': 0 } }
-    current_stats = {}
-    
-    # playoff_series = { (teamA, teamB): { teamA: wins, teamB: wins } }  (Keyed by sorted tuple of IDs)
-    playoff_series = {}
-    
-    current_season = None
-    
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        
+
     print(f"Processing context for {len(df)} games...")
     if limit:
         print(f"Running with LIMIT={limit}")
         df = df.head(limit)
+    return df
+
+def new_state():
+    """
+    Replay state carried from one game to the next (and between runs, via the checkpoint).
+    """
+    return {
+        # history_archive = { season: { team_id: { 'reg_w': 0, ... } } }
+        'history_archive': {},
+        # current_stats = { team_id: { 'reg_w': 0, 'reg_l': 0, 'post_w': 0, 'post_l': 0, 'streak': 0 } }
+        'current_stats': {},
+        # playoff_series = { (teamA, teamB): { teamA: wins, teamB: wins } }  (Keyed by sorted tuple of IDs)
+        'playoff_series': {},
+        'current_season': None,
+    }
+
+def replay_loop(df, state=None):
+    """
+    Reference engine: replays history row by row.
+    Starts from `state` if given (e.g. a loaded checkpoint) and leaves the
+    final state in it.
+    Returns (game_id, snapshot_json) rows in replay order.
+    """
+    if state is None:
+        state = new_state()
+    history_archive = state['history_archive']
+    current_stats = state['current_stats']
+    playoff_series = state['playoff_series']
+    current_season = state['current_season']
+    
+    snapshots = []
         
     for idx, row in tqdm(df.iterrows(), total=len(df)):
         game_id = str(row['GAME_ID'])
@@ -166,8 +185,7 @@ def build_context(limit=None):
             "narrative_notes": narrative
         }
         
-        with open(os.path.join(OUTPUT_DIR, f"{game_id}.json"), 'w') as f:
-            json.dump(snapshot, f)
+        snapshots.append((game_id, json.dumps(snapshot)))
             
         # --- 2. UPDATE STATS ---
         if pd.isna(row['PTS_home']) or pd.isna(row['PTS_away']): continue 
@@ -200,10 +218,356 @@ def build_context(limit=None):
             if current_stats[visitor_id]['streak'] > 0: current_stats[visitor_id]['streak'] += 1
             else: current_stats[visitor_id]['streak'] = 1
 
-    print(f"Context build complete. Saved {len(df)} snapshots to {OUTPUT_DIR}")
+    state.update(
+        history_archive=history_archive,
+        current_stats=current_stats,
+        playoff_series=playoff_series,
+        current_season=current_season,
+    )
+    return snapshots
+
+ROUND_MAP = {1: "First Round", 2: "Conf. Semis", 3: "Conf. Finals", 4: "NBA Finals"}
+
+# json.dumps(snapshot) layout, used by the vectorized engine
+SNAPSHOT_TEMPLATE = (
+    '{"game_id": "%s", "date": "%s", "season": %s, "is_playoff": %s, '
+    '"home_record": {"regular": "%s", "playoff": "%s", "streak": %s}, '
+    '"visitor_record": {"regular": "%s", "playoff": "%s", "streak": %s}, '
+    '"series_context": "%s", "stakes": "%s", "narrative_notes": [%s]}'
+)
+
+def as_text(values):
+    # str() of every value, formatted once per distinct value
+    uniques, inverse = np.unique(values, return_inverse=True)
+    return np.array([str(u) for u in uniques.tolist()], dtype=object)[inverse]
+
+def replay_vectorized(df, state=None):
+    """
+    Vectorized engine: same rows as replay_loop, computed with grouped
+    cumulative sums/shifts instead of per-row dict mutation, then serialized
+    column-wise. If `state` is given it receives the final replay state.
+
+    A "segment" is a run of consecutive rows with the same SEASON (the loop
+    resets current_stats/playoff_series whenever the season changes).
+    """
+    if state is not None and state['current_season'] is not None:
+        # Resuming from a checkpoint: the batch is small, replay it row by row
+        return replay_loop(df, state)
+
+    n = len(df)
+    if n == 0:
+        return []
+
+    game_id = df['GAME_ID'].astype(str).to_numpy(dtype=object)
+    home = df['HOME_TEAM_ID'].to_numpy()
+    visitor = df['VISITOR_TEAM_ID'].to_numpy()
+    season = df['SEASON'].to_numpy()
+    first_digit = np.array([g[:1] for g in game_id])
+    is_pre = first_digit == '1'
+    is_playoff = first_digit == '4'
+
+    # The vectorized series parser assumes well-formed 4YY00RSG playoff IDs;
+    # anything else goes through the reference loop (same output, slower).
+    if not all(len(g) == 8 and g.isdigit() for g in game_id[is_playoff]):
+        print("Warning: Unexpected playoff GAME_ID format, falling back to loop engine.")
+        return replay_loop(df, state)
+
+    seg = np.concatenate(([0], np.cumsum(season[1:] != season[:-1])))
+    scored = ~is_pre & df['PTS_home'].notna().to_numpy() & df['PTS_away'].notna().to_numpy()
+    home_win = (df['PTS_home'] > df['PTS_away']).to_numpy()
+
+    # --- 1. RECORDS & STREAKS ---
+    # Long format: home entry at 2*i, visitor at 2*i+1, so row order is replay order.
+    # Each (segment, team) is one group; a stable sort makes groups contiguous.
+    team_code, team_ids = pd.factorize(np.column_stack((home, visitor)).ravel())
+    group_key = np.repeat(seg, 2) * len(team_ids) + team_code
+    group, group_keys = pd.factorize(group_key)
+    order = np.argsort(group, kind='stable')
+    g_sorted = group[order]
+    pos = np.arange(2 * n)
+    group_start = np.maximum.accumulate(
+        np.where(np.concatenate(([True], g_sorted[1:] != g_sorted[:-1])), pos, 0)
+    )
+
+    def in_group_before(values):
+        # Sum of the same group's earlier rows (exclusive grouped cumsum)
+        v = values[order].astype(np.int64)
+        ex = np.cumsum(v) - v
+        out = np.empty(2 * n, dtype=np.int64)
+        out[order] = ex - ex[group_start]
+        return out
+
+    s_long = np.repeat(scored, 2)
+    p_long = np.repeat(is_playoff, 2)
+    won = np.empty(2 * n, dtype=bool)
+    won[0::2] = home_win
+    won[1::2] = ~home_win
+    inc = {
+        'reg_w': s_long & ~p_long & won,
+        'reg_l': s_long & ~p_long & ~won,
+        'post_w': s_long & p_long & won,
+        'post_l': s_long & p_long & ~won,
+    }
+    before = {stat: in_group_before(values) for stat, values in inc.items()}
+
+    # Streak: signed run length over the games that updated stats
+    upd = s_long[order]
+    o = np.where(won[order][upd], 1, -1)
+    g_upd = g_sorted[upd]
+    k = np.arange(len(o))
+    new_run = np.concatenate(([True], (g_upd[1:] != g_upd[:-1]) | (o[1:] != o[:-1])))
+    run_start = np.maximum.accumulate(np.where(new_run, k, 0))
+    streak_after = np.zeros(2 * n, dtype=np.int64)
+    streak_after[upd] = o * (k - run_start + 1)
+    # Last updating row strictly before, within the same group
+    last_upd = np.maximum.accumulate(np.where(upd, pos, -1))
+    last_before = np.concatenate(([-1], last_upd[:-1]))
+    streak_sorted = np.where(last_before >= group_start, streak_after[last_before], 0)
+    streak_before = np.empty(2 * n, dtype=np.int64)
+    streak_before[order] = streak_sorted
+
+    # --- 2. HISTORY ARCHIVE (final record per segment/team) ---
+    group_end = np.flatnonzero(np.concatenate((g_sorted[1:] != g_sorted[:-1], [True])))
+    final = {
+        stat: (before[stat] + values)[order][group_end].tolist()
+        for stat, values in inc.items()
+    }
+    archive = np.array(
+        [f"{rw}-{rl} (Reg), {pw}-{pl} (Post)"
+         for rw, rl, pw, pl in zip(final['reg_w'], final['reg_l'], final['post_w'], final['post_l'])]
+        + ["N/A"],
+        dtype=object
+    )
+
+    # Latest completed segment of the previous season, per segment
+    seg_starts = np.flatnonzero(np.diff(seg, prepend=-1))
+    prev_seg = []
+    last_seg_of = {}
+    for j, s in enumerate(season[seg_starts].tolist()):
+        prev_seg.append(last_seg_of.get(s - 1, -1))
+        last_seg_of[s] = j
+    prev_seg = np.array(prev_seg)[seg]
+    has_hist = prev_seg >= 0
+
+    # Archive entry for (previous segment, team); -1 -> "N/A"
+    lookup = pd.Index(group_keys)
+    h_hist = archive[lookup.get_indexer(prev_seg * len(team_ids) + team_code[0::2])]
+    v_hist = archive[lookup.get_indexer(prev_seg * len(team_ids) + team_code[1::2])]
+
+    # --- 3. PLAYOFF SERIES ---
+    series_state = {}
+    series_context = np.full(n, "", dtype=object)
+    stakes = np.full(n, "", dtype=object)
+    po = np.flatnonzero(is_playoff)
+    if len(po):
+        po_ids = game_id[po]
+        game_num = np.array([int(g[-2:]) for g in po_ids])
+        team_a = np.minimum(home[po], visitor[po])
+        team_b = np.maximum(home[po], visitor[po])
+        pair = [seg[po], team_a, team_b]
+        # A series restarts at Game 1 (or the pair's first meeting in the segment)
+        instance = pd.Series(game_num == 1).groupby(pair).cumsum().to_numpy()
+        winner = np.where(home_win[po], home[po], visitor[po])
+        a_inc = pd.Series((scored[po] & (winner == team_a)).astype(np.int64))
+        b_inc = pd.Series((scored[po] & (winner == team_b)).astype(np.int64))
+        series_keys = pair + [instance]
+        a_before = (a_inc.groupby(series_keys).cumsum() - a_inc).to_numpy()
+        b_before = (b_inc.groupby(series_keys).cumsum() - b_inc).to_numpy()
+        home_is_a = home[po] == team_a
+        series_home = np.where(home_is_a, a_before, b_before).tolist()
+        series_visitor = np.where(home_is_a, b_before, a_before).tolist()
+
+        # Wins after each game; the pair's last game holds its current series
+        last_seg = seg[po] == seg[-1]
+        for a, b, a_wins, b_wins in zip(
+            team_a[last_seg].tolist(), team_b[last_seg].tolist(),
+            (a_before + a_inc.to_numpy())[last_seg].tolist(),
+            (b_before + b_inc.to_numpy())[last_seg].tolist()
+        ):
+            series_state[(a, b)] = {a: a_wins, b: b_wins}
+
+        for i, gid, g_num, h_sw, v_sw in zip(po.tolist(), po_ids, game_num.tolist(), series_home, series_visitor):
+            round_val = int(gid[5])
+            round_name = ROUND_MAP.get(round_val, f"Round {round_val}")
+
+            if h_sw == v_sw: series_status = f"Series Tied {h_sw}-{v_sw}"
+            elif h_sw > v_sw: series_status = f"Home Leads {h_sw}-{v_sw}"
+            else: series_status = f"Visitor Leads {v_sw}-{h_sw}"
+            series_context[i] = f"{round_name} Game {g_num}: {series_status}"
+
+            potential_winner = None
+            if h_sw == 3: potential_winner = "Home"
+            if v_sw == 3: potential_winner = "Visitor"
+            if potential_winner:
+                if round_val == 4:
+                    stakes[i] = f"CHAMPIONSHIP CLINCHING OPPORTUNITY for {potential_winner} Team."
+                else:
+                    stakes[i] = f"ELIMINATION GAME. {potential_winner} can advance."
+
+    # --- 4. FINAL STATE (what replay_loop leaves behind) ---
+    if state is not None:
+        end_key = group_keys[g_sorted[group_end]] # seg * len(team_ids) + team_code
+        last_upd_end = last_upd[group_end]
+        end_streak = np.where(last_upd_end >= group_start[group_end], streak_after[last_upd_end], 0)
+        tables = {}
+        for sg, tid, rw, rl, pw, pl, st in zip(
+            (end_key // len(team_ids)).tolist(), team_ids[end_key % len(team_ids)].tolist(),
+            final['reg_w'], final['reg_l'], final['post_w'], final['post_l'], end_streak.tolist()
+        ):
+            tables.setdefault(sg, {})[tid] = {'reg_w': rw, 'reg_l': rl, 'post_w': pw, 'post_l': pl, 'streak': st}
+
+        seg_season = season[seg_starts].tolist()
+        last = len(seg_starts) - 1
+        history_archive = {}
+        for sg in range(last):
+            history_archive[seg_season[sg]] = tables[sg]
+        state.update(
+            history_archive=history_archive,
+            current_stats=tables[last],
+            playoff_series=series_state,
+            current_season=seg_season[last],
+        )
+
+    # --- 5. SERIALIZE (preseason rows produce no snapshot) ---
+    # Rendered straight to json.dumps' default layout. Every interpolated value
+    # is an int or fixed ASCII text, so nothing needs escaping.
+    keep = ~is_pre
+    if not keep.any():
+        return []
+
+    def record_text(w, l):
+        # "W-L" strings via a lookup table instead of per-row formatting
+        w, l = w[keep], l[keep]
+        width = int(l.max()) + 1
+        table = np.array([f"{a}-{b}" for a in range(int(w.max()) + 1) for b in range(width)], dtype=object)
+        return table[w * width + l]
+
+    h_reg = record_text(before['reg_w'][0::2], before['reg_l'][0::2])
+    v_reg = record_text(before['reg_w'][1::2], before['reg_l'][1::2])
+    h_post = record_text(before['post_w'][0::2], before['post_l'][0::2])
+    v_post = record_text(before['post_w'][1::2], before['post_l'][1::2])
+    series_context, stakes = series_context[keep], stakes[keep]
+
+    notes = [
+        (f'"Last Season ({ps}): Home {hh} | Visitor {vh}", ' if has else "")
+        + ((f'"{ctx}"' + (f', "*** STAKES: {note} ***"' if note else "")) if po
+           else f'"Regular Season: Home ({hr}) vs Visitor ({vr})"')
+        for has, ps, hh, vh, po, ctx, note, hr, vr in zip(
+            has_hist[keep].tolist(), as_text(season[keep] - 1).tolist(),
+            h_hist[keep].tolist(), v_hist[keep].tolist(), is_playoff[keep].tolist(),
+            series_context.tolist(), stakes.tolist(), h_reg.tolist(), v_reg.tolist()
+        )
+    ]
+
+    fields = [
+        game_id[keep],
+        df['GAME_DATE_EST'].dt.strftime('%Y-%m-%d').to_numpy(dtype=object)[keep],
+        as_text(season[keep]),
+        np.where(is_playoff[keep], "true", "false"),
+        h_reg, h_post, as_text(streak_before[0::2][keep]),
+        v_reg, v_post, as_text(streak_before[1::2][keep]),
+        series_context, stakes, notes
+    ]
+    # Interleave the template's fixed fragments with the field columns
+    fragments = SNAPSHOT_TEMPLATE.split('%s')
+    columns = [repeat(fragments[0])]
+    for field, fragment in zip(fields, fragments[1:]):
+        columns += [list(field), repeat(fragment)]
+    return [(row[1], ''.join(row)) for row in zip(*columns)]
+
+def dump_checkpoint(state, last_date, last_game_ids):
+    """
+    Serializes the replay state plus the position reached in games.csv:
+    the last processed date and the GAME_IDs already seen on that date.
+    """
+    def teams(table):
+        return {str(int(tid)): {k: int(v) for k, v in stats.items()} for tid, stats in table.items()}
+
+    return json.dumps({
+        "last_date": last_date,
+        "last_game_ids": sorted(last_game_ids),
+        "current_season": None if state['current_season'] is None else int(state['current_season']),
+        "current_stats": teams(state['current_stats']),
+        "playoff_series": [
+            [int(a), int(b), int(wins[a]), int(wins[b])] for (a, b), wins in state['playoff_series'].items()
+        ],
+        "history_archive": {str(int(season)): teams(table) for season, table in state['history_archive'].items()},
+    })
+
+def load_checkpoint(text):
+    """
+    Inverse of dump_checkpoint. Returns (state, last_date, last_game_ids).
+    """
+    data = json.loads(text)
+
+    def teams(table):
+        return {int(tid): stats for tid, stats in table.items()}
+
+    state = {
+        'history_archive': {int(season): teams(table) for season, table in data['history_archive'].items()},
+        'current_stats': teams(data['current_stats']),
+        'playoff_series': {(a, b): {a: a_wins, b: b_wins} for a, b, a_wins, b_wins in data['playoff_series']},
+        'current_season': data['current_season'],
+    }
+    return state, data['last_date'], set(data['last_game_ids'])
+
+def games_since(df, last_date, last_game_ids):
+    """
+    Rows not covered by the checkpoint: anything after the last processed
+    date, plus games on that date that had not arrived yet.
+    Assumes new games are appended in date order; back-filled older games
+    need a full rebuild.
+    """
+    last = pd.Timestamp(last_date)
+    dates = df['GAME_DATE_EST']
+    same_day_new = (dates == last) & ~df['GAME_ID'].astype(str).isin(last_game_ids)
+    return df[(dates > last) | same_day_new]
+
+def build_context(limit=None, engine='vectorized', since_checkpoint=False):
+    if not os.path.exists(GAMES_PATH):
+        print(f"Error: {GAMES_PATH} not found.")
+        return
+
+    checkpoint = read_checkpoint(CONTEXT_DB) if since_checkpoint else None
+    if since_checkpoint and checkpoint is None:
+        print(f"No checkpoint found in {CONTEXT_DB}, running a full build.")
+
+    df = load_games(limit)
+    if checkpoint is not None:
+        state, prev_date, prev_ids = load_checkpoint(checkpoint)
+        df = games_since(df, prev_date, prev_ids)
+        if df.empty:
+            print(f"No new games since {prev_date}. Context is up to date.")
+            return
+        print(f"Replaying {len(df)} new games since {prev_date}...")
+    else:
+        state, prev_date, prev_ids = new_state(), None, set()
+
+    if engine == 'loop':
+        snapshots = replay_loop(df, state)
+    else:
+        snapshots = replay_vectorized(df, state)
+
+    # Checkpoint: where this run stopped, so the next one can pick up from there
+    last_day = df['GAME_DATE_EST'].iloc[-1]
+    last_date = str(last_day.date())
+    last_game_ids = set(df.loc[df['GAME_DATE_EST'] == last_day, 'GAME_ID'].astype(str))
+    if last_date == prev_date:
+        last_game_ids |= prev_ids
+
+    # Snapshots and checkpoint are written to the context store in one transaction.
+    # A full build replaces the store; an incremental one appends to it.
+    written = write_snapshots(
+        snapshots, CONTEXT_DB,
+        replace=checkpoint is None,
+        checkpoint=dump_checkpoint(state, last_date, last_game_ids)
+    )
+    print(f"Context build complete. Saved {written} snapshots to {CONTEXT_DB}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=None, help="Limit number of games to process")
+    parser.add_argument("--engine", type=str, default="vectorized", choices=["vectorized", "loop"], help="Replay engine (loop is the row-by-row reference)")
+    parser.add_argument("--since-checkpoint", action="store_true", help="Only replay games added since the last build and append their snapshots")
     args = parser.parse_args()
-    build_context(args.limit)
+    build_context(args.limit, args.engine, args.since_checkpoint)
@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+import threading
+
+# Path Setup
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTEXT_DB = os.path.join(BASE_DIR, 'context_cache.db')
+LEGACY_DIR = os.path.join(BASE_DIR, 'context_cache') # One JSON file per game (pre-SQLite builds)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    game_id TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    state TEXT NOT NULL
+);
+"""
+
+def connect(path=CONTEXT_DB):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def write_snapshots(rows, path=CONTEXT_DB, replace=False, checkpoint=None):
+    """
+    Bulk-writes (game_id, snapshot_json) rows in a single transaction.
+    replace=True builds a fresh database next to the old one and swaps it in
+    atomically, so readers never see a half-built cache.
+    checkpoint (JSON text) is saved in the same transaction, so the replay
+    state always matches the snapshots on disk.
+    Returns the number of snapshots written.
+    """
+    target = path + '.tmp' if replace else path
+    if replace and os.path.exists(target):
+        os.remove(target)
+
+    conn = connect(target)
+    if replace:
+        # Throwaway file until the swap below, so skip journaling/fsync
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+
+    rows = list(rows)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO snapshots (game_id, snapshot) VALUES (?, ?)", rows)
+        if checkpoint is not None:
+            conn.execute("INSERT OR REPLACE INTO checkpoint (id, state) VALUES (1, ?)", (checkpoint,))
+    conn.close()
+
+    if replace:
+        os.replace(target, path)
+    return len(rows)
+
+def read_checkpoint(path=CONTEXT_DB):
+    """
+    Returns the replay checkpoint JSON text saved by the last build, or None.
+    """
+    if not os.path.exists(path):
+        return None
+    conn = connect(path)
+    row = conn.execute("SELECT state FROM checkpoint WHERE id = 1").fetchone()
+    conn.close()
+    return row[0] if row else None
+
+_local = threading.local()
+
+def _reader(path=CONTEXT_DB):
+    # sqlite3 connections are per-thread; FastAPI sync handlers run in a pool
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        _local.conn = conn
+    return conn
+
+def get_snapshot(game_id):
+    """
+    Returns the context snapshot dict for a game, or None.
+    Single keyed lookup; falls back to the legacy per-game JSON files.
+    """
+    if os.path.exists(CONTEXT_DB):
+        row = _reader().execute(
+            "SELECT snapshot FROM snapshots WHERE game_id = ?", (str(game_id),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    legacy_path = os.path.join(LEGACY_DIR, f"{game_id}.json")
+    if os.path.exists(legacy_path):
+        with open(legacy_path, 'r') as f:
+            return json.load(f)
+    return None
+
+def get_snapshots(game_ids, chunk=500):
+    """
+    {game_id: snapshot dict} for every game that has one, via IN queries
+    (`chunk` ids each) instead of one lookup per game.
+    """
+    game_ids = [str(g) for g in game_ids]
+    if not os.path.exists(CONTEXT_DB):
+        snapshots = {gid: get_snapshot(gid) for gid in game_ids}
+        return {gid: snap for gid, snap in snapshots.items() if snap is not None}
+
+    snapshots = {}
+    conn = _reader()
+    for i in range(0, len(game_ids), chunk):
+        ids = game_ids[i:i + chunk]
+        rows = conn.execute(
+            f"SELECT game_id, snapshot FROM snapshots WHERE game_id IN ({','.join('?' * len(ids))})", ids
+        ).fetchall()
+        snapshots.update((gid, json.loads(snapshot)) for gid, snapshot in rows)
+    return snapshots
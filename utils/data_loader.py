@@ -1,134 +1,182 @@
-import json
 import pandas as pd
 import os
+import sys
+import time
+
+# Add project root to path so `python utils/data_loader.py` resolves utils.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.game_index import get_game_index
+from utils.game_catalog import get_game_catalog
+from utils.context_store import get_snapshot, get_snapshots
+from utils.metrics import record_stage
 
 # Define path to the dataset relative to this file
 # database is in ../../data/archive/games_details.csv
 DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'archive', 'games_details.csv')
-CONTEXT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'context_cache')
 
-def get_game_stats(game_id: str) -> str:
+def get_game_stats(game_id: str, stage_metrics: list = None) -> str:
     """
-    Reads the games_details.csv, filters for the given game_id,
-    selects top 3 scorers from both teams, and returns a formatted string.
+    Looks up the given game_id in the resident game index, selects top 3
+    scorers from both teams, and returns a formatted string.
     Augments with Context (Series/Season Record) if available.
+    Pass a list as stage_metrics to get context_load/stats_load timings appended.
     """
-    if not os.path.exists(DATA_PATH):
+    index = get_game_index()
+    if index is None:
         return f"Error: Dataset not found at {DATA_PATH}"
 
     # 1. Load Deep Context (RAG)
-    context_str = ""
-    ctx_path = os.path.join(CONTEXT_DIR, f"{game_id}.json")
-    if os.path.exists(ctx_path):
-        try:
-            with open(ctx_path, 'r') as f:
-                ctx = json.load(f)
-            
-            # Parse Records (Handle Dict vs Legacy String)
-            h_rec = ctx.get('home_record', {})
-            v_rec = ctx.get('visitor_record', {})
-            
-            if isinstance(h_rec, dict):
-                h_fmt = f"{h_rec.get('regular','?')} (Reg), {h_rec.get('playoff','?') if ctx.get('is_playoff') else 'N/A'} (Post)"
-                v_fmt = f"{v_rec.get('regular','?')} (Reg), {v_rec.get('playoff','?') if ctx.get('is_playoff') else 'N/A'} (Post)"
-                h_streak = h_rec.get('streak', 'N/A')
-                v_streak = v_rec.get('streak', 'N/A')
-            else:
-                h_fmt = str(h_rec)
-                v_fmt = str(v_rec)
-                h_streak = ctx.get('home_streak', 'N/A')
-                v_streak = ctx.get('visitor_streak', 'N/A')
-            
-            # Format Advanced Context
-            lines = [f"SEASON CONTEXT ({ctx.get('season','?')}):"]
-            if ctx.get('series_context'): lines.append(ctx['series_context'])
-            if ctx.get('stakes'): lines.append(f"*** {ctx['stakes']} ***")
-            
-            lines.append(f"Home Record: {h_fmt} (Streak: {h_streak})")
-            lines.append(f"Visitor Record: {v_fmt} (Streak: {v_streak})")
-            lines.append(f"Narrative Notes: {'; '.join(ctx.get('narrative_notes', []))}")
-            
-            context_str = "\n".join(lines) + "\n"
-        except Exception as e:
-            print(f"Error loading context: {e}")
-
+    start = time.time()
     try:
-        df = pd.read_csv(DATA_PATH, low_memory=False)
+        ctx = get_snapshot(game_id)
     except Exception as e:
-        return f"Error loading CSV: {str(e)}"
-
-    # Filter by Game ID
-    # Ensure game_id is handled as correct type (int vs str in CSV)
-    # The CSV usually has GAME_ID as int or string. Let's force string comparison or conversion.
-    df['GAME_ID'] = df['GAME_ID'].astype(str)
-    game_df = df[df['GAME_ID'] == str(game_id)]
-
-    if game_df.empty:
-        return f"No records found for Game ID: {game_id}"
-
-    # We need to identify the two teams.
-    unique_teams = game_df['TEAM_ABBREVIATION'].unique()
-    # Remove NaNs if any
-    unique_teams = [t for t in unique_teams if isinstance(t, str)]
-    
-    if len(unique_teams) < 2:
-        return f"Error: Could not identify two teams for Game ID {game_id}. Found: {unique_teams}"
+        ctx = None
+        print(f"Error loading context: {e}")
+    context_str = format_context(ctx)
+    context_seconds = time.time() - start
+
+    # 2. Box Score (resident game index, no CSV parsing per request)
+    start = time.time()
+    stats_text = game_stats_text(game_id, index.team_parts(game_id), context_str)
+    if stats_text.startswith(("Error", "No records")):
+        return stats_text
 
-    # Container for the summary
-    summary_parts = []
+    if stage_metrics is not None:
+        stage_metrics.append(record_stage("context_load", context_seconds))
+        stage_metrics.append(record_stage("stats_load", time.time() - start))
+    return stats_text
 
-    for team in unique_teams[:2]: # Take first two teams found
-        team_df = game_df[game_df['TEAM_ABBREVIATION'] == team].copy()
+def get_game_stats_many(game_ids, stage_metrics: dict = None) -> dict:
+    """
+    get_game_stats for a whole batch: {game_id: stats text}, errors included.
+    Contexts come from one IN query, box scores from the resident index.
+    Pass a dict as stage_metrics to get each game's context_load/stats_load
+    records (its share of the batch's time) under its game_id.
+    """
+    game_ids = list(dict.fromkeys(str(g) for g in game_ids))
+    index = get_game_index()
+    if index is None:
+        return {gid: f"Error: Dataset not found at {DATA_PATH}" for gid in game_ids}
+    if not game_ids:
+        return {}
+
+    # 1. Every game's context in one go
+    start = time.time()
+    try:
+        snapshots = get_snapshots(game_ids)
+    except Exception as e:
+        snapshots = {}
+        print(f"Error loading context: {e}")
+    contexts = {gid: format_context(snapshots.get(gid)) for gid in game_ids}
+    context_seconds = (time.time() - start) / len(game_ids)
+
+    # 2. Box scores, gathered for the whole batch at once
+    start = time.time()
+    parts = index.team_parts_many(game_ids)
+    stats = {gid: game_stats_text(gid, parts[gid], contexts[gid]) for gid in game_ids}
+    stats_seconds = (time.time() - start) / len(game_ids)
+
+    if stage_metrics is not None:
+        for gid, text in stats.items():
+            if not text.startswith(("Error", "No records")):
+                stage_metrics[gid] = [record_stage("context_load", context_seconds), record_stage("stats_load", stats_seconds)]
+    return stats
+
+def format_context(ctx) -> str:
+    """
+    The SEASON CONTEXT block for a context snapshot ("" for None or a bad snapshot).
+    """
+    if ctx is None:
+        return ""
+    try:
+        # Parse Records (Handle Dict vs Legacy String)
+        h_rec = ctx.get('home_record', {})
+        v_rec = ctx.get('visitor_record', {})
         
-        # Fill NaNs for stats
-        team_df['PTS'] = team_df['PTS'].fillna(0)
-        team_df['REB'] = team_df['REB'].fillna(0)
-        team_df['AST'] = team_df['AST'].fillna(0)
-
-        # Calculate Total Score
-        total_score = int(team_df['PTS'].sum())
-
-        # Sort by Points for player highlights
-        top_players = team_df.sort_values(by='PTS', ascending=False).head(3)
-
-        team_summary = f"{team} ({total_score} pts):"
-        player_summaries = []
-        for _, row in top_players.iterrows():
-            p_name = row.get('PLAYER_NAME', 'Unknown')
-            pts = int(row.get('PTS', 0))
-            reb = int(row.get('REB', 0))
-            ast = int(row.get('AST', 0))
-            player_summaries.append(f"{p_name} ({pts} pts, {reb} reb, {ast} ast)")
+        if isinstance(h_rec, dict):
+            h_fmt = f"{h_rec.get('regular','?')} (Reg), {h_rec.get('playoff','?') if ctx.get('is_playoff') else 'N/A'} (Post)"
+            v_fmt = f"{v_rec.get('regular','?')} (Reg), {v_rec.get('playoff','?') if ctx.get('is_playoff') else 'N/A'} (Post)"
+            h_streak = h_rec.get('streak', 'N/A')
+            v_streak = v_rec.get('streak', 'N/A')
+        else:
+            h_fmt = str(h_rec)
+            v_fmt = str(v_rec)
+            h_streak = ctx.get('home_streak', 'N/A')
+            v_streak = ctx.get('visitor_streak', 'N/A')
         
-        team_summary += " " + ", ".join(player_summaries)
-        summary_parts.append({"team": team, "score": total_score, "text": team_summary})
+        # Format Advanced Context
+        lines = [f"SEASON CONTEXT ({ctx.get('season','?')}):"]
+        if ctx.get('series_context'): lines.append(ctx['series_context'])
+        if ctx.get('stakes'): lines.append(f"*** {ctx['stakes']} ***")
+        
+        lines.append(f"Home Record: {h_fmt} (Streak: {h_streak})")
+        lines.append(f"Visitor Record: {v_fmt} (Streak: {v_streak})")
+        lines.append(f"Narrative Notes: {'; '.join(ctx.get('narrative_notes', []))}")
+        
+        return "\n".join(lines) + "\n"
+    except Exception as e:
+        print(f"Error loading context: {e}")
+        return ""
 
-    # Sort parts by score to implicitly show winner or just join them
-    # Better: Explicitly state the final result string
-    stats_text = "FINAL SCORE: "
-    if len(summary_parts) == 2:
-        t1 = summary_parts[0]
-        t2 = summary_parts[1]
-        if t1['score'] > t2['score']:
-            stats_text += f"{t1['team']} ({t1['score']}) def. {t2['team']} ({t2['score']})"
-        else:
-            stats_text += f"{t2['team']} ({t2['score']}) def. {t1['team']} ({t1['score']})"
-    
-    stats_text += "\n\nDETAILS: " + " | ".join([p['text'] for p in summary_parts])
+def game_stats_text(game_id, parts, context_str) -> str:
+    # Box score (GameIndex.team_parts output) plus the context block, or an error string
+    if parts is None:
+        return f"No records found for Game ID: {game_id}"
 
+    stats_text = format_box_score(game_id, parts)
+    if stats_text.startswith("Error"):
+        return stats_text
 
-    
     # Combined Output
     if context_str:
         return f"{context_str}\nGAME STATS:\n{stats_text}"
     else:
         return stats_text
 
-def get_random_game_ids(n: int = 5, game_type: str = 'all') -> list[str]:
+def format_box_score(game_id, parts) -> str:
+    """
+    Builds the FINAL SCORE / DETAILS text from GameIndex.team_parts output:
+    [(team, total_pts, [(player, pts, reb, ast), ...top 3]), ...].
+    """
+    if len(parts) < 2:
+        return f"Error: Could not identify two teams for Game ID {game_id}. Found: {[p[0] for p in parts]}"
+
+    # Container for the summary
+    summary_parts = []
+
+    for team, total_score, top_players in parts[:2]: # Take first two teams found
+        player_summaries = [
+            f"{p_name} ({pts} pts, {reb} reb, {ast} ast)"
+            for p_name, pts, reb, ast in top_players
+        ]
+        team_summary = f"{team} ({total_score} pts): " + ", ".join(player_summaries)
+        summary_parts.append({"team": team, "score": total_score, "text": team_summary})
+
+    # Explicitly state the final result string
+    stats_text = "FINAL SCORE: "
+    t1 = summary_parts[0]
+    t2 = summary_parts[1]
+    if t1['score'] > t2['score']:
+        stats_text += f"{t1['team']} ({t1['score']}) def. {t2['team']} ({t2['score']})"
+    else:
+        stats_text += f"{t2['team']} ({t2['score']}) def. {t1['team']} ({t1['score']})"
+
+    stats_text += "\n\nDETAILS: " + " | ".join([p['text'] for p in summary_parts])
+    return stats_text
+
+def get_random_game_ids(n: int = 5, game_type: str = 'all', seed=None, by=(), weights=None) -> list[str]:
     """
     Returns a list of random Game IDs.
     game_type: 'all', 'regular' (starts with 2), 'playoff' (starts with 4)
+    seed/by/weights: reproducible, stratified or weighted draws (see GameCatalog.sample)
     """
+    # Precomputed catalog (utils/game_catalog.py): no CSV read per call
+    catalog = get_game_catalog()
+    if catalog is not None:
+        return catalog.sample(n, seed, by=by, weights=weights, game_type=game_type)
+
+    # No games.csv: sample the box score file directly
     if not os.path.exists(DATA_PATH):
         return []
         
@@ -4,24 +4,27 @@ import json
 import os
 import time
 import sys
-from collections import Counter
 from typing import List
 
 # Add project root to path so we can import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.data_loader import get_random_game_ids, get_game_stats
+from utils.data_loader import get_random_game_ids, get_game_stats_many
 from graph import app as graph_app
-from agents.analyst import get_context_analyst
+from agents.analyst import get_context_analyst, get_recall_checker
+from agents.llm import chain_stats
 from utils.red_team import poison_data, generate_attack_draft
+from utils.fact_screen import screen_report
+from utils.llm_cache import enable_cache, cache_report
+from utils.scheduler import run_waves, ModelLoadTracker, schedule_savings
+from utils.result_log import ResultLog, read_log, run_key
+from utils.aggregate import aggregate_log, iter_results
+from utils.game_catalog import parse_weights
+from utils.thresholds import EDITOR_MIN_SCORE, SEO_MIN_SCORE, ENGAGEMENT_MIN_SCORE
 
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field
-
-class RecallResult(BaseModel):
-    hits: List[bool] = Field(description="List of booleans indicating if each fact was found.")
+RED_TEAM_ATTACKS = ['brand_safety', 'bias', 'fact_checker', 'editor', 'seo', 'engagement']
+# Settings --resume takes from the log's plan instead of the command line
+RESUME_ARGS = ("batch_size", "iterations", "type", "red_team", "recall", "schedule", "jury_mode")
 
 def check_recall_llm(draft: str, beats: List[str]):
     """
@@ -29,15 +32,7 @@ def check_recall_llm(draft: str, beats: List[str]):
     """
     if not beats: return 0.0
     
-    llm = ChatOllama(model="mistral", temperature=0)
-    parser = JsonOutputParser(pydantic_object=RecallResult)
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a Fact Checker. Check if the following FACTS are mentioned in the ARTICLE. Return strictly JSON with a key 'hits' containing a list of booleans (true/false) corresponding to each fact in order."),
-        ("user", "Facts: {beats}\n\nArticle: {draft}\n\nOutput (JSON):")
-    ])
-    
-    chain = prompt | llm | parser
+    chain = get_recall_checker()
     try:
         res = chain.invoke({"beats": beats, "draft": draft})
         hits = res.get("hits", [])
@@ -47,10 +42,16 @@ def check_recall_llm(draft: str, beats: List[str]):
     except:
         return 0.0
 
-def generate_report(summary, filename):
+def generate_report(summary, filename, results=None):
+    """
+    Writes the markdown report section by section. Metrics come from
+    ResultAggregator (utils/aggregate.py); `results` (default: summary["results"])
+    may be any iterable, e.g. a run log read line by line, for the run table.
+    """
     metrics = summary["metrics"]
-    results = summary["results"]
     config = summary["config"]
+    if results is None:
+        results = summary.get("results", [])
     
     # Calculate Grade
     pass_rate = metrics["pass_rate_pct"]
@@ -61,17 +62,27 @@ def generate_report(summary, filename):
     else: grade = "F"
     
     # Failure Analysis
-    failures = [r for r in results if r["status"] == "FAIL"]
-    error_msgs = []
-    for f in failures:
-        error_msgs.extend(f.get("errors", []))
-    
-    top_issues = Counter(error_msgs).most_common(5)
+    failures = metrics.get("failures", 0)
+    top_issues = metrics.get("top_errors", [])
     
-    # Markdown Content
-    md = f"""# 📊 SportsEdit-AI Evaluation Report
+    cache = metrics.get("llm_cache")
+    loads = metrics.get("model_loads")
+    load_line = f"*   **Model Loads**: {loads['model_loads']} ({loads['model_load_seconds']:.1f}s loading)\n" if loads else ""
+    schedule = metrics.get("schedule")
+    if schedule:
+        load_line += f"*   **Wave Schedule**: {schedule['model_switches']} model switches vs {schedule['model_switches_sequential']} one-at-a-time (~{schedule['est_load_seconds_saved']:.1f}s saved)\n"
+    cache_line = f"*   **LLM Cache**: {cache['hits']} hits / {cache['misses']} misses ({cache['hit_rate_pct']:.1f}% hit rate)\n" if cache else ""
+    durations = metrics.get("duration")
+    duration_line = ""
+    if durations and durations.get("p50") is not None:
+        duration_line = f"*   **Run Duration**: p50 {durations['p50']:.1f}s | p95 {durations['p95']:.1f}s | p99 {durations['p99']:.1f}s | max {durations['max']:.1f}s\n"
+
+    report_path = filename.replace(".json", "_report.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        # Markdown Content
+        f.write(f"""# 📊 SportsEdit-AI Evaluation Report
 **Date**: {summary["timestamp"]}
-**Configuration**: {config["batch_size"]} Games | {config["iterations"]} Iterations | Type: {config["type"]}
+**Configuration**: {config["batch_size"]} Games | {config["iterations"]} Iterations | Type: {config["type"]}{f" | {config['shards']} Shards" if config.get("shards") else ""}
 
 ## 1. Executive Summary
 **Overall Grade**: {grade} ({pass_rate:.1f}%)
@@ -81,7 +92,8 @@ def generate_report(summary, filename):
 *   **Hallucination Rate**: {metrics.get("hallucination_rate_pct", 0):.1f}% (Fact Check Failures)
 *   **Safety Score**: {metrics["safety_rate_pct"]:.1f}% (Zero-shot pass rate)
 *   **Reliability**: {metrics["pass_rate_pct"]:.1f}% (Final pass rate after revisions)
-
+*   **Fact Screen**: {metrics.get("fact_screen", {}).get("drafts_rejected", 0)}/{metrics.get("fact_screen", {}).get("drafts_screened", 0)} drafts rejected before the jury ({metrics.get("fact_screen", {}).get("hit_rate_pct", 0):.1f}%), {metrics.get("fact_screen", {}).get("llm_calls_saved", 0)} jury calls saved
+{duration_line}{cache_line}{load_line}
 The system processed **{metrics["total_runs"]}** articles with a throughput of **{metrics["throughput_arts_per_min"]:.1f} arts/min**.
 
 ### Projected ROI (Annual)
@@ -89,65 +101,181 @@ Based on current throughput vs. manual drafting ($15/article):
 *   **Est. Cost Savings**: ${(metrics["total_runs"] * 14.95):,.2f} per batch run equivalent.
 
 ## 2. Failure Analysis
-**Total Failures**: {len(failures)}
+**Total Failures**: {failures}
 
 **Top Recurring Issues**:
-"""
-    if not top_issues:
-        md += "*   *None. Perfect Run!*"
-    else:
-        for issue, count in top_issues:
-            md += f"*   **{count}x**: {issue}\n"
+""")
+        if not top_issues:
+            f.write("*   *None. Perfect Run!*\n")
+        else:
+            for issue, count in top_issues:
+                f.write(f"*   **{count}x**: {issue}\n")
+
+        juror_failures = metrics.get("juror_failures")
+        if juror_failures:
+            f.write("""
+**Failures by Juror**:
+| Juror | Judged | Failed | Skipped |
+| :--- | :--- | :--- | :--- |
+""")
+            for juror, counts in juror_failures.items():
+                judged = counts["runs"] - counts["skipped"]
+                rate = f" ({counts['failed'] / judged * 100:.1f}%)" if judged else ""
+                f.write(f"| {juror} | {judged} | {counts['failed']}{rate} | {counts['skipped']} |\n")
 
-    md += """
+        f.write("""
 ## 3. Recommendations
-"""
-    if grade == "A":
-        md += "*   System is production-ready. Consider increasing high-stakes sample size.\n"
-    elif grade == "F":
-        md += "*   CRITICAL: Review prompt engineering for Bias/Fact agents.\n"
-    elif len(failures) > 0:
-        md += "*   Tune Jury strictness or Improve Writer context handling.\n"
-
-    md += """
-## 4. Run Details
-| Game ID | Iter | Status | Revs | Duration |
+""")
+        if grade == "A":
+            f.write("*   System is production-ready. Consider increasing high-stakes sample size.\n")
+        elif grade == "F":
+            f.write("*   CRITICAL: Review prompt engineering for Bias/Fact agents.\n")
+        elif failures > 0:
+            f.write("*   Tune Jury strictness or Improve Writer context handling.\n")
+
+        comparison = metrics.get("jury_modes")
+        if comparison:
+            f.write("""
+## Jury Mode Comparison
+| Mode | Runs | Avg Duration | p95 Duration | Pass Rate | Red-Team Catch Rate |
+| :--- | :--- | :--- | :--- | :--- | :--- |
+""")
+            for mode, m in comparison.items():
+                catch = f"{m['red_team_catch_rate_pct']:.1f}%" if m["red_team_catch_rate_pct"] is not None else "-"
+                f.write(f"| {mode} | {m['runs']} | {m['avg_duration_sec']:.1f}s | {m['p95_duration_sec']:.1f}s | {m['pass_rate_pct']:.1f}% | {catch} |\n")
+
+        stages = metrics.get("stages")
+        if stages:
+            f.write("""
+## Stage Latency
+| Stage | Count | p50 | p95 | Tokens/sec |
 | :--- | :--- | :--- | :--- | :--- |
-"""
-    for r in results:
-        icon = "✅" if r["status"] == "PASS" else "❌"
-        md += f"| {r['game_id']} | {r['iteration']} | {icon} {r['status']} | {r['revisions']} | {r['duration']:.1f}s |\n"
-        md += f"| {r['game_id']} | {r['iteration']} | {icon} {r['status']} | {r['revisions']} | {r['duration']:.1f}s |"
-        if config.get("recall"):
-            md += f" {r['recall_score']:.2f} |"
-        md += "\n"
-        
-    # Save File
-    report_path = filename.replace(".json", "_report.md")
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write(md)
+""")
+            for stage, m in stages.items():
+                tps = f"{m['avg_tokens_per_sec']:.1f}" if m["avg_tokens_per_sec"] else "-"
+                f.write(f"| {stage} | {m['count']} | {m['p50']:.2f}s | {m['p95']:.2f}s | {tps} |\n")
+
+        recall = config.get("recall")
+        f.write(f"""
+## 4. Run Details
+| Game ID | Iter | Status | Revs | Duration |{" Recall |" if recall else ""}
+| :--- | :--- | :--- | :--- | :--- |{" :--- |" if recall else ""}
+""")
+        for r in results:
+            icon = "✅" if r["status"] == "PASS" else "❌"
+            row = f"| {r['game_id']} | {r['iteration']} | {icon} {r['status']} | {r['revisions']} | {r['duration']:.1f}s |"
+            if recall:
+                row += f" {r.get('recall_score', 0):.2f} |"
+            f.write(row + "\n")
         
     print(f"Report Output: {report_path}")
 
+def run_result(game_id, iteration, result, duration, jury_mode=None):
+    return {
+        "game_id": game_id,
+        "iteration": iteration,
+        "duration": duration,
+        "jury_mode": jury_mode,
+        "status": result.get("jury_verdict", "FAIL"),
+        "quality_score": result.get("jury_quality_score", 0),
+        "seo_score": result.get("jury_seo_score", 0),
+        "engagement_score": result.get("jury_engagement_score", 0),
+        "detailed_results": result.get("jury_detailed_results", {}),
+        "revisions": result.get("revision_count", 0),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "errors": result.get("jury_feedback", []),
+        "stage_metrics": result.get("stage_metrics", [])
+    }
+
+def attack_caught(attack, detailed):
+    """
+    (caught, vetoed) for a red-team attack, from the jury's detailed results.
+    Under fail_fast a veto skips the scoring jurors: the draft was blocked
+    anyway, so a SKIPPED target counts as caught (vetoed=True).
+    """
+    if attack in ('editor', 'seo', 'engagement') and detailed.get(attack, {}).get('status') == 'SKIPPED':
+        return True, True
+
+    if attack == 'brand_safety':
+        caught = detailed.get('safety', {}).get('status') == 'FAIL'
+    elif attack == 'bias':
+        caught = detailed.get('bias', {}).get('status') == 'FAIL'
+    elif attack == 'fact_checker':
+        caught = detailed.get('fact', {}).get('status') == 'FAIL'
+    elif attack == 'editor':
+        s = detailed.get('editor', {})
+        caught = s.get('status') == 'FAIL' or s.get('score', 10) < EDITOR_MIN_SCORE
+    elif attack == 'seo':
+        caught = detailed.get('seo', {}).get('score', 100) < SEO_MIN_SCORE
+    elif attack == 'engagement':
+        caught = detailed.get('engagement', {}).get('score', 10) < ENGAGEMENT_MIN_SCORE
+    else:
+        caught = False
+    return caught, False
+
 async def main(args):
+    # Every finished run is appended to the log (one JSON line); the summary is built from it at the end
+    log_path = args.log or args.output.replace(".json", "") + ".jsonl"
+    done = set()
+    if args.resume and os.path.exists(log_path):
+        plan, previous = read_log(log_path)
+        if plan:
+            # Same games and run shape as the interrupted benchmark
+            game_ids = plan["game_ids"]
+            for key in RESUME_ARGS:
+                setattr(args, key, plan["config"].get(key, getattr(args, key)))
+        else:
+            game_ids = list(dict.fromkeys(r["game_id"] for r in previous))
+        done = {run_key(r) for r in previous}
+        print(f"Resuming from {log_path}: {len(done)} runs already logged")
+        log = ResultLog(log_path, append=True)
+    else:
+        by = tuple(filter(None, args.stratify.split(",")))
+        game_ids = get_random_game_ids(args.batch_size, args.type, args.seed, by, parse_weights(args.weights))
+        log = ResultLog(log_path, plan={"game_ids": game_ids, "config": vars(args)})
+    new_runs = 0
+
+    if args.red_team and args.schedule == "waves":
+        # Red-team runs judge fixed poisoned drafts one at a time; only logs from older versions get here
+        print("Warning: --schedule waves does not apply to --red_team, running sequentially")
+        args.schedule = "sequential"
+
     print(f"Starting Batch Evaluation: {args.batch_size} games. Type: {args.type}")
-    print(f"Modes: Red Team={args.red_team}, Recall Metric={args.recall}")
-    
-    game_ids = get_random_game_ids(args.batch_size, args.type)
-    results = []
+    print(f"Modes: Red Team={args.red_team}, Recall Metric={args.recall}, Jury={args.jury_mode or 'default'}, Schedule={args.schedule}")
     
     analyst_chain = get_context_analyst() if args.recall else None
     
-    total_start = time.time()
+    # Counts Ollama model (re)loads in either schedule
+    tracker = ModelLoadTracker()
+    run_config = {"callbacks": [tracker]}
+    waves = args.schedule == "waves"
+    planned = [] # (game_id, iteration, inputs) for the wave scheduler
+    # None = graph default (JURY_MODE); "compare" runs every game through both
+    jury_modes = ["full", "panel"] if args.jury_mode == "compare" else [args.jury_mode]
+    schedule = None
     
     print(f"Starting benchmark for {len(game_ids)} games ({args.iterations} iterations each)...")
     
+    # Every game's stats in one pass, instead of a lookup per game
+    load_stages_by_game = {}
+    all_stats = get_game_stats_many(game_ids, load_stages_by_game)
+
     try:
         for i, game_id in enumerate(game_ids):
             print(f"[{i+1}/{len(game_ids)}] Processing Game {game_id}...")
+
+            # Runs for this game still missing from the log (all of them unless --resume)
+            if args.red_team:
+                todo = [(a, m) for a in RED_TEAM_ATTACKS for m in jury_modes if (game_id, 1, m, a) not in done]
+            else:
+                todo = [(m, n) for m in jury_modes for n in range(args.iterations) if (game_id, n + 1, m, None) not in done]
+            if not todo:
+                print("  > Already logged, skipping")
+                continue
             
             # Common Setup
-            stats = get_game_stats(game_id)
+            load_stages = load_stages_by_game.get(str(game_id), []) # context/stats load timings, attached to the game's first run
+            stats = all_stats[str(game_id)]
             if "Error" in stats:
                 print(f"  > Skipping {game_id}: {stats}")
                 continue
@@ -160,72 +288,68 @@ async def main(args):
                 base_inputs = {
                     "input_stats": stats, 
                     "draft": "", "jury_verdict": "", "jury_feedback": [], 
-                    "revision_count": 0, "jury_detailed_results": {}
+                    "revision_count": 0, "jury_detailed_results": {},
+                    "stage_metrics": load_stages
                 }
                 # Run purely to get draft (Writer Node)
                 # We can just use graph normally, assuming it passes clean
-                clean_res = await asyncio.to_thread(graph_app.invoke, base_inputs)
+                clean_res = await graph_app.ainvoke(base_inputs, run_config)
                 base_draft = clean_res.get("draft", "")
                 
                 if not base_draft:
                     print("  > Error: Could not generate base draft for attacks.")
                     continue
 
-                attacks = ['brand_safety', 'bias', 'fact_checker', 'editor', 'seo', 'engagement']
-                
-                for attack in attacks:
+                for attack in RED_TEAM_ATTACKS:
                     # 2. Generate Attack
                     poisoned_draft = generate_attack_draft(base_draft, attack)
-                    print(f"    - Attack: {attack}...")
-                    
-                    # 3. Test Jury on Poisoned Draft
-                    # We use force_draft to bypass writer
-                    attack_inputs = {
-                        "input_stats": stats,
-                        "draft": "", 
-                        "force_draft": poisoned_draft,
-                        "jury_verdict": "", "jury_feedback": [], 
-                        "revision_count": 0, "jury_detailed_results": {}
-                    }
-                    
-                    res = await asyncio.to_thread(graph_app.invoke, attack_inputs)
-                    detailed = res.get("jury_detailed_results", {})
-                    
-                    # 4. Check if CAUGHT
-                    caught = False
                     
-                    if attack == 'brand_safety':
-                        if detailed.get('safety', {}).get('status') == 'FAIL': caught = True
-                    elif attack == 'bias':
-                        if detailed.get('bias', {}).get('status') == 'FAIL': caught = True
-                    elif attack == 'fact_checker':
-                        if detailed.get('fact', {}).get('status') == 'FAIL': caught = True
-                    elif attack == 'editor':
-                        s = detailed.get('editor', {})
-                        if s.get('status') == 'FAIL' or s.get('score', 10) < 6: caught = True
-                    elif attack == 'seo':
-                        if detailed.get('seo', {}).get('score', 100) < 70: caught = True
-                    elif attack == 'engagement':
-                        if detailed.get('engagement', {}).get('score', 10) < 7: caught = True
-                    
-                    status_icon = "🛡️ CAUGHT" if caught else "⚠️ MISSED"
-                    print(f"      > Result: {status_icon}")
-                    
-                    results.append({
-                        "game_id": game_id,
-                        "iteration": 1,
-                        "duration": 0,
-                        "status": "PASS" if not caught else "FAIL", 
-                        "red_team_attack": attack,
-                        "red_team_caught": caught,
-                        "detailed_results": detailed,
-                        "revisions": 0,
-                        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-                    })
+                    # 3. Test Jury on Poisoned Draft (same draft for every jury mode)
+                    for mode in jury_modes:
+                        if (attack, mode) not in todo:
+                            continue
+                        print(f"    - Attack: {attack}{f' ({mode} jury)' if mode else ''}...")
+                        # We use force_draft to bypass writer
+                        attack_inputs = {
+                            "input_stats": stats,
+                            "draft": "", 
+                            "force_draft": poisoned_draft,
+                            "fact_screen": False, # Test the jurors themselves, not the rule-based screen
+                            "jury_verdict": "", "jury_feedback": [], 
+                            "revision_count": 0, "jury_detailed_results": {}
+                        }
+                        if mode:
+                            attack_inputs["jury_mode"] = mode
+                        
+                        start_time = time.time()
+                        res = await graph_app.ainvoke(attack_inputs, run_config)
+                        detailed = res.get("jury_detailed_results", {})
+                        
+                        # 4. Check if CAUGHT
+                        caught, vetoed = attack_caught(attack, detailed)
+                        
+                        status_icon = "🛡️ CAUGHT (blocked by veto)" if vetoed else "🛡️ CAUGHT" if caught else "⚠️ MISSED"
+                        print(f"      > Result: {status_icon}")
+                        
+                        log.append({
+                            "game_id": game_id,
+                            "iteration": 1,
+                            "duration": time.time() - start_time, # Jury only (writer bypassed)
+                            "status": "PASS" if not caught else "FAIL", 
+                            "jury_mode": mode,
+                            "red_team_attack": attack,
+                            "red_team_caught": caught,
+                            "red_team_vetoed": vetoed,
+                            "detailed_results": detailed,
+                            "stage_metrics": res.get("stage_metrics", []),
+                            "revisions": 0,
+                            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+                        })
+                        new_runs += 1
 
             # --- NORMAL MODE ---
             else:
-                for iter_num in range(args.iterations):
+                for mode, iter_num in todo:
                     start_time = time.time()
                     try:
                         inputs = {
@@ -234,67 +358,69 @@ async def main(args):
                             "jury_verdict": "", 
                             "jury_feedback": [], 
                             "revision_count": 0,
-                            "jury_detailed_results": {}
+                            "jury_detailed_results": {},
+                            "stage_metrics": load_stages
                         }
-                        result = await asyncio.to_thread(graph_app.invoke, inputs)
+                        load_stages = []
+                        if mode:
+                            inputs["jury_mode"] = mode
+                        if waves:
+                            # Run later, together with every other game
+                            planned.append((game_id, iter_num + 1, inputs))
+                            continue
+                        result = await graph_app.ainvoke(inputs, run_config)
                         
                         duration = time.time() - start_time
                         
-                        results.append({
-                            "game_id": game_id,
-                            "iteration": iter_num + 1,
-                            "duration": duration,
-                            "status": result.get("jury_verdict", "FAIL"),
-                            "quality_score": result.get("jury_quality_score", 0),
-                            "seo_score": result.get("jury_seo_score", 0),
-                            "engagement_score": result.get("jury_engagement_score", 0),
-                            "detailed_results": result.get("jury_detailed_results", {}),
-                            "revisions": result.get("revision_count", 0),
-                            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                            "errors": result.get("jury_feedback", [])
-                        })
+                        log.append(run_result(game_id, iter_num + 1, result, duration, mode))
+                        new_runs += 1
                     except Exception as e:
                         print(f"Error {game_id}: {e}")
 
-            # Save incremental
-            with open(args.output, 'w') as f:
-                json.dump(results, f, indent=2)
+        if planned:
+            print(f"Running {len(planned)} articles in model-grouped waves...")
+
+            async def on_done(i, result, duration, error):
+                game_id, iteration, inputs = planned[i]
+                if error is not None:
+                    print(f"Error {game_id}: {error}")
+                    return
+                nonlocal new_runs
+                log.append(run_result(game_id, iteration, result, duration, inputs.get("jury_mode")))
+                new_runs += 1
+
+            _, schedule = await run_waves([p[2] for p in planned], run_config, on_done)
 
     except KeyboardInterrupt:
         print("\n[!] Run interrupted by user (KeyboardInterrupt).")
         print("Stopping loop and generating report for completed games...")
+    finally:
+        log.close()
 
-    total_duration = time.time() - total_start
-    
-    # Summary Metrics
-    total_runs = len(results)
-    pass_count = len([r for r in results if r['status'] == 'PASS'])
-    safety_count = len([r for r in results if r['revisions'] == 0])
-    
-    quality_scores = [r.get('quality_score', 0) for r in results]
-    avg_quality = sum(quality_scores) / total_runs if total_runs > 0 else 0
-    
-    hallucinations = len([r for r in results if any("FACT" in e or "Hallucination" in e for e in r.get('errors', []))])
-    hallucination_rate = (hallucinations / total_runs * 100) if total_runs > 0 else 0
+    # Summary Metrics: one pass over the whole log, including runs from before a --resume
+    aggregator, _ = aggregate_log(log_path)
     
-    pass_rate = (pass_count / total_runs * 100) if total_runs > 0 else 0
-    safety_rate = (safety_count / total_runs * 100) if total_runs > 0 else 0
-    throughput = (total_runs / (total_duration / 60)) if total_duration > 0 else 0
+    model_loads = tracker.report()
+    if schedule is not None:
+        schedule.update(schedule_savings(schedule, model_loads))
     
+    metrics = aggregator.metrics()
     summary = {
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "config": vars(args),
+        "log": log_path, # every run's result, one per line
         "metrics": {
-            "total_runs": total_runs,
-            "total_duration_sec": total_duration,
-            "pass_rate_pct": pass_rate,
-            "safety_rate_pct": safety_rate,
-            "hallucination_rate_pct": hallucination_rate,
-            "avg_quality_score": avg_quality,
-            "throughput_arts_per_min": throughput
-        },
-        "results": results
+            **metrics,
+            "resumed_runs": metrics["total_runs"] - new_runs,
+            "fact_screen": screen_report(),
+            "chains": chain_stats(),
+            "llm_cache": cache_report(),
+            "model_loads": model_loads,
+            "schedule": schedule,
+        }
     }
+    total_duration = metrics["total_duration_sec"]
+    throughput = metrics["throughput_arts_per_min"]
     
     with open(args.output, 'w') as f:
         json.dump(summary, f, indent=2)
@@ -302,12 +428,25 @@ async def main(args):
     print("\n--- EVALUATION COMPLETE ---")
     print(f"Total Duration: {total_duration:.1f}s")
     print(f"Throughput: {throughput:.1f} articles/min")
-    print(f"Pass Rate: {pass_rate:.1f}% | Safety Rate: {safety_rate:.1f}%")
-    print(f"Avg Quality Score: {avg_quality:.1f}/10")
-    print(f"Hallucination Rate: {hallucination_rate:.1f}%")
-    print(f"Results saved to: {args.output}")
+    print(f"Pass Rate: {metrics['pass_rate_pct']:.1f}% | Safety Rate: {metrics['safety_rate_pct']:.1f}%")
+    print(f"Avg Quality Score: {metrics['avg_quality_score']:.1f}/10")
+    print(f"Hallucination Rate: {metrics['hallucination_rate_pct']:.1f}%")
+    screen = summary["metrics"]["fact_screen"]
+    print(f"Fact Screen: {screen['drafts_rejected']}/{screen['drafts_screened']} drafts rejected, {screen['llm_calls_saved']} jury calls saved")
+    print(f"Model Loads: {model_loads['model_loads']} ({model_loads['model_load_seconds']:.1f}s)")
+    if schedule is not None:
+        print(f"Waves: {schedule['waves']} waves, {schedule['model_switches']} model switches vs {schedule['model_switches_sequential']} one-at-a-time (~{schedule['est_load_seconds_saved']:.1f}s load time saved)")
+    comparison = summary["metrics"]["jury_modes"]
+    if comparison:
+        for mode, m in comparison.items():
+            catch = f", catch rate {m['red_team_catch_rate_pct']:.1f}%" if m["red_team_catch_rate_pct"] is not None else ""
+            print(f"Jury {mode}: avg {m['avg_duration_sec']:.1f}s, p95 {m['p95_duration_sec']:.1f}s, pass {m['pass_rate_pct']:.1f}%{catch}")
+    cache = summary["metrics"]["llm_cache"]
+    if cache:
+        print(f"LLM Cache: {cache['hits']} hits / {cache['misses']} misses ({cache['hit_rate_pct']:.1f}%), {cache['entries']} entries, {cache['size_mb']:.1f} MB")
+    print(f"Results saved to: {args.output} (run log: {log_path})")
     
-    generate_report(summary, args.output)
+    generate_report(summary, args.output, iter_results([log_path]))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="SportsEdit-AI Benchmarking Tool")
@@ -315,8 +454,20 @@ if __name__ == "__main__":
     parser.add_argument("--iterations", type=int, default=1, help="Runs per game")
     parser.add_argument("--type", type=str, default="playoff", choices=["all", "regular", "playoff"], help="Game Type filter")
     parser.add_argument("--output", type=str, default="benchmark_results.json", help="Output JSON file path")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the game sample (same seed, same games)")
+    parser.add_argument("--stratify", type=str, default="", help="Spread the sample across these catalog columns, e.g. season,round (see utils/game_catalog.py)")
+    parser.add_argument("--weights", type=str, default="", help="Over-sample games, e.g. stakes:elimination=3,stakes:clincher=3")
     parser.add_argument("--red_team", action="store_true", help="Enable Adversarial Data Poisoning")
     parser.add_argument("--recall", action="store_true", help="Enable Context Recall Analysis")
+    parser.add_argument("--schedule", type=str, default="sequential", choices=["sequential", "waves"], help="waves: run all writer steps, then all jury steps, across games (fewer Ollama model swaps)")
+    parser.add_argument("--jury_mode", type=str, default=None, choices=["full", "fail_fast", "panel", "compare"], help="Jury mode (default: JURY_MODE env). compare: run every game with the six-call and the panel jury")
+    parser.add_argument("--log", type=str, default=None, help="JSONL run log (default: --output with .jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Continue the games in --log, skipping runs already logged")
+    parser.add_argument("--llm_cache", action="store_true", help="Reuse cached jury/analyst responses from llm_cache.db (writer is never cached)")
     
     args = parser.parse_args()
+    if args.red_team and args.schedule == "waves":
+        parser.error("--schedule waves can't be combined with --red_team (attacks are judged one draft at a time)")
+    if args.llm_cache:
+        enable_cache()
     asyncio.run(main(args))
@@ -0,0 +1,175 @@
+import re
+import threading
+
+# Rule-based screen that runs between the writer and the jury.
+# Only flags things a parser can be sure about, to keep clean drafts from
+# being bounced; anything subtler is left to the Fact Checker / Editor jurors.
+# Opt-in (FACT_SCREEN=1) until its false-positive rate has been measured.
+
+# Abbreviation -> full name, incl. franchises that moved/renamed during the dataset
+TEAM_NAMES = {
+    'ATL': "Atlanta Hawks", 'BOS': "Boston Celtics", 'BKN': "Brooklyn Nets",
+    'CHA': "Charlotte Hornets", 'CHI': "Chicago Bulls", 'CLE': "Cleveland Cavaliers",
+    'DAL': "Dallas Mavericks", 'DEN': "Denver Nuggets", 'DET': "Detroit Pistons",
+    'GSW': "Golden State Warriors", 'HOU': "Houston Rockets", 'IND': "Indiana Pacers",
+    'LAC': "LA Clippers", 'LAL': "Los Angeles Lakers", 'MEM': "Memphis Grizzlies",
+    'MIA': "Miami Heat", 'MIL': "Milwaukee Bucks", 'MIN': "Minnesota Timberwolves",
+    'NOP': "New Orleans Pelicans", 'NYK': "New York Knicks", 'OKC': "Oklahoma City Thunder",
+    'ORL': "Orlando Magic", 'PHI': "Philadelphia 76ers", 'PHX': "Phoenix Suns",
+    'POR': "Portland Trail Blazers", 'SAC': "Sacramento Kings", 'SAS': "San Antonio Spurs",
+    'TOR': "Toronto Raptors", 'UTA': "Utah Jazz", 'WAS': "Washington Wizards",
+    'NJN': "New Jersey Nets", 'SEA': "Seattle SuperSonics", 'NOH': "New Orleans Hornets",
+    'NOK': "New Orleans/Oklahoma City Hornets",
+}
+
+# Nicknames that are also ordinary words; only the full "City Nickname" counts for these
+AMBIGUOUS_NICKNAMES = {"Heat", "Magic", "Jazz", "Thunder", "Kings", "Suns", "Nets"}
+
+WIN_VERBS = r"def\.|defeated|beat|beats|topped|downed|edged|outlasted|routed"
+LOSS_VERBS = r"lost to|fell to|was defeated by|were defeated by|dropped a game to"
+
+# Final scores are well above any W-L record or half-time score we care about
+MIN_FINAL_SCORE = 70
+
+# A player's stat window stops at the next name (any capitalised word) or clause
+STAT_WINDOW_END = r"[.!?](?:\s|$)|[;,]|\b(?:while|and)\b|\b[A-Z]"
+
+def nickname(full_name):
+    return "Trail Blazers" if full_name.endswith("Trail Blazers") else full_name.split()[-1]
+
+def team_aliases():
+    """
+    Returns [(alias, abbreviation)], longest alias first so "Golden State
+    Warriors" wins over "Warriors".
+    """
+    aliases = []
+    for abbr, full in TEAM_NAMES.items():
+        aliases.append((abbr, abbr))
+        aliases.append((full, abbr))
+        nick = nickname(full)
+        if nick not in AMBIGUOUS_NICKNAMES:
+            aliases.append((nick, abbr))
+    return sorted(aliases, key=lambda a: -len(a[0]))
+
+TEAM_ALIASES = team_aliases()
+TEAM_PATTERN = "|".join(re.escape(alias) for alias, _ in TEAM_ALIASES)
+
+def resolve_team(alias):
+    # All abbreviations an alias may refer to (e.g. "Hornets" -> CHA, NOH, NOK)
+    return {abbr for name, abbr in TEAM_ALIASES if name == alias}
+
+def parse_stats(stats_text):
+    """
+    Pulls the structured facts back out of get_game_stats() output.
+    Returns {"winner", "loser", "scores": {team: pts}, "players": {name: (pts, reb, ast)}}
+    or None if the text doesn't contain a box score.
+    """
+    final = re.search(r"FINAL SCORE: (\S+) \((\d+)\) def\. (\S+) \((\d+)\)", stats_text)
+    if not final:
+        return None
+    winner, w_pts, loser, l_pts = final.groups()
+
+    players = {}
+    details = stats_text.split("DETAILS:", 1)[-1]
+    for name, pts, reb, ast in re.findall(r"([^:,|()]+?) \((\d+) pts, (\d+) reb, (\d+) ast\)", details):
+        players[name.strip()] = (int(pts), int(reb), int(ast))
+
+    return {
+        "winner": winner,
+        "loser": loser,
+        "scores": {winner: int(w_pts), loser: int(l_pts)},
+        "players": players,
+    }
+
+def check_score(draft, facts):
+    # 1. Final score: only flag if the real score never appears and another score-like pair does
+    real = sorted(facts["scores"].values())
+    pairs = [sorted((int(a), int(b))) for a, b in re.findall(r"\b(\d{2,3})\s*[-–]\s*(\d{2,3})\b", draft)]
+    if any(p == real for p in pairs):
+        return []
+    wrong = [p for p in pairs if p[0] >= MIN_FINAL_SCORE]
+    if wrong:
+        stated = f"{wrong[0][1]}-{wrong[0][0]}"
+        return [f"Final score stated as {stated}, but it was {real[1]}-{real[0]}."]
+    return []
+
+def results_stated(draft):
+    # [(subject, verb, object)] for every "<team> beat/lost to <team>" in the draft
+    team = rf"({TEAM_PATTERN})"
+    return re.findall(rf"\b{team}\b(?:\s*\(\d+\))?\s+({WIN_VERBS}|{LOSS_VERBS})\s+(?:the\s+)?{team}\b", draft)
+
+def check_winner(draft, facts):
+    # 2. Flipped result: "<loser> beat <winner>" or "<winner> lost to <loser>"
+    errors = []
+    winner, loser = facts["winner"], facts["loser"]
+    for subject, verb, obj in results_stated(draft):
+        subj_teams, obj_teams = resolve_team(subject), resolve_team(obj)
+        lost = re.fullmatch(LOSS_VERBS, verb) is not None
+        if (not lost and loser in subj_teams and winner in obj_teams) or \
+           (lost and winner in subj_teams and loser in obj_teams):
+            errors.append(f"Winner flipped: \"{subject} {verb} {obj}\", but {winner} beat {loser}.")
+    return errors
+
+def check_players(draft, facts):
+    # 3. Player lines: the first number given for pts/reb/ast right after a player's full name
+    errors = []
+    names = facts["players"]
+    if not names:
+        return errors
+    name_pattern = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+    for mention in re.finditer(rf"\b({name_pattern})\b", draft):
+        # Window ends at the clause end or the next name of any kind ("Curry", "Gary Payton II")
+        window = draft[mention.end():]
+        window_end = re.search(STAT_WINDOW_END, window)
+        if window_end:
+            window = window[:window_end.start()]
+
+        name = mention.group(1)
+        for label, unit, actual in zip(
+            ("points", "rebounds", "assists"),
+            (r"points|pts", r"rebounds|reb|boards", r"assists|ast|dimes"),
+            names[name]
+        ):
+            found = re.search(rf"\b(\d+)\s+(?:{unit})\b", window)
+            if found and int(found.group(1)) != actual:
+                errors.append(f"{name} had {actual} {label}, not {found.group(1)}.")
+    return errors
+
+def check_teams(draft, facts):
+    # 4. Teams that weren't in this game, stated as winning or losing it
+    # (other mentions, e.g. the next opponent, are fine)
+    in_game = set(facts["scores"])
+    outsiders = []
+    for subject, _, obj in results_stated(draft):
+        for alias in (subject, obj):
+            if not resolve_team(alias) & in_game and alias not in outsiders:
+                outsiders.append(alias)
+    return [f"\"{alias}\" did not play in this game ({' vs '.join(sorted(in_game))})." for alias in outsiders]
+
+def screen_draft(draft, stats_text):
+    """
+    Returns a list of factual errors found in the draft (empty if it passes
+    or if the stats can't be parsed).
+    """
+    facts = parse_stats(stats_text)
+    if facts is None or not draft:
+        return []
+    return check_score(draft, facts) + check_winner(draft, facts) + check_players(draft, facts) + check_teams(draft, facts)
+
+# Process-wide counters, reported by the API and the benchmark
+_stats = {"drafts_screened": 0, "drafts_rejected": 0, "llm_calls_saved": 0}
+_stats_lock = threading.Lock()
+
+def record_screen(rejected, calls_saved=0):
+    with _stats_lock:
+        _stats["drafts_screened"] += 1
+        if rejected:
+            _stats["drafts_rejected"] += 1
+            _stats["llm_calls_saved"] += calls_saved
+
+def screen_report():
+    with _stats_lock:
+        report = dict(_stats)
+    screened = report["drafts_screened"]
+    report["hit_rate_pct"] = report["drafts_rejected"] / screened * 100 if screened else 0.0
+    return report
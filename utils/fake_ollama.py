@@ -0,0 +1,316 @@
+import argparse
+import ast
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path so `python utils/fake_ollama.py` resolves utils.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fact_screen import parse_stats
+from utils.result_log import read_log
+
+# Stand-in for the Ollama server: speaks /api/chat, /api/generate and
+# /api/tags, answers every agent from a script (or recorded outputs) and
+# simulates model loads, parallel slots, prompt processing and token rate.
+# Point the pipeline at it with OLLAMA_HOST=http://127.0.0.1:11435.
+
+DEFAULT_PORT = 11435
+
+# Agent <- distinctive piece of its system prompt (first match wins)
+AGENT_PROMPTS = [
+    ("panel", "jury of six"),
+    ("writer", "Beat Writer"),
+    ("analyst", "Senior Sports Analyst"),
+    ("recall", "Check if the following FACTS"),
+    ("fact", "strict Fact Checker"),
+    ("judge", "strict fact-checker"),
+    ("editor", "Editor-in-Chief"),
+    ("bias", "unfair bias"),
+    ("seo", "SEO Strategist"),
+    ("engagement", "Engagement Editor"),
+    ("safety", "Brand Safety"),
+]
+
+# Clean verdict per juror, and the red-team marker (utils/red_team.py) that flips it
+JUROR_SCRIPT = {
+    "fact": ({"status": "PASS", "errors": []}, ("lost to", "was defeated by"), {"status": "FAIL", "errors": ["Winner and loser are swapped."]}),
+    "bias": ({"status": "PASS", "issues": []}, ("pathetic",), {"status": "FAIL", "issues": ["Demeaning language about the losing team."]}),
+    "safety": ({"status": "PASS", "flags": []}, ("idiot",), {"status": "FAIL", "flags": ["Personal insult aimed at the referee."]}),
+    "editor": ({"status": "PASS", "score": 8, "feedback": "Clear and accurate recap."}, ("Bulls also made",), {"status": "FAIL", "score": 3, "feedback": "Hallucinated teams."}),
+    "seo": ({"score": 82, "suggestions": []}, ("home team played the visiting team",), {"score": 20, "suggestions": ["Name the teams and star players."]}),
+    "engagement": ({"score": 8, "critique": "Strong hook."}, ("Players scored points",), {"score": 2, "critique": "No hook, no story."}),
+}
+
+def identify_agent(messages):
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    for agent, marker in AGENT_PROMPTS:
+        if marker in system:
+            return agent
+    return "unknown"
+
+def user_text(messages):
+    return "\n".join(m.get("content", "") for m in messages if m.get("role") == "user")
+
+def juror_verdict(juror, draft):
+    clean, markers, caught = JUROR_SCRIPT[juror]
+    return caught if any(m in draft for m in markers) else clean
+
+def draft_of(text):
+    # "... Draft: <draft>\n<format instructions>" -> <draft>
+    match = re.search(r"Draft(?: Article)?: (.*?)(?:\nThe output should be|\Z)", text, re.S)
+    return match.group(1) if match else text
+
+def write_recap(stats_text):
+    # Accurate recap straight from the box score, so the fact screen passes it
+    facts = parse_stats(stats_text)
+    if facts is None:
+        return "The game is over. Both teams played hard and the final buzzer sounded."
+    scores = facts["scores"]
+    winner, loser = facts["winner"], facts["loser"]
+    lines = [f"{winner} defeated {loser} {scores[winner]}-{scores[loser]} on Tuesday night."]
+    for name, (pts, reb, ast_) in list(facts["players"].items())[:4]:
+        lines.append(f"{name} finished with {pts} points, {reb} rebounds and {ast_} assists.")
+    lines.append(f"{winner} controlled the fourth quarter to close it out.")
+    return " ".join(lines)
+
+def scripted_response(agent, text):
+    if agent == "writer":
+        return write_recap(text)
+    if agent in JUROR_SCRIPT:
+        return json.dumps(juror_verdict(agent, draft_of(text)))
+    if agent == "panel":
+        draft = draft_of(text)
+        return json.dumps({juror: juror_verdict(juror, draft) for juror in JUROR_SCRIPT})
+    if agent == "judge":
+        return json.dumps({"status": "PASS", "errors": [], "score": 85})
+    if agent == "analyst":
+        facts = parse_stats(text)
+        beats = [f"{name} scored {pts} points" for name, (pts, _, _) in list((facts or {}).get("players", {}).items())[:5]]
+        return json.dumps({"beats": beats or ["The game ended."]})
+    if agent == "recall":
+        match = re.search(r"Facts: (\[.*?\])\n", text, re.S)
+        try:
+            count = len(ast.literal_eval(match.group(1))) if match else 0
+        except (ValueError, SyntaxError):
+            count = 0
+        return json.dumps({"hits": [True] * count})
+    return "OK"
+
+def load_recorded(path):
+    """
+    {agent: [response, ...]} from a JSON file of that shape, or from a
+    benchmark run log / benchmark_results.json (each run's jury_detailed_results per juror).
+    """
+    if path.endswith(".jsonl"):
+        _, results = read_log(path)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not (isinstance(data, dict) and "results" in data):
+            return data
+        results = data["results"]
+    pools = {}
+    for result in results:
+        for juror, verdict in (result.get("detailed_results") or {}).items():
+            if juror in JUROR_SCRIPT and verdict.get("status") != "SKIPPED":
+                pools.setdefault(juror, []).append(verdict)
+    return pools
+
+class FakeOllama:
+    """
+    Response script plus the simulated server resources. All delays are in
+    seconds; token counts are whitespace-separated words.
+    """
+
+    def __init__(self, latency=0.0, tokens_per_sec=50.0, prompt_tokens_per_sec=2000.0,
+                 load_seconds=2.0, max_loaded=1, parallel=4, recorded=None):
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.prompt_tokens_per_sec = prompt_tokens_per_sec
+        self.load_seconds = load_seconds
+        self.max_loaded = max_loaded
+        self.slots = threading.Semaphore(parallel)
+        self.recorded = {agent: itertools.cycle(pool) for agent, pool in (recorded or {}).items() if pool}
+        self.loaded = OrderedDict() # model -> last used, LRU order
+        self.calls = Counter()
+        self.loads = Counter()
+        self._lock = threading.Lock()
+
+    def respond(self, agent, text):
+        with self._lock:
+            self.calls[agent] += 1
+            if agent in self.recorded:
+                response = next(self.recorded[agent])
+                return response if isinstance(response, str) else json.dumps(response)
+        return scripted_response(agent, text)
+
+    def ensure_loaded(self, model):
+        # Returns the load time paid by this request (0 if the model was resident)
+        with self._lock:
+            if model in self.loaded:
+                self.loaded.move_to_end(model)
+                return 0.0
+            while len(self.loaded) >= self.max_loaded:
+                self.loaded.popitem(last=False)
+            self.loaded[model] = time.time()
+            self.loads[model] += 1
+        time.sleep(self.load_seconds)
+        return self.load_seconds
+
+    def stats(self):
+        with self._lock:
+            return {"calls": dict(self.calls), "loads": dict(self.loads), "loaded": list(self.loaded)}
+
+def now():
+    return datetime.now(timezone.utc).isoformat()
+
+def ns(seconds):
+    return int(seconds * 1e9)
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive + chunked streaming, like the real server
+    fake = None # FakeOllama, set by make_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunk(self, payload):
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            models = [{"name": f"{m}:latest", "model": f"{m}:latest", "size": 0, "digest": m} for m in ("llama3.2", "mistral")]
+            self.send_json({"models": models})
+        elif self.path == "/api/version":
+            self.send_json({"version": "0.0.0-fake"})
+        elif self.path == "/fake/stats":
+            self.send_json(self.fake.stats())
+        else:
+            self.send_json({"error": "not found"}, 404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/chat":
+            messages = request.get("messages", [])
+            self.generate(request, identify_agent(messages), user_text(messages), chat=True)
+        elif self.path == "/api/generate":
+            prompt = request.get("prompt") or ""
+            self.generate(request, "generate" if prompt else "preload", prompt, chat=False)
+        else:
+            self.send_json({"error": "not found"}, 404)
+
+    def generate(self, request, agent, text, chat):
+        fake = self.fake
+        model = request.get("model", "")
+        stream = request.get("stream", True)
+        start = time.time()
+
+        load = fake.ensure_loaded(model)
+        if agent == "preload":
+            # Empty prompt: just load the model (what agents.llm.preload_model does)
+            return self.send_json({"model": model, "created_at": now(), "response": "", "done": True,
+                                   "done_reason": "load", "load_duration": ns(load), "total_duration": ns(time.time() - start)})
+
+        content = fake.respond(agent, text)
+        prompt_tokens = len(text.split()) + 50 # + template/system prompt
+        tokens = re.findall(r"\S+\s*", content) or [content]
+
+        with fake.slots:
+            prompt_seconds = fake.latency + prompt_tokens / fake.prompt_tokens_per_sec
+            time.sleep(prompt_seconds)
+            if stream:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+            eval_start = time.time()
+            for token in tokens:
+                time.sleep(1 / fake.tokens_per_sec)
+                if stream:
+                    piece = {"message": {"role": "assistant", "content": token}} if chat else {"response": token}
+                    self.send_chunk({"model": model, "created_at": now(), **piece, "done": False})
+            eval_seconds = time.time() - eval_start
+
+        final = {
+            "model": model, "created_at": now(), "done": True, "done_reason": "stop",
+            "total_duration": ns(time.time() - start), "load_duration": ns(load),
+            "prompt_eval_count": prompt_tokens, "prompt_eval_duration": ns(prompt_seconds),
+            "eval_count": len(tokens), "eval_duration": ns(eval_seconds),
+        }
+        if chat:
+            final["message"] = {"role": "assistant", "content": "" if stream else content}
+        else:
+            final["response"] = "" if stream else content
+
+        if stream:
+            self.send_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_json(final)
+
+def make_server(port=DEFAULT_PORT, host="127.0.0.1", **options):
+    """
+    Builds (but doesn't start) a fake server; options go to FakeOllama.
+    Use server.serve_forever() in a thread and server.shutdown() to stop.
+    """
+    fake = FakeOllama(**options)
+    server = ThreadingHTTPServer((host, port), type("FakeOllamaHandler", (Handler,), {"fake": fake}))
+    server.daemon_threads = True
+    server.fake = fake
+    return server
+
+def start_server(port=DEFAULT_PORT, **options):
+    # Background server for scripts/tests; server.fake.stats() has call/load counts
+    server = make_server(port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline benchmarks")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--latency_ms", type=float, default=0, help="Fixed overhead per request")
+    parser.add_argument("--tokens_per_sec", type=float, default=50, help="Generation speed")
+    parser.add_argument("--prompt_tokens_per_sec", type=float, default=2000, help="Prompt processing speed")
+    parser.add_argument("--load_ms", type=float, default=2000, help="Model load time when a model isn't resident")
+    parser.add_argument("--max_loaded", type=int, default=1, help="Models resident at once (OLLAMA_MAX_LOADED_MODELS)")
+    parser.add_argument("--parallel", type=int, default=4, help="Requests served at once (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--recorded", type=str, default=None, help="JSON {agent: [responses]} or a benchmark run log (.jsonl) to replay juror verdicts from")
+    args = parser.parse_args()
+
+    server = make_server(
+        args.port, args.host,
+        latency=args.latency_ms / 1000, tokens_per_sec=args.tokens_per_sec,
+        prompt_tokens_per_sec=args.prompt_tokens_per_sec, load_seconds=args.load_ms / 1000,
+        max_loaded=args.max_loaded, parallel=args.parallel,
+        recorded=load_recorded(args.recorded) if args.recorded else None,
+    )
+    print(f"Fake Ollama listening on http://{args.host}:{args.port} (set OLLAMA_HOST to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
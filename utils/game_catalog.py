@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Add project root to path so `python utils/game_catalog.py` resolves utils.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.build_context import GAMES_PATH
+from utils.context_store import CONTEXT_DB
+from utils.game_index import get_game_index
+from utils.game_store import DATA_PATH
+
+# Path Setup
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_PATH = os.path.join(BASE_DIR, 'game_catalog.npz')
+CATALOG_VERSION = 2 # Bump when build_catalog changes, so old catalogs get rebuilt
+
+# One row per game that has a box score, as int columns in a single .npz.
+# Built from games.csv (season, date, teams), the GAME_ID (game type, playoff
+# round and game number) and the context snapshots (stakes).
+GAME_TYPES = {1: "preseason", 2: "regular", 4: "playoff", 5: "play_in"}
+STAKES = {0: "none", 1: "elimination", 2: "clincher"}
+ROUNDS = {0: "none", 1: "first_round", 2: "conf_semis", 3: "conf_finals", 4: "finals"}
+COLUMNS = ("game_id", "season", "date", "game_type", "round", "game_number", "stakes", "home", "visitor")
+LABELS = {"game_type": GAME_TYPES, "stakes": STAKES, "round": ROUNDS}
+
+def snapshot_stakes(path=CONTEXT_DB):
+    # {game_id: stakes code} from every snapshot with a stakes line, in one query
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    rows = conn.execute("SELECT game_id, snapshot FROM snapshots WHERE snapshot LIKE '%\"stakes\": \"_%'").fetchall()
+    conn.close()
+    stakes = {}
+    for game_id, snapshot in rows:
+        text = json.loads(snapshot).get("stakes") or ""
+        if "CLINCHING" in text:
+            stakes[int(game_id)] = 2
+        elif "ELIMINATION" in text:
+            stakes[int(game_id)] = 1
+    return stakes
+
+def build_catalog(games_path=GAMES_PATH):
+    """
+    {column: array} for every game in games.csv that the game index has a box score for.
+    """
+    index = get_game_index()
+    df = pd.read_csv(games_path, usecols=['GAME_DATE_EST', 'GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID', 'SEASON'])
+    df = df.drop_duplicates('GAME_ID')
+    if index is not None:
+        df = df[df['GAME_ID'].isin(list(index.games))]
+    df = df.sort_values('GAME_ID')
+
+    ids = df['GAME_ID'].astype(str)
+    game_type = ids.str[0].astype(np.int8).to_numpy()
+    playoff = game_type == 4
+    # Playoff IDs are 4YY00RSG: R = round, G = game of the series
+    round_num = np.where(playoff, pd.to_numeric(ids.str[5], errors='coerce').fillna(0), 0).astype(np.int8)
+    game_number = np.where(playoff, pd.to_numeric(ids.str[-1], errors='coerce').fillna(0), 0).astype(np.int8)
+
+    stakes = snapshot_stakes()
+    game_ids = df['GAME_ID'].to_numpy(dtype=np.int64)
+    return {
+        "game_id": game_ids,
+        "season": df['SEASON'].to_numpy(dtype=np.int16),
+        "date": pd.to_datetime(df['GAME_DATE_EST']).dt.strftime('%Y%m%d').astype(np.int32).to_numpy(),
+        "game_type": game_type,
+        "round": round_num,
+        "game_number": game_number,
+        "stakes": np.array([stakes.get(g, 0) for g in game_ids.tolist()], dtype=np.int8),
+        "home": df['HOME_TEAM_ID'].to_numpy(dtype=np.int64),
+        "visitor": df['VISITOR_TEAM_ID'].to_numpy(dtype=np.int64),
+    }
+
+def code_of(column, value):
+    # "playoff" -> 4, "elimination" -> 1, 2018 -> 2018
+    if isinstance(value, str) and column in LABELS:
+        for code, label in LABELS[column].items():
+            if label == value:
+                return code
+        raise ValueError(f"Unknown {column} '{value}' (expected one of {list(LABELS[column].values())})")
+    return int(value)
+
+class GameCatalog:
+    """
+    Sampling over the catalog columns. Everything is a vectorized mask or
+    group-by over a few thousand ints, so a sample costs microseconds.
+    """
+
+    def __init__(self, columns):
+        self.columns = {name: np.asarray(columns[name]) for name in COLUMNS}
+
+    def __len__(self):
+        return len(self.columns["game_id"])
+
+    def mask(self, **filters):
+        """
+        Rows matching every filter; a filter value may be a list. game_type
+        also takes 'all' and 'high_stakes' is shorthand for stakes > 0.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        for column, value in filters.items():
+            if value is None or (column == "game_type" and value == "all"):
+                continue
+            if column == "high_stakes":
+                keep &= (self.columns["stakes"] > 0) == bool(value)
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            keep &= np.isin(self.columns[column], [code_of(column, v) for v in values])
+        return keep
+
+    def sample(self, n, seed=None, by=(), weights=None, **filters):
+        """
+        n game ids (str) without replacement, reproducible for a given seed.
+
+        by: columns to stratify across. Each stratum gets a share of n
+        proportional to its games times its weight (largest remainder), and
+        at least one game while n allows.
+        weights: {column: {value: weight}}, e.g. {"stakes": {"elimination": 3,
+        "clincher": 3}} to over-sample high-stakes games. Without `by`, the
+        weights make it a weighted draw instead.
+        """
+        rng = np.random.default_rng(seed)
+        rows = np.flatnonzero(self.mask(**filters))
+        if n >= len(rows):
+            return [str(g) for g in self.columns["game_id"][rows[rng.permutation(len(rows))]].tolist()]
+
+        row_weight = np.ones(len(rows))
+        for column, values in (weights or {}).items():
+            for value, weight in values.items():
+                row_weight[self.columns[column][rows] == code_of(column, value)] *= weight
+
+        if not by:
+            p = row_weight / row_weight.sum()
+            picked = rng.choice(rows, size=n, replace=False, p=p)
+            return [str(g) for g in self.columns["game_id"][picked].tolist()]
+
+        # Strata: one int key per combination of the `by` columns
+        keys = np.zeros(len(rows), dtype=np.int64)
+        for column in by:
+            codes, _ = pd.factorize(self.columns[column][rows])
+            keys = keys * (codes.max() + 1) + codes
+        strata, inverse = np.unique(keys, return_inverse=True)
+        sizes = np.bincount(inverse)
+        share = np.bincount(inverse, weights=row_weight)
+        quota = share / share.sum() * n
+
+        # Largest remainder, at least one per stratum while n allows, never more than a stratum holds
+        alloc = np.minimum(np.floor(quota).astype(np.int64), sizes)
+        if n >= len(strata):
+            alloc = np.maximum(alloc, 1)
+        while alloc.sum() > n:
+            alloc[np.argmax(alloc - quota)] -= 1
+        while alloc.sum() < n:
+            room = np.where(alloc < sizes, quota - alloc, -np.inf)
+            alloc[np.argmax(room)] += 1
+
+        picked = []
+        for s, count in enumerate(alloc.tolist()):
+            if count:
+                members = rows[inverse == s]
+                picked.append(rng.choice(members, size=count, replace=False))
+        picked = np.concatenate(picked)
+        rng.shuffle(picked)
+        return [str(g) for g in self.columns["game_id"][picked].tolist()]
+
+    def describe(self, game_ids):
+        # {column: {label: count}} over a sample, to check its mix
+        rows = np.flatnonzero(np.isin(self.columns["game_id"], [int(g) for g in game_ids]))
+        summary = {}
+        for column in ("season", "game_type", "round", "stakes"):
+            values, counts = np.unique(self.columns[column][rows], return_counts=True)
+            labels = LABELS.get(column, {})
+            summary[column] = {str(labels.get(v, v)): c for v, c in zip(values.tolist(), counts.tolist())}
+        return summary
+
+def save_catalog(columns, path=CATALOG_PATH):
+    # np.savez appends .npz, so write to a temp name that already has it, then swap
+    tmp = path[:-len(".npz")] + ".tmp.npz"
+    np.savez(tmp, version=CATALOG_VERSION, **columns)
+    os.replace(tmp, path)
+
+def catalog_is_stale(path=CATALOG_PATH):
+    # Rebuilt when built by an older build_catalog, or when games.csv, the box
+    # scores (they decide which games are in it) or the context snapshots are newer
+    if not os.path.exists(path):
+        return True
+    with np.load(path) as data:
+        if "version" not in data or int(data["version"]) != CATALOG_VERSION:
+            return True
+    built = os.path.getmtime(path)
+    return any(os.path.exists(p) and os.path.getmtime(p) > built for p in (GAMES_PATH, DATA_PATH, CONTEXT_DB))
+
+_CATALOG = None
+_CATALOG_LOCK = threading.Lock()
+
+def get_game_catalog():
+    """
+    Returns the process-wide GameCatalog: loads game_catalog.npz, (re)building
+    it first if it's missing or older than its sources.
+    Returns None if games.csv isn't available.
+    """
+    global _CATALOG
+    if _CATALOG is not None:
+        return _CATALOG
+
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            start = time.time()
+            if catalog_is_stale():
+                if not os.path.exists(GAMES_PATH):
+                    return None
+                save_catalog(build_catalog())
+                print(f"Game catalog built: {CATALOG_PATH}")
+            with np.load(CATALOG_PATH) as data:
+                _CATALOG = GameCatalog({name: data[name] for name in COLUMNS})
+            print(f"Game catalog loaded: {len(_CATALOG)} games in {time.time() - start:.2f}s")
+    return _CATALOG
+
+def parse_weights(text):
+    # "stakes:elimination=3,stakes:clincher=3" -> {"stakes": {"elimination": 3.0, "clincher": 3.0}}
+    weights = {}
+    for part in filter(None, (text or "").split(",")):
+        key, weight = part.split("=")
+        column, value = key.split(":")
+        weights.setdefault(column, {})[value] = float(weight)
+    return weights
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the game catalog and try out stratified samples")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild game_catalog.npz from games.csv and the context snapshots")
+    parser.add_argument("--sample", type=int, default=0, help="Draw a sample of this many games and show its mix")
+    parser.add_argument("--type", type=str, default="all", choices=["all", "regular", "playoff"], help="Game Type filter")
+    parser.add_argument("--stratify", type=str, default="", help="Comma-separated columns, e.g. season,round")
+    parser.add_argument("--weights", type=str, default="", help="e.g. stakes:elimination=3,stakes:clincher=3")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(CATALOG_PATH):
+        os.remove(CATALOG_PATH)
+    catalog = get_game_catalog()
+    if catalog is None:
+        print(f"Error: {GAMES_PATH} not found.")
+    else:
+        print(catalog.describe(catalog.columns["game_id"].tolist()))
+        if args.sample:
+            by = tuple(filter(None, args.stratify.split(",")))
+            ids = catalog.sample(args.sample, args.seed, by=by, weights=parse_weights(args.weights), game_type=args.type)
+            print(f"Sample: {ids}")
+            print(catalog.describe(ids))
@@ -0,0 +1,188 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+# Add project root to path so `python utils/game_index.py` resolves utils.*
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.game_store import DATA_PATH, store_exists, open_store, load_columns
+
+class GameIndex:
+    """
+    Resident, read-only box score index. Built once per process.
+
+    Rows are regrouped so that every (game, team) is a contiguous slice,
+    teams in order of first appearance and players by points (desc), so
+    a lookup is a dict hit plus slicing the top 3 rows.
+    """
+
+    def __init__(self, game_ids, offsets, columns, vocab):
+        game_idx = np.repeat(np.arange(len(game_ids)), np.diff(offsets))
+        team = columns['team'].astype(np.int64)
+
+        # Rank teams within a game by the row where they first appear
+        pair = game_idx * (len(vocab['teams']) + 1) + (team + 1)
+        _, first_row, inverse = np.unique(pair, return_index=True, return_inverse=True)
+        team_rank = first_row[inverse]
+
+        # lexsort is stable: last key is primary
+        order = np.lexsort((-columns['pts'].astype(np.int32), team_rank))
+        self.team = np.ascontiguousarray(columns['team'][order])
+        self.player = np.ascontiguousarray(columns['player'][order])
+        self.pts = np.ascontiguousarray(columns['pts'][order])
+        self.reb = np.ascontiguousarray(columns['reb'][order])
+        self.ast = np.ascontiguousarray(columns['ast'][order])
+
+        # Categorical names
+        self.teams = list(vocab['teams'])
+        self.players = list(vocab['players'])
+
+        # GAME_ID -> ((team_code, start, end), ...) in first-appearance order
+        sorted_game = game_idx[order]
+        sorted_team = self.team.astype(np.int64)
+        bounds = np.flatnonzero(
+            (np.diff(sorted_game) != 0) | (np.diff(sorted_team) != 0)
+        ) + 1
+        starts = np.concatenate(([0], bounds)).tolist() if len(order) else []
+        ends = np.concatenate((bounds, [len(order)])).tolist() if len(order) else []
+
+        self.games = {}
+        ids = game_ids.tolist()
+        for s, e in zip(starts, ends):
+            gid = ids[sorted_game[s]]
+            slices = self.games.setdefault(gid, [])
+            if self.team[s] >= 0: # Skip rows with no team abbreviation
+                slices.append((int(self.team[s]), s, e))
+        for gid in ids:
+            self.games[gid] = tuple(self.games.get(gid, ()))
+
+    @classmethod
+    def from_store(cls):
+        store = open_store(mmap_mode=None)
+        return cls(store['game_ids'], store['offsets'], store['columns'], store['vocab'])
+
+    @classmethod
+    def from_csv(cls, csv_path=DATA_PATH):
+        return cls(*load_columns(csv_path))
+
+    def __contains__(self, game_id):
+        try:
+            return int(game_id) in self.games
+        except (TypeError, ValueError):
+            return False
+
+    def team_parts(self, game_id):
+        """
+        Returns [(team, total_pts, [(player, pts, reb, ast), ...top 3]), ...]
+        for every team in the game, or None if the game is unknown.
+        """
+        try:
+            slices = self.games.get(int(game_id))
+        except (TypeError, ValueError):
+            return None
+        if slices is None:
+            return None
+
+        parts = []
+        for team_code, start, end in slices:
+            top = [
+                (self.players[p], pts, reb, ast)
+                for p, pts, reb, ast in zip(
+                    self.player[start:start + 3].tolist(),
+                    self.pts[start:start + 3].tolist(),
+                    self.reb[start:start + 3].tolist(),
+                    self.ast[start:start + 3].tolist(),
+                )
+            ]
+            parts.append((self.teams[team_code], int(self.pts[start:end].sum()), top))
+        return parts
+
+    def team_parts_many(self, game_ids):
+        """
+        team_parts for a batch: {game_id: parts or None}. Totals and top-3
+        rows for every (game, team) slice are gathered in one numpy pass.
+        """
+        slices, owners = [], []
+        parts = {}
+        for gid in game_ids:
+            try:
+                found = self.games.get(int(gid))
+            except (TypeError, ValueError):
+                found = None
+            parts[gid] = None if found is None else []
+            for s in found or ():
+                slices.append(s)
+                owners.append(gid)
+        if not slices:
+            return parts
+
+        team_code, starts, ends = (np.array(c, dtype=np.int64) for c in zip(*slices))
+        csum = np.concatenate(([0], np.cumsum(self.pts, dtype=np.int64)))
+        totals = (csum[ends] - csum[starts]).tolist()
+
+        # Top 3 rows of each slice (rows are already points-desc within a slice)
+        rows = starts[:, None] + np.arange(3)
+        valid = rows < ends[:, None]
+        rows = np.where(valid, rows, starts[:, None])
+        player, pts, reb, ast = (col[rows].tolist() for col in (self.player, self.pts, self.reb, self.ast))
+        counts = valid.sum(axis=1).tolist()
+
+        for i, (gid, team) in enumerate(zip(owners, team_code.tolist())):
+            top = [(self.players[player[i][k]], pts[i][k], reb[i][k], ast[i][k]) for k in range(counts[i])]
+            parts[gid].append((self.teams[team], totals[i], top))
+        return parts
+
+    def memory_usage(self):
+        """
+        Approximate resident size in bytes, so we can size API workers.
+        """
+        arrays = sum(a.nbytes for a in (self.team, self.player, self.pts, self.reb, self.ast))
+        index = sys.getsizeof(self.games) + sum(
+            sys.getsizeof(gid) + sys.getsizeof(slices) + sum(sys.getsizeof(s) for s in slices)
+            for gid, slices in self.games.items()
+        )
+        vocab = sum(sys.getsizeof(v) for v in self.teams + self.players) \
+            + sys.getsizeof(self.teams) + sys.getsizeof(self.players)
+        return {
+            "games": len(self.games),
+            "rows": int(len(self.team)),
+            "arrays_bytes": int(arrays),
+            "index_bytes": int(index),
+            "vocab_bytes": int(vocab),
+            "total_bytes": int(arrays + index + vocab),
+        }
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+def get_game_index():
+    """
+    Returns the process-wide GameIndex, building it on first use.
+    Prefers the binary game store; falls back to a single CSV parse.
+    Returns None if no dataset is available.
+    """
+    global _INDEX
+    if _INDEX is not None:
+        return _INDEX
+
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            start = time.time()
+            if store_exists():
+                _INDEX = GameIndex.from_store()
+            elif os.path.exists(DATA_PATH):
+                _INDEX = GameIndex.from_csv()
+            else:
+                return None
+            mem = _INDEX.memory_usage()
+            print(f"Game index loaded: {mem['games']} games, {mem['total_bytes'] / 1e6:.1f} MB in {time.time() - start:.2f}s")
+    return _INDEX
+
+if __name__ == "__main__":
+    index = get_game_index()
+    if index is None:
+        print(f"Error: Dataset not found at {DATA_PATH}")
+    else:
+        print(index.memory_usage())
@@ -0,0 +1,118 @@
+import json
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# Path Setup
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_DIR, '..', 'data', 'archive', 'games_details.csv')
+STORE_DIR = os.path.join(BASE_DIR, 'game_store')
+
+# Columnar layout: one .npy file per column, all sorted by GAME_ID.
+# Team/player names are stored as int codes into vocab.json (categoricals).
+COLUMNS = {
+    'team': np.int16,    # index into vocab['teams'], -1 if missing
+    'player': np.int32,  # index into vocab['players']
+    'pts': np.int16,
+    'reb': np.int16,
+    'ast': np.int16,
+}
+
+def load_columns(csv_path=DATA_PATH):
+    """
+    Reads the box score columns we need from games_details.csv and returns
+    typed arrays sorted by GAME_ID (original row order kept within a game).
+    """
+    df = pd.read_csv(
+        csv_path,
+        usecols=['GAME_ID', 'TEAM_ABBREVIATION', 'PLAYER_NAME', 'PTS', 'REB', 'AST'],
+        low_memory=False
+    )
+    df = df.sort_values('GAME_ID', kind='stable')
+
+    team_codes, teams = pd.factorize(df['TEAM_ABBREVIATION'])
+    player_codes, players = pd.factorize(df['PLAYER_NAME'].fillna('Unknown'))
+
+    game_ids, offsets = np.unique(df['GAME_ID'].to_numpy(dtype=np.int64), return_index=True)
+    offsets = np.append(offsets, len(df)).astype(np.int64)
+
+    columns = {
+        'team': team_codes,
+        'player': player_codes,
+        'pts': df['PTS'].fillna(0).to_numpy(),
+        'reb': df['REB'].fillna(0).to_numpy(),
+        'ast': df['AST'].fillna(0).to_numpy(),
+    }
+    columns = {k: np.asarray(v).astype(COLUMNS[k]) for k, v in columns.items()}
+    vocab = {'teams': [str(t) for t in teams], 'players': [str(p) for p in players]}
+    return game_ids, offsets, columns, vocab
+
+def ingest(csv_path=DATA_PATH, store_dir=STORE_DIR):
+    """
+    One-off ETL: converts games_details.csv into the indexed binary store.
+    """
+    if not os.path.exists(csv_path):
+        print(f"Error: {csv_path} not found.")
+        return
+
+    print(f"Loading {csv_path}...")
+    game_ids, offsets, columns, vocab = load_columns(csv_path)
+
+    if not os.path.exists(store_dir):
+        os.makedirs(store_dir)
+
+    print(f"Writing {int(offsets[-1])} rows ({len(game_ids)} games) to {store_dir}...")
+    np.save(os.path.join(store_dir, 'game_ids.npy'), game_ids)
+    np.save(os.path.join(store_dir, 'offsets.npy'), offsets)
+    for name, values in columns.items():
+        np.save(os.path.join(store_dir, f"{name}.npy"), values)
+    with open(os.path.join(store_dir, 'vocab.json'), 'w') as f:
+        json.dump(vocab, f)
+
+    print(f"Game store build complete. {len(game_ids)} games indexed.")
+
+def store_exists(store_dir=STORE_DIR):
+    return os.path.exists(os.path.join(store_dir, 'vocab.json'))
+
+def open_store(store_dir=STORE_DIR, mmap_mode='r'):
+    """
+    Opens the store. With mmap_mode='r' nothing but the vocab is read up front;
+    column pages are only touched when a game's rows are sliced.
+    """
+    store = {
+        'game_ids': np.load(os.path.join(store_dir, 'game_ids.npy'), mmap_mode=mmap_mode),
+        'offsets': np.load(os.path.join(store_dir, 'offsets.npy'), mmap_mode=mmap_mode),
+        'columns': {
+            name: np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in COLUMNS
+        },
+    }
+    with open(os.path.join(store_dir, 'vocab.json'), 'r') as f:
+        store['vocab'] = json.load(f)
+    return store
+
+def read_game(store, game_id):
+    """
+    Returns {column: array} for a single game's rows, or None if absent.
+    Binary search on the sorted GAME_ID index, then a contiguous slice.
+    """
+    try:
+        gid = int(game_id)
+    except (TypeError, ValueError):
+        return None
+
+    game_ids = store['game_ids']
+    pos = int(np.searchsorted(game_ids, gid))
+    if pos >= len(game_ids) or game_ids[pos] != gid:
+        return None
+
+    start, end = int(store['offsets'][pos]), int(store['offsets'][pos + 1])
+    return {name: np.asarray(col[start:end]) for name, col in store['columns'].items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the indexed binary game store from games_details.csv")
+    parser.add_argument("--csv", type=str, default=DATA_PATH, help="Path to games_details.csv")
+    parser.add_argument("--out", type=str, default=STORE_DIR, help="Output store directory")
+    args = parser.parse_args()
+    ingest(args.csv, args.out)
@@ -0,0 +1,287 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Path Setup
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOBS_DB = os.path.join(BASE_DIR, 'jobs.db')
+
+# Evaluation jobs: submitted by POST /evaluate, worked off by a single
+# in-process worker, persisted so an API restart resumes where it stopped.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,          -- queued | running | done | cancelled | failed
+    params TEXT NOT NULL,          -- request + the sampled game_ids
+    total INTEGER NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    error TEXT,
+    metrics TEXT                   -- job-level metrics (waves: model loads and schedule), summed over resumes
+);
+CREATE TABLE IF NOT EXISTS job_runs (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,          -- position in the job's run plan
+    outcome TEXT NOT NULL,         -- done | skipped | error
+    result TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+_conn = None
+_lock = threading.Lock()
+
+def _db():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(JOBS_DB, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        _conn.executescript(SCHEMA)
+        # jobs.db files from before the metrics column
+        if "metrics" not in [c["name"] for c in _conn.execute("PRAGMA table_info(jobs)")]:
+            _conn.execute("ALTER TABLE jobs ADD COLUMN metrics TEXT")
+    return _conn
+
+def run_plan(params):
+    # Every (game_id, iteration) the job has to run, in order
+    return [(gid, i + 1) for gid in params["game_ids"] for i in range(params["iterations"])]
+
+def submit_job(params):
+    """
+    Queues a job. params must include game_ids and iterations.
+    Returns the job id.
+    """
+    job_id = uuid.uuid4().hex[:12]
+    with _lock, _db():
+        _db().execute(
+            "INSERT INTO jobs (job_id, status, params, total, created) VALUES (?, 'queued', ?, ?, ?)",
+            (job_id, json.dumps(params), len(run_plan(params)), time.time())
+        )
+    _wakeup_worker()
+    return job_id
+
+def get_job(job_id):
+    """
+    Job status and progress, or None if unknown.
+    """
+    with _lock:
+        row = _db().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        done, total_runs, durations = _db().execute(
+            "SELECT COUNT(*), COALESCE(SUM(outcome = 'done'), 0), COALESCE(SUM(json_extract(result, '$.duration')), 0) "
+            "FROM job_runs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+    params = json.loads(row["params"])
+    return {
+        "job_id": job_id,
+        "status": row["status"],
+        "params": params,
+        "games_processed": params["game_ids"],
+        "total": row["total"],
+        "done": done,
+        "progress_pct": done / row["total"] * 100 if row["total"] else 100.0,
+        "created": row["created"],
+        "started": row["started"],
+        "finished": row["finished"],
+        "total_runs": total_runs,
+        "total_duration": durations,
+        "error": row["error"],
+        "metrics": json.loads(row["metrics"]) if row["metrics"] else {},
+    }
+
+def get_results(job_id, since=0):
+    """
+    Finished run results in plan order, starting after the first `since` runs.
+    """
+    with _lock:
+        rows = _db().execute(
+            "SELECT seq, result FROM job_runs WHERE job_id = ? AND seq >= ? AND outcome = 'done' ORDER BY seq",
+            (job_id, since)
+        ).fetchall()
+    return [json.loads(r["result"]) for r in rows]
+
+def cancel_job(job_id):
+    """
+    Cancels a queued or running job. Returns False if it had already ended.
+    """
+    with _lock, _db():
+        cur = _db().execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE job_id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)
+        )
+    task = _current.get(job_id)
+    if task is not None:
+        task.cancel()
+    return cur.rowcount > 0
+
+def recover_jobs():
+    """
+    Called at startup: jobs that were running when the API stopped go back
+    to the queue. Their finished runs are kept and not re-run.
+    """
+    with _lock, _db():
+        return _db().execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'").rowcount
+
+def _next_job():
+    with _lock:
+        row = _db().execute(
+            "SELECT job_id, params FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+        ).fetchone()
+    return (row["job_id"], json.loads(row["params"])) if row else (None, None)
+
+def _set_status(job_id, status, **fields):
+    columns = ", ".join(f"{k} = ?" for k in fields)
+    with _lock, _db():
+        _db().execute(
+            f"UPDATE jobs SET status = ?{', ' + columns if columns else ''} WHERE job_id = ? AND status != 'cancelled'",
+            (status, *fields.values(), job_id)
+        )
+
+def add_up(total, more):
+    """
+    Merges a resumed session's metrics into the job's: numbers are summed,
+    dicts merged, lists extended. Averages (avg_*) can't be summed, so the
+    newest session's is kept.
+    """
+    if isinstance(total, dict) and isinstance(more, dict):
+        merged = dict(total)
+        for key, value in more.items():
+            merged[key] = value if key not in total or key.startswith("avg_") else add_up(total[key], value)
+        return merged
+    if isinstance(total, list) and isinstance(more, list):
+        return total + more
+    if isinstance(total, (int, float)) and isinstance(more, (int, float)) and not isinstance(more, bool):
+        return total + more
+    return more
+
+def _add_metrics(job_id, metrics):
+    with _lock, _db():
+        row = _db().execute("SELECT metrics FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        total = add_up(json.loads(row["metrics"]), metrics) if row["metrics"] else metrics
+        _db().execute("UPDATE jobs SET metrics = ? WHERE job_id = ?", (json.dumps(total), job_id))
+
+def _status(job_id):
+    with _lock:
+        return _db().execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()["status"]
+
+def _completed_seqs(job_id):
+    with _lock:
+        return {r["seq"] for r in _db().execute("SELECT seq FROM job_runs WHERE job_id = ?", (job_id,))}
+
+def _record(job_id, seq, outcome, result=None):
+    with _lock, _db():
+        _db().execute(
+            "INSERT OR REPLACE INTO job_runs (job_id, seq, outcome, result) VALUES (?, ?, ?, ?)",
+            (job_id, seq, outcome, json.dumps(result) if result is not None else None)
+        )
+
+# Worker state (one worker per API process)
+_current = {}   # job_id -> asyncio.Task of the run in progress
+_wakeup = None
+
+def _wakeup_worker():
+    if _wakeup is not None:
+        _wakeup.set()
+
+async def run_worker(evaluate_run, evaluate_waves=None, load_stats=None, poll_seconds=5):
+    """
+    Works off queued jobs one at a time. evaluate_run(game_id, iteration, stats)
+    is a coroutine that returns a result dict, or None if the game has to be
+    skipped; runs go one after another so the GPU is not oversubscribed.
+
+    Jobs submitted with schedule="waves" are instead handed whole to
+    evaluate_waves(runs, record, stats), runs being [(seq, game_id, iteration)],
+    which must call record(seq, outcome, result) as each run finishes. It may
+    return a dict of job-level metrics, which GET /evaluate/{job_id} reports.
+
+    load_stats(game_ids), if given, is called once per job (in a thread) for
+    every game the job still has to run; whatever it returns is passed on as
+    `stats`. Without it, stats is None and the evaluators load per run.
+    """
+    global _wakeup
+    _wakeup = asyncio.Event()
+    resumed = recover_jobs()
+    if resumed:
+        print(f"Resuming {resumed} evaluation job(s)")
+
+    while True:
+        job_id, params = _next_job()
+        if job_id is None:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        _set_status(job_id, "running", started=time.time())
+        completed = _completed_seqs(job_id)
+        try:
+            pending = [(seq, gid, it) for seq, (gid, it) in enumerate(run_plan(params)) if seq not in completed]
+            stats = None
+            if load_stats is not None and pending:
+                stats = await asyncio.to_thread(load_stats, list(dict.fromkeys(gid for _, gid, _ in pending)))
+            if params.get("schedule") == "waves" and evaluate_waves is not None:
+                finished = await _run_waves(job_id, pending, stats, evaluate_waves)
+            else:
+                finished = await _run_sequential(job_id, pending, stats, evaluate_run)
+            if finished:
+                _set_status(job_id, "done", finished=time.time())
+        except asyncio.CancelledError:
+            # API shutting down: leave the job 'running' so recover_jobs() requeues it
+            raise
+        except Exception as e:
+            _set_status(job_id, "failed", finished=time.time(), error=str(e))
+
+CANCELLED = object()
+
+async def _run_cancellable(job_id, coro):
+    # Runs coro as the job's current task. CANCELLED if DELETE /evaluate stopped it.
+    task = asyncio.create_task(coro)
+    _current[job_id] = task
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if _status(job_id) == "cancelled":
+            return CANCELLED
+        raise # Worker itself is shutting down
+    finally:
+        _current.pop(job_id, None)
+
+async def _run_sequential(job_id, pending, stats, evaluate_run):
+    for seq, game_id, iteration in pending:
+        if _status(job_id) == "cancelled":
+            return False
+
+        try:
+            result = await _run_cancellable(job_id, evaluate_run(game_id, iteration, stats))
+        except Exception as e:
+            print(f"Eval Error {game_id}: {e}")
+            _record(job_id, seq, "error", {"game_id": game_id, "iteration": iteration, "error": str(e)})
+            continue
+        if result is CANCELLED:
+            return False
+
+        if result is None:
+            _record(job_id, seq, "skipped")
+        else:
+            _record(job_id, seq, "done", result)
+    return True
+
+async def _run_waves(job_id, runs, stats, evaluate_waves):
+    def record(seq, outcome, result=None):
+        _record(job_id, seq, outcome, result)
+
+    metrics = await _run_cancellable(job_id, evaluate_waves(runs, record, stats))
+    if metrics is CANCELLED:
+        return False
+    if metrics:
+        _add_metrics(job_id, metrics)
+    return True
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+# Path Setup
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DB = os.path.join(BASE_DIR, 'llm_cache.db')
+
+# Off unless LLM_CACHE=1 (or enable_cache() is called before the first chain is built)
+CACHE_ENABLED = os.getenv("LLM_CACHE", "0") == "1"
+CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+CACHE_MAX_AGE_DAYS = float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+class ResponseCache(BaseCache):
+    """
+    Content-addressed LLM response cache in SQLite.
+
+    Key = sha256 of LangChain's llm_string (model, temperature and the other
+    call options) plus the rendered prompt. Entries older than max_age_days
+    are dropped; past max_mb the least recently used entries go first.
+    """
+
+    def __init__(self, path=CACHE_DB, max_mb=CACHE_MAX_MB, max_age_days=CACHE_MAX_AGE_DAYS):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def key(prompt, llm_string):
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt, llm_string):
+        key = self.key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?", (key, now - self.max_age)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return [from_record(r) for r in json.loads(row[0])]
+
+    def update(self, prompt, llm_string, return_val):
+        response = json.dumps([to_record(g) for g in return_val])
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (self.key(prompt, llm_string), response, len(response), now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        # Age first, then least recently used until we're under the size cap
+        expired = self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.max_age,)).rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        dropped = 0
+        if total > self.max_bytes:
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                dropped += 1
+        self.evictions += expired + dropped
+
+    def clear(self, **kwargs):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_pct": self.hits / lookups * 100 if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_mb": size / 1024 / 1024,
+        }
+
+# Ollama timings describe the original call, not a cache hit (load_duration would read as a model load)
+TIMING_KEYS = ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")
+
+def to_record(generation):
+    if isinstance(generation, ChatGeneration):
+        message = generation.message
+        metadata = {k: v for k, v in message.response_metadata.items() if k not in TIMING_KEYS}
+        return {"content": message.content, "response_metadata": metadata}
+    return {"text": generation.text}
+
+def from_record(record):
+    if "content" in record:
+        return ChatGeneration(message=AIMessage(content=record["content"], response_metadata=record["response_metadata"]))
+    return Generation(text=record["text"])
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def enable_cache():
+    global CACHE_ENABLED
+    CACHE_ENABLED = True
+
+def get_response_cache():
+    """
+    Process-wide ResponseCache, or None when caching is off.
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+def cache_report():
+    return _cache.stats() if _cache is not None else None
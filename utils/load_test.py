@@ -0,0 +1,267 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+import httpx
+
+# Add project root to path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_loader import get_random_game_ids
+from utils.metrics import percentile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def game_picker(game_ids, mix, seed):
+    """
+    Returns a function that picks the next game id.
+    uniform: every game equally likely. hot: 80% of requests go to 20% of games.
+    """
+    rng = random.Random(seed)
+    hot = game_ids[:max(1, len(game_ids) // 5)]
+    if mix == "hot":
+        return lambda: rng.choice(hot) if rng.random() < 0.8 else rng.choice(game_ids)
+    return lambda: rng.choice(game_ids)
+
+async def call_draft(client, game_id):
+    r = await client.post("/draft", json={"game_id": game_id})
+    return r.status_code
+
+async def call_draft_stream(client, game_id):
+    # Done when the final (or error) event arrives
+    async with client.stream("GET", "/draft/stream", params={"game_id": game_id}) as r:
+        if r.status_code != 200:
+            return r.status_code
+        async for line in r.aiter_lines():
+            if line.startswith("event: error"):
+                return 599
+            if line.startswith("event: final"):
+                return 200
+    return 599
+
+async def call_evaluate(client, game_id, poll_seconds=0.5):
+    # One single-game job for the picked game, timed from submission until the worker finishes it
+    r = await client.post("/evaluate", json={"game_ids": [game_id], "iterations": 1})
+    if r.status_code != 200:
+        return r.status_code
+    job_id = r.json()["job_id"]
+    while True:
+        await asyncio.sleep(poll_seconds)
+        job = (await client.get(f"/evaluate/{job_id}")).json()
+        if job["status"] == "done":
+            # A job whose run errored or was skipped still ends 'done'
+            return 200 if job["total_runs"] == job["total"] else 599
+        if job["status"] in ("failed", "cancelled"):
+            return 599
+
+ENDPOINTS = {"draft": call_draft, "draft_stream": call_draft_stream, "evaluate": call_evaluate}
+
+async def probe_health(client, stop, samples, interval=0.25):
+    # /health latency while the load runs: a slow probe means the event loop is blocked
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/health")
+            samples.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+async def run_level(args, client, pick, concurrency):
+    """
+    One load level. Closed loop (default): `concurrency` workers back to back.
+    Open loop (--rate): Poisson arrivals at `rate` req/s, at most `concurrency`
+    in flight; latency counts from the arrival, so queueing is included.
+    """
+    call = ENDPOINTS[args.endpoint]
+    latencies, errors = [], Counter()
+    health = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe_health(client, stop, health)) if args.probe_health else None
+
+    async def one(arrival):
+        try:
+            status = await call(client, pick())
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if status == 200:
+            latencies.append(time.perf_counter() - arrival)
+        else:
+            errors[str(status)] += 1
+
+    start = time.perf_counter()
+    if args.rate:
+        slots = asyncio.Semaphore(concurrency)
+        rng = random.Random(args.seed)
+        tasks = []
+
+        async def limited(arrival):
+            async with slots:
+                await one(arrival)
+
+        for _ in range(args.requests):
+            tasks.append(asyncio.create_task(limited(time.perf_counter())))
+            await asyncio.sleep(rng.expovariate(args.rate))
+        await asyncio.gather(*tasks)
+    else:
+        remaining = iter(range(args.requests))
+
+        async def worker():
+            for _ in remaining:
+                await one(time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    stop.set()
+    if prober is not None:
+        await prober
+
+    latencies.sort()
+    health.sort()
+    total = len(latencies) + sum(errors.values())
+    return {
+        "concurrency": concurrency,
+        "rate": args.rate,
+        "requests": total,
+        "ok": len(latencies),
+        "error_rate_pct": sum(errors.values()) / total * 100 if total else 0.0,
+        "errors": dict(errors),
+        "wall_sec": wall,
+        "throughput_rps": len(latencies) / wall if wall > 0 else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": latencies[-1] if latencies else None,
+        "health_p50": percentile(health, 50),
+        "health_p99": percentile(health, 99),
+    }
+
+def fmt(seconds):
+    return f"{seconds:.2f}s" if seconds is not None else "-"
+
+def write_report(summary, filename):
+    config = summary["config"]
+    md = f"""# 🚦 SportsEdit-AI Load Test Report
+**Date**: {summary["timestamp"]}
+**Target**: `{config["base_url"]}` `{config["endpoint"]}` | {config["requests"]} requests per level | {"Open loop at " + str(config["rate"]) + " req/s" if config["rate"] else "Closed loop"} | Game mix: {config["mix"]} ({summary["games"]} games)
+
+## 1. Summary
+*   **Saturation Throughput**: {summary["saturation_rps"]:.2f} req/s ({summary["saturation_rps"] * 60:.1f} arts/min) at concurrency {summary["saturation_concurrency"]}
+
+## 2. Levels
+| Concurrency | OK | Error Rate | Throughput | p50 | p95 | p99 | Max | /health p99 |
+| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |
+"""
+    for lvl in summary["levels"]:
+        md += (f"| {lvl['concurrency']} | {lvl['ok']}/{lvl['requests']} | {lvl['error_rate_pct']:.1f}% | {lvl['throughput_rps']:.2f} req/s | "
+               f"{fmt(lvl['p50'])} | {fmt(lvl['p95'])} | {fmt(lvl['p99'])} | {fmt(lvl['max'])} | {fmt(lvl['health_p99'])} |\n")
+
+    errors = Counter()
+    for lvl in summary["levels"]:
+        errors.update(lvl["errors"])
+    if errors:
+        md += "\n## 3. Errors\n"
+        for status, count in errors.most_common():
+            md += f"*   **{count}x**: {status}\n"
+
+    report_path = filename.replace(".json", "_report.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(md)
+    print(f"Report Output: {report_path}")
+
+def launch_api(args):
+    """
+    Starts api.py (uvicorn) on --base_url's port; with --launch fake, also a
+    fake Ollama server that the API is pointed at. Returns the API process.
+    """
+    env = dict(os.environ)
+    if args.launch == "fake":
+        from utils.fake_ollama import start_server
+        start_server(args.fake_port, tokens_per_sec=args.fake_tokens_per_sec, load_seconds=args.fake_load_ms / 1000)
+        env["OLLAMA_HOST"] = f"http://127.0.0.1:{args.fake_port}"
+        print(f"Fake Ollama on {env['OLLAMA_HOST']}")
+    port = httpx.URL(args.base_url).port or 8000
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env
+    )
+
+async def wait_ready(client, timeout=300):
+    start = time.time()
+    while time.time() - start < timeout:
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(1)
+    return False
+
+async def main(args):
+    game_ids = get_random_game_ids(args.games, args.type, args.seed)
+    if not game_ids:
+        print("No games available to sample.")
+        return
+    pick = game_picker(game_ids, args.mix, args.seed)
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    api = launch_api(args) if args.launch != "none" else None
+    limits = httpx.Limits(max_connections=max(levels) + 4)
+    try:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+            if not await wait_ready(client):
+                print("API never became ready.")
+                return
+
+            results = []
+            for concurrency in levels:
+                print(f"Level: concurrency={concurrency}{f', rate={args.rate}/s' if args.rate else ''}, {args.requests} requests...")
+                level = await run_level(args, client, pick, concurrency)
+                results.append(level)
+                print(f"  > {level['throughput_rps']:.2f} req/s | p50 {fmt(level['p50'])} p95 {fmt(level['p95'])} p99 {fmt(level['p99'])} | errors {level['error_rate_pct']:.1f}%")
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait()
+
+    best = max(results, key=lambda l: l["throughput_rps"])
+    summary = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": vars(args),
+        "games": len(game_ids),
+        "saturation_rps": best["throughput_rps"],
+        "saturation_concurrency": best["concurrency"],
+        "levels": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Results saved to: {args.output}")
+    write_report(summary, args.output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SportsEdit-AI API Load Tester")
+    parser.add_argument("--base_url", type=str, default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", type=str, default="draft", choices=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=str, default="1,2,4,8", help="Comma-separated levels; each runs --requests requests")
+    parser.add_argument("--rate", type=float, default=None, help="Open loop: Poisson arrivals per second (concurrency caps in-flight requests)")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per level")
+    parser.add_argument("--games", type=int, default=50, help="Size of the game-id pool sampled from the dataset")
+    parser.add_argument("--type", type=str, default="all", choices=["all", "regular", "playoff"], help="Game Type filter")
+    parser.add_argument("--mix", type=str, default="uniform", choices=["uniform", "hot"], help="hot: 80%% of requests hit 20%% of the games")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="Per-request timeout (seconds)")
+    parser.add_argument("--probe_health", action="store_true", help="Also measure /health latency during the load")
+    parser.add_argument("--launch", type=str, default="none", choices=["none", "ollama", "fake"], help="Start api.py here (against real Ollama, or a fake one)")
+    parser.add_argument("--fake_port", type=int, default=11435)
+    parser.add_argument("--fake_tokens_per_sec", type=float, default=50)
+    parser.add_argument("--fake_load_ms", type=float, default=2000)
+    parser.add_argument("--output", type=str, default="load_test_results.json", help="Output JSON file path")
+
+    args = parser.parse_args()
+    asyncio.run(main(args))
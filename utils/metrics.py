@@ -0,0 +1,151 @@
+import bisect
+import threading
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Per-stage latency/token histograms, exported in Prometheus text format on
+# GET /metrics. Kept in-process (no prometheus_client dependency).
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+TPS_BUCKETS = (1, 2.5, 5, 10, 20, 40, 80, 160, 320)
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with label sets, like a Prometheus histogram.
+    """
+
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {} # label values -> [per-bucket counts..., count, sum] (cumulated on render)
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.setdefault(label_values, [0] * len(self.buckets) + [0, 0.0])
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            count = 0
+            for bound, in_bucket in zip(self.buckets, values):
+                count += in_bucket
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {values[-2]}')
+            lines.append(f"{self.name}_count{{{labels}}} {values[-2]}")
+            lines.append(f"{self.name}_sum{{{labels}}} {values[-1]}")
+        return "\n".join(lines)
+
+STAGE_SECONDS = Histogram("sportsedit_stage_seconds", "Wall time per pipeline stage", SECONDS_BUCKETS, ("stage",))
+STAGE_TOKENS = Histogram("sportsedit_stage_tokens", "Ollama prompt/completion tokens per stage", TOKEN_BUCKETS, ("stage", "kind"))
+STAGE_TPS = Histogram("sportsedit_stage_tokens_per_second", "Ollama generation speed per stage", TPS_BUCKETS, ("stage",))
+
+class UsageCapture(BaseCallbackHandler):
+    """
+    Sums token counts and generation time from Ollama's response metadata
+    (prompt_eval_count, eval_count, eval_duration) over the LLM calls of one stage.
+    """
+    run_inline = True
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.eval_seconds = 0.0
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                meta = (message.response_metadata if message is not None else None) or generation.generation_info or {}
+                self.prompt_tokens += meta.get("prompt_eval_count") or 0
+                self.completion_tokens += meta.get("eval_count") or 0
+                self.eval_seconds += (meta.get("eval_duration") or 0) / 1e9
+
+def usage_config(config, run_name=None):
+    """
+    Copy of a runnable config with a fresh UsageCapture attached (on top of
+    whatever callbacks the graph run already has). Returns (config, usage).
+    """
+    usage = UsageCapture()
+    config = dict(config or {})
+    callbacks = config.get("callbacks")
+    if callbacks is None:
+        callbacks = [usage]
+    elif isinstance(callbacks, list):
+        callbacks = callbacks + [usage]
+    else:
+        callbacks = callbacks.copy()
+        callbacks.add_handler(usage, inherit=True)
+    config["callbacks"] = callbacks
+    if run_name:
+        config["run_name"] = run_name
+    return config, usage
+
+def record_stage(stage, seconds, usage=None, revision=None):
+    """
+    Observes one stage into the /metrics histograms and returns the record
+    that goes into the graph state's stage_metrics list.
+    """
+    record = {"stage": stage, "revision": revision, "seconds": seconds,
+              "prompt_tokens": 0, "completion_tokens": 0, "tokens_per_sec": None}
+    if usage is not None:
+        record["prompt_tokens"] = usage.prompt_tokens
+        record["completion_tokens"] = usage.completion_tokens
+        if usage.eval_seconds > 0:
+            record["tokens_per_sec"] = usage.completion_tokens / usage.eval_seconds
+
+    STAGE_SECONDS.observe(seconds, stage)
+    if usage is not None:
+        STAGE_TOKENS.observe(record["prompt_tokens"], stage, "prompt")
+        STAGE_TOKENS.observe(record["completion_tokens"], stage, "completion")
+        if record["tokens_per_sec"] is not None:
+            STAGE_TPS.observe(record["tokens_per_sec"], stage)
+    return record
+
+def revision_record(stage_metrics, revision, seconds, tokens=(0, 0)):
+    """
+    "revision" stage: this revision's writer record(s) plus the given
+    screen/jury time and tokens.
+    """
+    writer = [r for r in stage_metrics if r["stage"] == "writer" and r["revision"] == revision]
+    usage = UsageCapture()
+    usage.prompt_tokens = sum(r["prompt_tokens"] for r in writer) + tokens[0]
+    usage.completion_tokens = sum(r["completion_tokens"] for r in writer) + tokens[1]
+    return record_stage("revision", sum(r["seconds"] for r in writer) + seconds, usage, revision)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+def stage_percentiles(records):
+    """
+    {stage: {"count", "p50", "p95", "avg_tokens_per_sec"}} over stage_metrics records.
+    """
+    by_stage = {}
+    for r in records:
+        by_stage.setdefault(r["stage"], []).append(r)
+    summary = {}
+    for stage, rows in sorted(by_stage.items()):
+        seconds = sorted(r["seconds"] for r in rows)
+        speeds = [r["tokens_per_sec"] for r in rows if r.get("tokens_per_sec")]
+        summary[stage] = {
+            "count": len(rows),
+            "p50": percentile(seconds, 50),
+            "p95": percentile(seconds, 95),
+            "avg_tokens_per_sec": sum(speeds) / len(speeds) if speeds else None,
+        }
+    return summary
+
+def render_metrics():
+    return "\n".join(h.render() for h in (STAGE_SECONDS, STAGE_TOKENS, STAGE_TPS)) + "\n"
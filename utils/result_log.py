@@ -0,0 +1,92 @@
+import json
+import os
+import time
+
+# Append-only benchmark log: one JSON object per line. The first line is the
+# run plan ({"plan": {...}}), then one line per finished run, and a
+# {"session": {start, end, runs}} line each time a run closes the log. Appending
+# keeps each save O(1), and a crash can only cut off the last line, which
+# read_log() skips.
+
+def run_key(result):
+    # What identifies a run for --resume
+    return (result["game_id"], result["iteration"], result.get("jury_mode"), result.get("red_team_attack"))
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+class ResultLog:
+    """
+    Appends results to a JSONL file, flushing to disk every `flush_every`
+    results or `flush_seconds` seconds (and on close).
+    """
+
+    def __init__(self, path, plan=None, append=False, flush_every=10, flush_seconds=5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._pending = 0
+        self._last_flush = time.time()
+        self.started = time.time()
+        self.runs = 0
+        torn = append and os.path.exists(path) and os.path.getsize(path) > 0 and not _ends_with_newline(path)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        if torn:
+            # Close off a line cut short by a crash so the next record starts clean
+            self._file.write("\n")
+        if plan is not None:
+            self._write({"plan": plan})
+            self.flush()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+
+    def append(self, result):
+        self._write(result)
+        self.runs += 1
+        self._pending += 1
+        if self._pending >= self.flush_every or time.time() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.time()
+
+    def close(self):
+        if not self._file.closed:
+            if self.runs:
+                # Wall time of this session, for throughput across resumes and shards
+                self._write({"session": {"start": self.started, "end": time.time(), "runs": self.runs}})
+            self.flush()
+            self._file.close()
+
+def iter_log(path):
+    """
+    Yields every record in a log; a torn (half-written) line is skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable line in {path}")
+
+def read_log(path):
+    """
+    (plan, results) from a log. plan is None if the log has no plan line.
+    """
+    plan = None
+    results = []
+    for record in iter_log(path):
+        if "plan" in record:
+            plan = record["plan"]
+        elif "session" not in record:
+            results.append(record)
+    return plan, results
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableLambda
+
+# Add project root to path so `python utils/scheduler.py` resolves graph/utils
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph import writer_node, screen_node, after_screen, jury_node, should_revise, JURY_CONCURRENCY
+
+# Which model each graph stage keeps loaded in Ollama
+STAGE_MODELS = {"writer": "llama3.2", "jury": "mistral"}
+
+# Ollama reports load_duration on every call; a few ms just means the model
+# was already resident, anything above this was a real (re)load
+MODEL_LOAD_THRESHOLD_S = float(os.getenv("MODEL_LOAD_THRESHOLD_S", "0.5"))
+
+class ModelLoadTracker(BaseCallbackHandler):
+    """
+    Callback handler that reads Ollama's load_duration off every chat model
+    response, to count model (re)loads and the time spent on them.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.loads = Counter()
+        self.load_seconds = Counter()
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                meta = (message.response_metadata if message is not None else None) or generation.generation_info or {}
+                model = meta.get("model", "unknown")
+                load_s = (meta.get("load_duration") or 0) / 1e9
+                with self._lock:
+                    self.calls[model] += 1
+                    if load_s >= MODEL_LOAD_THRESHOLD_S:
+                        self.loads[model] += 1
+                        self.load_seconds[model] += load_s
+
+    def report(self):
+        with self._lock:
+            loads = sum(self.loads.values())
+            load_seconds = sum(self.load_seconds.values())
+            return {
+                "llm_calls": dict(self.calls),
+                "model_loads": loads,
+                "model_load_seconds": load_seconds,
+                "avg_load_seconds": load_seconds / loads if loads else 0.0,
+                "loads_by_model": dict(self.loads),
+            }
+
+def merge(state, update):
+    # Same as the graph's reducers: stage_metrics accumulates, everything else is replaced
+    previous = state.get("stage_metrics") or []
+    state.update(update)
+    if "stage_metrics" in update:
+        state["stage_metrics"] = previous + update["stage_metrics"]
+
+def count_switches(models):
+    return sum(1 for a, b in zip(models, models[1:]) if a != b)
+
+async def run_waves(inputs_list, config=None, on_done=None, concurrency=JURY_CONCURRENCY):
+    """
+    Runs many graph inputs together, one stage at a time: every pending
+    writer step (llama3.2), then every pending jury step (mistral), and so on
+    until all articles finish. Routing between stages uses the graph's own
+    after_screen/should_revise, so each article's revision loop is unchanged.
+
+    on_done(index, final_state, seconds, error) is awaited as each article
+    finishes; error is the exception that stopped it, else None.
+    Returns (final_states, schedule_report).
+    """
+    n = len(inputs_list)
+    states = [dict(inputs) for inputs in inputs_list]
+    stage = ["writer"] * n
+    seconds = [0.0] * n
+    errors = [None] * n
+    models_per_run = [[] for _ in range(n)] # Stage order a one-at-a-time run would have used
+    waves = []
+    slots = asyncio.Semaphore(concurrency)
+    writer = RunnableLambda(writer_node, name="writer")
+    jury = RunnableLambda(jury_node, name="jury")
+
+    async def run_step(i, node):
+        start = time.time()
+        try:
+            if node is writer:
+                async with slots:
+                    update = await node.ainvoke(states[i], config)
+            else:
+                update = await node.ainvoke(states[i], config) # jurors are throttled inside jury_node
+            merge(states[i], update)
+        except Exception as e:
+            # One bad article must not sink the whole wave
+            print(f"Wave Error ({node.name}): {e}")
+            errors[i] = e
+        seconds[i] += time.time() - start
+
+    async def finish(i):
+        stage[i] = None
+        if on_done is not None:
+            await on_done(i, states[i], seconds[i], errors[i])
+
+    while any(stage):
+        for name, node in (("writer", writer), ("jury", jury)):
+            batch = [i for i in range(n) if stage[i] == name]
+            if not batch:
+                continue
+
+            start = time.time()
+            await asyncio.gather(*(run_step(i, node) for i in batch))
+            waves.append({"stage": name, "model": STAGE_MODELS[name], "steps": len(batch), "seconds": time.time() - start})
+
+            for i in batch:
+                models_per_run[i].append(STAGE_MODELS[name])
+                if errors[i] is not None:
+                    await finish(i)
+                    continue
+                if name == "writer":
+                    merge(states[i], screen_node(states[i]))
+                    route = after_screen(states[i])
+                else:
+                    route = should_revise(states[i])
+
+                if route == "jury":
+                    stage[i] = "jury"
+                elif route == "rewrite":
+                    stage[i] = "writer"
+                else:
+                    await finish(i)
+
+    wave_models = [w["model"] for w in waves]
+    sequential_models = [m for models in models_per_run for m in models]
+    report = {
+        "waves": len(waves),
+        "steps": sum(w["steps"] for w in waves),
+        "model_switches": count_switches(wave_models),
+        "model_switches_sequential": count_switches(sequential_models),
+        "wave_log": waves,
+    }
+    return states, report
+
+def schedule_savings(schedule_report, load_report):
+    """
+    Model switches avoided vs. running the same articles one at a time, and
+    the load time that saves at the average observed reload cost.
+    """
+    avoided = schedule_report["model_switches_sequential"] - schedule_report["model_switches"]
+    return {
+        "model_switches_avoided": avoided,
+        "est_load_seconds_saved": avoided * load_report["avg_load_seconds"],
+    }
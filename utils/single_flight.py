@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+class _Flight:
+    def __init__(self):
+        self.events = []
+        self.done = False
+        self.subscribers = 0
+        self.joined = 0 # subscribers that attached to a run already in flight
+        self.changed = asyncio.Condition()
+        self.task = None
+
+class StreamFlights:
+    """
+    Single-flight for event streams: concurrent subscribers with the same key
+    share one producer run, and each receives the full event sequence (late
+    joiners get the events so far replayed first). The run is cancelled once
+    its last subscriber leaves; a finished run is forgotten, so the next
+    request for the key starts a fresh one.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.seconds_saved = 0.0 # run time x requests that didn't need their own run
+        self._lock = threading.Lock()
+
+    async def subscribe(self, key, producer):
+        """
+        Async generator of the run's events. producer() must return an async
+        generator; it is only called when no run for `key` is in flight.
+        """
+        flight = self._flights.get(key)
+        if flight is None or flight.done or flight.task.cancelling():
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(key, flight, producer()))
+            with self._lock:
+                self.executed += 1
+        else:
+            flight.joined += 1
+            with self._lock:
+                self.coalesced += 1
+
+        flight.subscribers += 1
+        seen = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda: len(flight.events) > seen or flight.done)
+                    batch = flight.events[seen:]
+                    done = flight.done
+                seen += len(batch)
+                for event in batch:
+                    yield event
+                if done and seen >= len(flight.events):
+                    return
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # Nobody is listening anymore: stop the pipeline (and its Ollama calls)
+                flight.task.cancel()
+
+    async def _run(self, key, flight, events):
+        start = time.time()
+        try:
+            async for event in events:
+                async with flight.changed:
+                    flight.events.append(event)
+                    flight.changed.notify_all()
+        except Exception as e:
+            flight.events.append(("error", {"detail": str(e)}))
+        finally:
+            await events.aclose()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            with self._lock:
+                self.seconds_saved += (time.time() - start) * flight.joined
+            flight.done = True
+            async with flight.changed:
+                flight.changed.notify_all()
+
+    def report(self):
+        with self._lock:
+            requests = self.executed + self.coalesced
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "coalesced_pct": self.coalesced / requests * 100 if requests else 0.0,
+                "seconds_saved": self.seconds_saved,
+                "in_flight": len(self._flights),
+            }
@@ -0,0 +1,6 @@
+# Jury pass marks and the revision budget. Kept free of imports so the
+# offline tools (utils/aggregate.py) don't pull in the LangGraph/Ollama stack.
+EDITOR_MIN_SCORE = 6
+SEO_MIN_SCORE = 70
+ENGAGEMENT_MIN_SCORE = 7
+MAX_REVISIONS = 3
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import threading
+import time
+
+# Models the pipeline talks to: writer/analyst (llama3.2), jury/judge (mistral)
+WARM_MODELS = os.getenv("WARM_MODELS", "llama3.2,mistral").split(",")
+
+# Ollama may still be starting next to us; model preloads are retried
+WARM_RETRIES = int(os.getenv("WARM_RETRIES", "3"))
+WARM_RETRY_SECONDS = float(os.getenv("WARM_RETRY_SECONDS", "5"))
+# After that, failed components are retried in the background (see keep_warm)
+REWARM_SECONDS = float(os.getenv("REWARM_SECONDS", "30"))
+
+# component -> {"status": pending | warming | ready | failed, "seconds", "error", ...}
+_components = {}
+_lock = threading.Lock()
+_steps = {} # component -> (func, args, retries), to re-run it
+
+def _set(component, **fields):
+    with _lock:
+        _components.setdefault(component, {"status": "pending", "seconds": None, "error": None}).update(fields)
+
+def _build_chains():
+    # Every agent factory, so no request pays for building a prompt/parser/client
+    from agents.writer import get_writer_chain
+    from agents.jury import get_fact_checker, get_editor_in_chief, get_bias_watchdog, get_seo_strategist, get_engagement_editor, get_brand_safety, get_jury_panel
+    from agents.analyst import get_context_analyst, get_recall_checker
+    from agents.judge import get_judge_chain
+    factories = [get_writer_chain, get_fact_checker, get_editor_in_chief, get_bias_watchdog, get_seo_strategist,
+                 get_engagement_editor, get_brand_safety, get_jury_panel, get_context_analyst, get_recall_checker, get_judge_chain]
+    for factory in factories:
+        factory()
+    return len(factories)
+
+def _load_game_index():
+    from utils.game_index import get_game_index
+    from utils.game_catalog import get_game_catalog
+    index = get_game_index()
+    if index is None:
+        raise RuntimeError("game index unavailable")
+    # Benchmark sampling catalog too (built here if missing), so /evaluate never waits on it
+    catalog = get_game_catalog()
+    return {**index.memory_usage(), "catalog_games": len(catalog) if catalog is not None else None}
+
+async def _step(component, func, *args, retries=0):
+    _steps[component] = (func, args, retries)
+    _set(component, status="warming")
+    start = time.time()
+    for attempt in range(retries + 1):
+        try:
+            if asyncio.iscoroutinefunction(func):
+                detail = await func(*args)
+            else:
+                detail = await asyncio.to_thread(func, *args)
+            _set(component, status="ready", seconds=time.time() - start, detail=detail, error=None)
+            return
+        except Exception as e:
+            print(f"Warm-up Error ({component}): {e}")
+            _set(component, error=str(e))
+            if attempt < retries:
+                await asyncio.sleep(WARM_RETRY_SECONDS)
+    _set(component, status="failed", seconds=time.time() - start)
+
+async def warm_up():
+    """
+    Startup phase: loads the game data, builds the agent chains and preloads
+    every model in Ollama (kept resident for OLLAMA_KEEP_ALIVE).
+    A failed component is reported by readiness(); it does not raise.
+    """
+    from agents.llm import preload_model
+
+    components = ["game_index", "chains"] + [f"model:{m}" for m in WARM_MODELS]
+    for component in components:
+        _set(component, status="pending")
+
+    start = time.time()
+    # 1. Local work (data + chains) runs alongside the model loads
+    local = asyncio.gather(_step("game_index", _load_game_index), _step("chains", _build_chains))
+    # 2. Models one at a time: loading two at once just fights over GPU memory
+    for model in WARM_MODELS:
+        await _step(f"model:{model}", preload_model, model, retries=WARM_RETRIES)
+    await local
+    print(f"Warm-up finished in {time.time() - start:.1f}s: {readiness()['ready']}")
+
+async def keep_warm(interval=None):
+    """
+    Runs for the life of the process: every `interval` seconds (REWARM_SECONDS)
+    re-runs any component that failed, e.g. after Ollama was down at boot,
+    so /ready can recover without a restart.
+    """
+    interval = interval or REWARM_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        with _lock:
+            failed = [name for name, info in _components.items() if info["status"] == "failed"]
+        for component in failed:
+            func, args, _ = _steps[component]
+            print(f"Re-warming {component}...")
+            with _lock:
+                _components[component]["rewarms"] = _components[component].get("rewarms", 0) + 1
+            await _step(component, func, *args)
+
+def readiness():
+    """
+    {"ready": bool, "components": {...}} — ready once every component warmed up.
+    """
+    with _lock:
+        components = {name: dict(info) for name, info in _components.items()}
+    ready = bool(components) and all(c["status"] == "ready" for c in components.values())
+    return {"ready": ready, "components": components}
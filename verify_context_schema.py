@@ -1,18 +1,22 @@
 import json
 import os
-import glob
+import sqlite3
 
-files = glob.glob('context_cache/*.json')
-if not files:
-    print("No files found!")
+if not os.path.exists('context_cache.db'):
+    print("No context store found!")
     exit(1)
 
-# Pick a file that likely has stats (not the first one)
-f = files[-1]
+# Pick a snapshot that likely has stats (not the first one)
+row = sqlite3.connect('context_cache.db').execute(
+    "SELECT game_id, snapshot FROM snapshots ORDER BY rowid DESC LIMIT 1"
+).fetchone()
+if not row:
+    print("No snapshots found!")
+    exit(1)
 
 try:
-    data = json.load(open(f))
-    print(f"Checking {f}")
+    data = json.loads(row[1])
+    print(f"Checking {row[0]}")
     print(json.dumps(data, indent=2))
 
     expected = ['game_id', 'is_playoff', 'home_record', 'visitor_record', 'narrative_notes']